@@ -1,6 +1,7 @@
 ﻿import os
 from dotenv import load_dotenv
 import logging
+import time
 from datetime import datetime
 
 # Load environment variables
@@ -10,6 +11,7 @@ load_dotenv()
 class Config:
     DATABASE_URL = os.getenv('DATABASE_URL', 'sqlite:///picks.db')
     ESPN_API_TIMEOUT = int(os.getenv('ESPN_API_TIMEOUT', '10'))
+    ESPN_REFRESH_DEADLINE = float(os.getenv('ESPN_REFRESH_DEADLINE', '30'))
     UPDATE_INTERVAL_MINUTES = int(os.getenv('UPDATE_INTERVAL_MINUTES', '120'))
     DEBUG_MODE = os.getenv('DEBUG_MODE', 'False').lower() == 'true'
     PORT = int(os.getenv('PORT', '10000'))
@@ -22,50 +24,32 @@ class Config:
     ENABLE_SCORE_DISPLAY = os.getenv('ENABLE_SCORE_DISPLAY', 'True').lower() == 'true'
     LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
     LOG_FILE = os.getenv('LOG_FILE', 'nfl_picks.log')
+    ENABLE_RESULTS_POLLER = os.getenv('ENABLE_RESULTS_POLLER', 'False').lower() == 'true'
+    ENABLE_LIVE_POLLER = os.getenv('ENABLE_LIVE_POLLER', 'True').lower() == 'true'
+    JOB_WORKERS = int(os.getenv('JOB_WORKERS', '2'))
+    ENABLE_STATS_REFRESHER = os.getenv('ENABLE_STATS_REFRESHER', 'True').lower() == 'true'
+    STATS_INLINE_LIMIT = int(os.getenv('STATS_INLINE_LIMIT', '40'))
+    ENABLE_WORKBOOK_WATCHER = os.getenv('ENABLE_WORKBOOK_WATCHER', 'False').lower() == 'true'
+    RENDER_CACHE_SIZE = int(os.getenv('RENDER_CACHE_SIZE', '64'))
+    WIN_PROB_MODEL = os.getenv('WIN_PROB_MODEL', 'coin')
+    WIN_PROB_LINES_FILE = os.getenv('WIN_PROB_LINES_FILE', '')
+    SIMULATION_TRIALS = int(os.getenv('SIMULATION_TRIALS', '50000'))
 
 
 def find_latest_excel_file(base_dir=None):
     """Return the most recently modified Excel file, preferring non-temp files. Searches both current and parent directories."""
-    search_dirs = []
-    if base_dir:
-        search_dirs.append(base_dir)
-    else:
-        search_dirs.append(os.getcwd())
-        # Also check parent directory
-        parent_dir = os.path.dirname(os.getcwd())
-        if parent_dir and os.path.exists(parent_dir):
-            search_dirs.append(parent_dir)
-    
-    preferred = None  # non-temp
-    fallback = None   # any excel
-    
-    for search_dir in search_dirs:
-        try:
-            for name in os.listdir(search_dir):
-                if not name.lower().endswith('.xlsx'):
-                    continue
-                if name.startswith('~$'):
-                    continue  # Skip Excel lock files
-                path = os.path.join(search_dir, name)
-                if not os.path.isfile(path):
-                    continue
-                mtime = os.path.getmtime(path)
-                # Track any excel as fallback
-                if fallback is None or mtime > fallback[0]:
-                    fallback = (mtime, path)
-                # Prefer files that are not temp_*
-                if not name.lower().startswith('temp_'):
-                    if preferred is None or mtime > preferred[0]:
-                        preferred = (mtime, path)
-        except Exception as e:
-            logger.warning(f"Could not search directory {search_dir}: {e}")
-            continue
-    
-    if preferred:
-        return preferred[1]
-    if fallback:
-        return fallback[1]
-    return None
+    if not base_dir and workbook_watcher_service is not None:
+        # The running watcher has indexed the same directories within the last few seconds
+        watched = workbook_watcher_service.latest_workbook()
+        if watched:
+            return watched
+    # Temp upload copies are a last resort here; the watcher never imports them
+    dirs = [base_dir] if base_dir else workbook_watcher.default_dirs()
+    return workbook_watcher.latest(workbook_watcher.scan(dirs, include_temp=True))
+
+
+# Set once the app is built (see the end of this module)
+workbook_watcher_service = None
 
 # Setup logging
 logging.basicConfig(
@@ -82,13 +66,40 @@ import dash
 from dash import dcc, html, Input, Output, dash_table, State
 import dash_bootstrap_components as dbc
 import pandas as pd
+import numpy as np
 import sqlite3
 import base64
 import plotly.express as px
 import plotly.graph_objects as go
-import io
+from plotly.subplots import make_subplots
+import functools
 from werkzeug.middleware.dispatcher import DispatcherMiddleware
 
+import picks_store
+import clinch_solver
+import win_simulator
+import standings
+import head_to_head
+import streaks
+import render_cache
+import league_schema
+import nfl_teams
+import espn_client
+import espn_rosters
+import player_stats
+import season_schedule
+import live_scores
+import results_update
+import jobs
+import excel_import
+import workbook_watcher
+
+# League members (column-safe names); adding one to PLAYERS is all it takes
+PLAYERS = league_schema.normalize_players(Config.PLAYERS)
+
+# Player column order in the weekly Excel sheets (away marks in B-G, home marks in K-P)
+EXCEL_PLAYER_ORDER = excel_import.PLAYER_ORDER
+
 try:
     import postseason_fantasy_app as postseason_app
 except Exception:
@@ -810,6 +821,11 @@ app.layout = dbc.Container([
                     dbc.Button([html.I(className="fas fa-sync-alt me-2"), "Update ESPN"], 
                              id='update-btn', color='success', className="w-100 mb-2 btn-custom", size="sm"),
                     html.Div(id='update-status', style={'fontSize': '12px'}),
+                    # Job ids of the quick actions above; polled until each job finishes
+                    dcc.Store(id='upload-job'),
+                    dcc.Store(id='reload-job'),
+                    dcc.Store(id='update-job'),
+                    dcc.Interval(id='job-poll', interval=1000, disabled=True),
                 ])
             ], className="content-card sticky-top", style={'top': '20px'})
         ], width=12, lg=3, className="mb-4"),
@@ -872,7 +888,8 @@ def get_team_logo_mapping():
 def fetch_espn_standings(season=2025):
     try:
         url = f"https://site.api.espn.com/apis/v2/sports/football/nfl/standings?season={season}"
-        resp = requests.get(url, timeout=10)
+        # A stale copy now beats a blocked page; the cache refreshes it in the background
+        resp = espn_client.get(url, timeout=10, stale_ok=True)
         if resp.status_code == 200:
             return resp.json()
     except Exception:
@@ -943,37 +960,7 @@ def get_locked_and_bubble(conferences):
 
 def fetch_team_roster(team_id, season=2025):
     try:
-        url = f"https://sports.core.api.espn.com/v2/sports/football/leagues/nfl/teams/{team_id}/roster?season={season}"
-        r = requests.get(url, timeout=10)
-        if r.status_code != 200:
-            return []
-        j = r.json()
-        items = j.get('entries') or j.get('items') or []
-        players = []
-        for p in items:
-            # Follow player ref if needed
-            if isinstance(p, dict) and 'player' in p:
-                pref = p['player'].get('$ref')
-                if pref:
-                    pr = requests.get(pref, timeout=10)
-                    if pr.status_code == 200:
-                        pj = pr.json()
-                        players.append({
-                            'id': str(pj.get('id')) if pj.get('id') is not None else None,
-                            'name': pj.get('fullName') or pj.get('displayName'),
-                            'position': pj.get('position', {}).get('abbreviation') or pj.get('position', {}).get('name') or '',
-                            'number': pj.get('jersey'),
-                            'teamId': str(team_id)
-                        })
-            elif isinstance(p, dict):
-                players.append({
-                    'id': str(p.get('id')) if p.get('id') is not None else None,
-                    'name': p.get('fullName') or p.get('displayName') or p.get('name'),
-                    'position': p.get('position', {}).get('abbreviation') or p.get('position', {}).get('name') or '',
-                    'number': p.get('jersey'),
-                    'teamId': str(team_id)
-                })
-        return players
+        return espn_rosters.load_rosters([team_id], season).get(team_id, [])
     except Exception:
         return []
 
@@ -982,71 +969,22 @@ def fetch_player_stats(player_id, season=2025):
     Fields: GP, PassYds, PassTD, RushYds, RushTD, RecYds, RecTD
     """
     try:
-        # Get athlete endpoint and find statistics ref
-        base = f"https://sports.core.api.espn.com/v2/sports/football/leagues/nfl/athletes/{player_id}"
-        ar = requests.get(base, timeout=10)
-        if ar.status_code != 200:
-            return {}
-        aj = ar.json()
-        stats_ref = None
-        if isinstance(aj, dict):
-            stats = aj.get('statistics')
-            if isinstance(stats, dict) and '$ref' in stats:
-                stats_ref = stats['$ref']
-        # Fall back to athletes statistics listing if available
-        if not stats_ref:
-            stats_ref = base + f"/statistics?season={season}"
-        else:
-            # Ensure season parameter
-            if 'season=' not in stats_ref:
-                stats_ref = stats_ref + ("&" if "?" in stats_ref else "?") + f"season={season}"
-
-        sr = requests.get(stats_ref, timeout=10)
-        if sr.status_code != 200:
-            return {}
-        sj = sr.json()
-        items = sj.get('splits') or sj.get('items') or []
-        # Flatten known categories
-        out = {'GP': None, 'PassYds': None, 'PassTD': None, 'RushYds': None, 'RushTD': None, 'RecYds': None, 'RecTD': None}
-        def try_get(stat_dict, *keys):
-            for k in keys:
-                if k in stat_dict and stat_dict[k] is not None:
-                    return stat_dict[k]
-            return None
-        # Iterate over items looking for season totals
-        for it in items:
-            cat = (it.get('name') or it.get('type') or '').lower()
-            stats = it.get('stats') or it.get('statistics') or {}
-            if 'passing' in cat:
-                out['PassYds'] = try_get(stats, 'yards', 'passingYards', 'yds') or out['PassYds']
-                out['PassTD'] = try_get(stats, 'touchdowns', 'passingTouchdowns', 'td') or out['PassTD']
-            elif 'rushing' in cat:
-                out['RushYds'] = try_get(stats, 'yards', 'rushingYards', 'yds') or out['RushYds']
-                out['RushTD'] = try_get(stats, 'touchdowns', 'rushingTouchdowns', 'td') or out['RushTD']
-            elif 'receiving' in cat:
-                out['RecYds'] = try_get(stats, 'yards', 'receivingYards', 'yds') or out['RecYds']
-                out['RecTD'] = try_get(stats, 'touchdowns', 'receivingTouchdowns', 'td') or out['RecTD']
-            elif 'games' in cat or 'participation' in cat or 'general' in cat:
-                out['GP'] = try_get(stats, 'gamesPlayed', 'games', 'gp') or out['GP']
-        # Clean ints
-        for k, v in list(out.items()):
-            if v is None:
-                continue
-            try:
-                out[k] = int(float(v))
-            except Exception:
-                pass
-        return out
+        return player_stats.fetch_stats([player_id], season).get(str(player_id), {})
     except Exception:
         return {}
 
 def build_players_pool(locked_ids, bubble_ids):
+    # Every team's roster and athlete refs in one concurrent load
+    try:
+        rosters = espn_rosters.load_rosters(list(locked_ids) + list(bubble_ids), stale_ok=True)
+    except Exception:
+        rosters = {}
     locked_players = []
     bubble_players = []
     for tid in locked_ids:
-        locked_players.extend(fetch_team_roster(tid))
+        locked_players.extend(rosters.get(tid, []))
     for tid in bubble_ids:
-        bubble_players.extend(fetch_team_roster(tid))
+        bubble_players.extend(rosters.get(tid, []))
     return locked_players, bubble_players
 
 
@@ -1074,24 +1012,18 @@ def get_team_logo_url(team_name):
 def get_player_favorite_team_logo(player_name):
     """Get the logo of a player's most frequently picked team"""
     try:
-        conn = get_db_connection()
-        if not conn:
-            return None
-        
-        # Get player's picks
-        df = pd.read_sql_query(f"SELECT {player_name}_pick FROM picks WHERE {player_name}_pick IS NOT NULL", conn)
-        conn.close()
-        
-        if df.empty:
+        store = get_pick_store()
+        if store is None or player_name not in store.players:
             return None
         
         # Count team picks
-        pick_counts = df[f'{player_name}_pick'].value_counts()
-        if len(pick_counts) > 0:
-            most_picked_team = pick_counts.index[0]
-            return get_team_logo_url(most_picked_team)
+        team_ids = store.pick_team_ids[:, store.players.index(player_name)]
+        team_ids = team_ids[team_ids >= 0]
+        if team_ids.size == 0:
+            return None
         
-        return None
+        most_picked_team = store.team_name(int(pd.Series(team_ids).value_counts().index[0]))
+        return get_team_logo_url(most_picked_team)
     except:
         return None
 
@@ -1124,72 +1056,21 @@ def init_database():
     """Initialize the database with required tables"""
     try:
         conn = sqlite3.connect('picks.db')
-        cursor = conn.cursor()
         
-        # Create picks table if it doesn't exist
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS picks (
-                game_id INTEGER PRIMARY KEY,
-                week INTEGER,
-                away_team TEXT,
-                home_team TEXT,
-                bobby_pick TEXT,
-                chet_pick TEXT,
-                clyde_pick TEXT,
-                henry_pick TEXT,
-                nick_pick TEXT,
-                riley_pick TEXT,
-                actual_winner TEXT,
-                game_date TEXT,
-                away_score INTEGER,
-                home_score INTEGER,
-                bobby_tiebreaker INTEGER,
-                chet_tiebreaker INTEGER,
-                clyde_tiebreaker INTEGER,
-                henry_tiebreaker INTEGER,
-                nick_tiebreaker INTEGER,
-                riley_tiebreaker INTEGER,
-                is_tiebreaker_game BOOLEAN DEFAULT 0
-            )
-        ''')
-        
-        # Add new columns to existing table if they don't exist
-        try:
-            cursor.execute("ALTER TABLE picks ADD COLUMN away_score INTEGER")
-        except:
-            pass
-        try:
-            cursor.execute("ALTER TABLE picks ADD COLUMN home_score INTEGER")
-        except:
-            pass
-        try:
-            cursor.execute("ALTER TABLE picks ADD COLUMN bobby_tiebreaker INTEGER")
-        except:
-            pass
-        try:
-            cursor.execute("ALTER TABLE picks ADD COLUMN chet_tiebreaker INTEGER")
-        except:
-            pass
-        try:
-            cursor.execute("ALTER TABLE picks ADD COLUMN clyde_tiebreaker INTEGER")
-        except:
-            pass
-        try:
-            cursor.execute("ALTER TABLE picks ADD COLUMN henry_tiebreaker INTEGER")
-        except:
-            pass
-        try:
-            cursor.execute("ALTER TABLE picks ADD COLUMN nick_tiebreaker INTEGER")
-        except:
-            pass
-        try:
-            cursor.execute("ALTER TABLE picks ADD COLUMN riley_tiebreaker INTEGER")
-        except:
-            pass
-        try:
-            cursor.execute("ALTER TABLE picks ADD COLUMN is_tiebreaker_game BOOLEAN DEFAULT 0")
-        except:
-            pass
+        # Normalized games/players/picks; an old wide picks table is migrated in place
+        migrated = league_schema.migrate(conn, PLAYERS, Config.CURRENT_SEASON)
+        if migrated:
+            print(f"Migrated {migrated} games from the wide picks table")
+
+        # Revision counter bumped by triggers on every picks write
+        picks_store.ensure_data_version(conn)
+        standings.ensure_standings_tables(conn)
+        season_schedule.ensure_schedule_table(conn)
+        live_scores.ensure_live_tables(conn)
+        player_stats.ensure_stats_table(conn)
+        jobs.ensure_jobs_table(conn)
+        excel_import.ensure_manifest_table(conn)
+        workbook_watcher.ensure_watch_table(conn)
         
         conn.commit()
         conn.close()
@@ -1246,159 +1127,94 @@ def get_db_connection():
         print(f"Database connection error: {e}")
         return None
 
-def process_excel_file(contents, filename):
-    """Process uploaded Excel file and import to database - Custom format for NFL picks"""
+def get_pick_store():
+    """Columnar picks/results for the current DB revision (shared across tabs)."""
+    conn = get_db_connection()
+    if not conn:
+        return None
+    try:
+        return picks_store.load_pick_store(conn, PLAYERS)
+    finally:
+        conn.close()
+
+def get_standings_connection():
+    """DB connection with the materialized standings tables brought up to date."""
+    conn = get_db_connection()
+    if conn:
+        standings.ensure_current(conn, PLAYERS)
+    return conn
+
+tab_cache = render_cache.RenderCache(maxsize=Config.RENDER_CACHE_SIZE)
+
+def get_data_version():
+    """Current picks revision, or None if the DB can't be read (disables caching)."""
+    conn = get_db_connection()
+    if not conn:
+        return None
+    try:
+        return picks_store.read_data_version(conn)
+    finally:
+        conn.close()
+
+def cached_by_data_version(func):
+    """Memoize a DB-derived helper until the next picks write."""
+    @functools.wraps(func)
+    def wrapper(*args):
+        version = get_data_version()
+        if version is None:
+            return func(*args)
+        return tab_cache.get_or_build((func.__name__, version) + args, lambda: func(*args))
+    return wrapper
+
+def get_race_odds(store, week, tiebreaker_total_floor=0):
+    """Monte Carlo week/season odds per player using the configured probability model."""
+    try:
+        model = win_simulator.get_model(Config.WIN_PROB_MODEL, Config.WIN_PROB_LINES_FILE)
+        return win_simulator.simulate_race(store, week, trials=Config.SIMULATION_TRIALS, model=model,
+                                           tiebreaker_total_floor=tiebreaker_total_floor)
+    except Exception as e:
+        print(f"Error simulating race: {e}")
+        return {}
+
+@server.route('/cache-stats')
+def cache_stats():
+    return tab_cache.stats()
+
+def import_picks(source, progress=None):
+    """Import a picks workbook (path, bytes or file object); returns (message, success)."""
     try:
-        # Decode the uploaded file
-        content_type, content_string = contents.split(',')
-        decoded = base64.b64decode(content_string)
-        
-        # Read Excel file with openpyxl engine
-        excel_file = io.BytesIO(decoded)
-        
-        # Get all sheet names
-        xl_file = pd.ExcelFile(excel_file)
-        sheet_names = xl_file.sheet_names
-        
-        # Connect to database
         conn = get_db_connection()
         if not conn:
             return "Database connection failed", False
-        
-        total_games = 0
-        people = ['bobby', 'chet', 'clyde', 'henry', 'riley', 'nick']
-        
-        # Process each sheet (week)
-        for sheet_name in sheet_names:
-            # Skip the cumulative sheet
-            if sheet_name.lower() == 'cumulative':
-                continue
-                
-            try:
-                # Determine week number from sheet name
-                if sheet_name.lower().startswith('sheet'):
-                    week_num = int(sheet_name.replace('Sheet', '').replace('sheet', ''))
-                else:
-                    continue
-                
-                # Read the sheet without headers
-                df = pd.read_excel(excel_file, sheet_name=sheet_name, header=None)
-                
-                # Clear existing data for this week
-                conn.execute("DELETE FROM picks WHERE week = ?", (week_num,))
-
-                # Process only rows that have actual picks (marked with 'x')
-                game_entries = []  # (row_idx, game_id)
-                for idx, row in df.iterrows():
-                    # Skip header rows and rows without team names
-                    if idx < 2 or pd.isna(row.iloc[7]) or pd.isna(row.iloc[9]):
-                        continue
-
-                    pick_cols = list(row.iloc[1:7]) + list(row.iloc[10:16])
-                    has_x = any((isinstance(v, str) and v.strip().lower() == 'x') for v in pick_cols)
-                    if not has_x:
-                        # Ignore rows without any picks (prevents score rows from becoming games)
-                        continue
-
-                    # Extract team names (columns 7 and 9)
-                    away_team = str(row.iloc[7]).strip()
-                    home_team = str(row.iloc[9]).strip()
-
-                    # Skip if team names are invalid
-                    if not away_team or not home_team or away_team == 'nan' or home_team == 'nan':
-                        continue
-
-                    # Clean team names (remove extra characters)
-                    away_team = away_team.replace(' ¹', '').replace(' ²', '').replace(' ³', '')
-                    home_team = home_team.replace(' ¹', '').replace(' ²', '').replace(' ³', '')
-
-                    # Determine each person's pick
-                    picks = {}
-                    for i, person in enumerate(people):
-                        away_pick = row.iloc[i + 1] if i + 1 < len(row) else None
-                        home_pick = row.iloc[i + 10] if i + 10 < len(row) else None
-
-                        if pd.notna(away_pick) and str(away_pick).strip().lower() == 'x':
-                            picks[f'{person}_pick'] = away_team
-                        elif pd.notna(home_pick) and str(home_pick).strip().lower() == 'x':
-                            picks[f'{person}_pick'] = home_team
-                        else:
-                            picks[f'{person}_pick'] = None
-
-                    # Insert into database
-                    conn.execute('''
-                        INSERT INTO picks (week, away_team, home_team, bobby_pick, chet_pick, 
-                                         clyde_pick, henry_pick, riley_pick, nick_pick)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    ''', (
-                        week_num, away_team, home_team,
-                        picks.get('bobby_pick'), picks.get('chet_pick'), picks.get('clyde_pick'),
-                        picks.get('henry_pick'), picks.get('riley_pick'), picks.get('nick_pick')
-                    ))
-
-                    game_id = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
-                    game_entries.append((idx, game_id))
-                    total_games += 1
-
-                # Attach tiebreaker predictions to the last real game (row right after it)
-                if game_entries:
-                    last_row_idx, last_game_id = game_entries[-1]
-                    tiebreakers = {}
-
-                    # Look ahead a few rows after the last game to find the tiebreaker numbers
-                    for offset in range(1, 4):  # check next up to 3 rows in case of blank separators
-                        if last_row_idx + offset >= len(df):
-                            break
-                        next_row = df.iloc[last_row_idx + offset]
-                        row_tbs = {}
-                        for i, person in enumerate(people):
-                            val1 = next_row.iloc[i + 1] if i + 1 < len(next_row) else None
-                            val2 = next_row.iloc[i + 10] if i + 10 < len(next_row) else None
-                            chosen = None
-                            for candidate in (val1, val2):
-                                if pd.notna(candidate) and str(candidate).replace('.', '', 1).isdigit():
-                                    chosen = int(float(candidate))
-                                    break
-                            if chosen is not None:
-                                row_tbs[f'{person}_tiebreaker'] = chosen
-                        if row_tbs:
-                            tiebreakers = row_tbs
-                            break
-
-                    if tiebreakers:
-                        update_parts = []
-                        update_values = []
-                        for person in people:
-                            tb_key = f'{person}_tiebreaker'
-                            if tb_key in tiebreakers:
-                                update_parts.append(f"{tb_key} = ?")
-                                update_values.append(tiebreakers[tb_key])
-
-                        if update_parts:
-                            update_values.append(last_game_id)
-                            conn.execute(f'''
-                                UPDATE picks 
-                                SET is_tiebreaker_game = 1, {', '.join(update_parts)}
-                                WHERE game_id = ?
-                            ''', update_values)
-                    
-            except Exception as e:
-                print(f"Error processing sheet {sheet_name}: {e}")
-                continue
-        
-        conn.commit()
-        conn.close()
-        
-        if total_games == 0:
-            return "No valid games found in the Excel file", False
-        
-        return f"Successfully imported {total_games} games from {len([s for s in sheet_names if s.lower() != 'cumulative'])} weeks", True
-        
+        try:
+            # One import at a time across workers (watcher, reload and uploads alike)
+            with workbook_watcher.import_lease('picks.db'):
+                total_games, touched_weeks, unchanged_weeks = excel_import.import_workbook(
+                    conn, source, Config.CURRENT_SEASON, PLAYERS, EXCEL_PLAYER_ORDER, progress
+                )
+        finally:
+            conn.close()
+    except Exception as e:
+        return f"Error processing file: {str(e)}", False
+    return excel_import.describe_import(total_games, touched_weeks, unchanged_weeks)
+
+
+def decode_upload(contents):
+    """Workbook bytes from a dcc.Upload data URL."""
+    _, content_string = contents.split(',', 1)
+    return base64.b64decode(content_string)
+
+
+def process_excel_file(contents, filename, progress=None):
+    """Import a workbook from a Dash upload (a base64 data URL)."""
+    try:
+        decoded = decode_upload(contents)
     except Exception as e:
         return f"Error processing file: {str(e)}", False
+    return import_picks(decoded, progress)
 
 
-def load_excel_from_disk(file_path=None):
+def load_excel_from_disk(file_path=None, progress=None):
     """Load an Excel file from disk and reuse the existing import pipeline"""
     try:
         target_path = file_path
@@ -1418,145 +1234,29 @@ def load_excel_from_disk(file_path=None):
         if not os.path.exists(target_path):
             return f"Excel file not found at {target_path}", False
 
-        with open(target_path, 'rb') as f:
-            file_content = base64.b64encode(f.read()).decode()
-            contents = "data:application/vnd.openxmlformats-officedocument.spreadsheetml.sheet;base64," + file_content
-            message, success = process_excel_file(contents, os.path.basename(target_path))
-            if success:
-                return f"Loaded picks from {target_path}", True
-            return message, False
+        # The importer memory-maps the file itself
+        message, success = import_picks(target_path, progress)
+        if success:
+            return f"Loaded picks from {target_path}", True
+        return message, False
     except Exception as e:
         logger.error(f"Disk load failed: {e}")
         return f"Load failed: {e}", False
 
-def update_results_from_api():
-    """Update game results with scores from ESPN API"""
+def apply_espn_results(weeks=None, progress=None):
+    """Fetch ESPN finals for ``weeks`` (all 18 by default) and store what changed; returns the ChangeSet."""
+    changes = results_update.apply_espn_results(
+        weeks, progress, db_path='picks.db', season=Config.CURRENT_SEASON, players=PLAYERS,
+        timeout=Config.ESPN_API_TIMEOUT, deadline=Config.ESPN_REFRESH_DEADLINE,
+    )
+    if changes:
+        logger.info(f"ESPN results: {changes.summary()} (weeks {changes.weeks})")
+    return changes
+
+def update_results_from_api(weeks=None, progress=None):
+    """Update game results with scores from ESPN API (all 18 weeks unless ``weeks`` is given)"""
     try:
-        import requests
-        import json
-        
-        conn = get_db_connection()
-        if not conn:
-            return "Database connection failed", False
-        
-        # Add score columns if they don't exist
-        cursor = conn.cursor()
-        try:
-            cursor.execute("ALTER TABLE picks ADD COLUMN away_score INTEGER")
-        except:
-            pass  # Column already exists
-        try:
-            cursor.execute("ALTER TABLE picks ADD COLUMN home_score INTEGER")
-        except:
-            pass  # Column already exists
-        
-        current_year = Config.CURRENT_SEASON
-        updated_games = 0
-        
-        # Check each week for completed games
-        for week in range(1, 19):  # Weeks 1-18
-            try:
-                # ESPN API endpoint for NFL scoreboard
-                url = f"https://site.api.espn.com/apis/site/v2/sports/football/nfl/scoreboard?seasontype=2&week={week}&dates={current_year}"
-                
-                response = requests.get(url, timeout=Config.ESPN_API_TIMEOUT)
-                if response.status_code != 200:
-                    continue
-                
-                data = response.json()
-                
-                # Process each game in the week
-                if 'events' in data:
-                    for game in data['events']:
-                        try:
-                            # Extract game information
-                            if 'competitions' not in game or not game['competitions']:
-                                continue
-                            
-                            competition = game['competitions'][0]
-                            
-                            # Check if game is completed
-                            status = competition.get('status', {})
-                            if status.get('type', {}).get('name') != 'STATUS_FINAL':
-                                continue  # Skip if game not finished
-                            
-                            # Get team information
-                            competitors = competition.get('competitors', [])
-                            if len(competitors) != 2:
-                                continue
-                            
-                            # Determine home and away teams with scores
-                            home_team = None
-                            away_team = None
-                            home_score = 0
-                            away_score = 0
-                            
-                            for team in competitors:
-                                team_name = team.get('team', {}).get('displayName', '')
-                                team_score = int(team.get('score', 0))
-                                
-                                if team.get('homeAway') == 'home':
-                                    home_team = team_name
-                                    home_score = team_score
-                                else:
-                                    away_team = team_name
-                                    away_score = team_score
-                            
-                            if not home_team or not away_team:
-                                continue
-                            
-                            # Determine winner
-                            if home_score > away_score:
-                                winner = home_team
-                            elif away_score > home_score:
-                                winner = away_team
-                            else:
-                                winner = "TIE"  # Handle ties (rare in NFL)
-                            
-                            # Clean team names to match your database format
-                            home_team_clean = clean_team_name(home_team)
-                            away_team_clean = clean_team_name(away_team)
-                            winner_clean = clean_team_name(winner) if winner != "TIE" else "TIE"
-                            
-                            # Update database with scores and winner
-                            cursor = conn.cursor()
-                            cursor.execute('''
-                                UPDATE picks 
-                                SET actual_winner = ?, away_score = ?, home_score = ?
-                                WHERE week = ? 
-                                AND (
-                                    (LOWER(away_team) LIKE ? AND LOWER(home_team) LIKE ?) OR
-                                    (LOWER(away_team) LIKE ? AND LOWER(home_team) LIKE ?)
-                                )
-                                AND actual_winner IS NULL
-                            ''', (
-                                winner_clean, away_score, home_score,
-                                week,
-                                f'%{away_team_clean.lower()}%',
-                                f'%{home_team_clean.lower()}%',
-                                f'%{home_team_clean.lower()}%',
-                                f'%{away_team_clean.lower()}%'
-                            ))
-                            
-                            if cursor.rowcount > 0:
-                                updated_games += cursor.rowcount
-                                
-                        except Exception as e:
-                            print(f"Error processing game: {e}")
-                            continue
-                            
-            except Exception as e:
-                print(f"Error processing week {week}: {e}")
-                continue
-        mark_tiebreaker_games(conn)
-        conn.commit()
-        conn.close()
-        
-        if updated_games > 0:
-            return f"Successfully updated {updated_games} games with scores and results!", True
-        else:
-            return "No new completed games found to update.", True
-            
+        return results_update.describe(apply_espn_results(weeks, progress)), True
     except Exception as e:
         return f"Update failed: {str(e)}", False
 
@@ -1565,54 +1265,8 @@ def clean_team_name(team_name):
     if not team_name or team_name == "TIE":
         return team_name
     
-    # Common team name mappings
-    name_mappings = {
-        'Arizona Cardinals': 'Arizona Cardinals',
-        'Atlanta Falcons': 'Atlanta Falcons', 
-        'Baltimore Ravens': 'Baltimore Ravens',
-        'Buffalo Bills': 'Buffalo Bills',
-        'Carolina Panthers': 'Carolina Panthers',
-        'Chicago Bears': 'Chicago Bears',
-        'Cincinnati Bengals': 'Cincinnati Bengals',
-        'Cleveland Browns': 'Cleveland Browns',
-        'Dallas Cowboys': 'Dallas Cowboys',
-        'Denver Broncos': 'Denver Broncos',
-        'Detroit Lions': 'Detroit Lions',
-        'Green Bay Packers': 'Green Bay Packers',
-        'Houston Texans': 'Houston Texans',
-        'Indianapolis Colts': 'Indianapolis Colts',
-        'Jacksonville Jaguars': 'Jacksonville Jaguars',
-        'Kansas City Chiefs': 'Kansas City Chiefs',
-        'Las Vegas Raiders': 'Las Vegas Raiders',
-        'Los Angeles Chargers': 'Los Angeles Chargers',
-        'Los Angeles Rams': 'Los Angeles Rams',
-        'Miami Dolphins': 'Miami Dolphins',
-        'Minnesota Vikings': 'Minnesota Vikings',
-        'New England Patriots': 'New England Patriots',
-        'New Orleans Saints': 'New Orleans Saints',
-        'New York Giants': 'New York Giants',
-        'New York Jets': 'New York Jets',
-        'Philadelphia Eagles': 'Philadelphia Eagles',
-        'Pittsburgh Steelers': 'Pittsburgh Steelers',
-        'San Francisco 49ers': 'San Francisco 49ers',
-        'Seattle Seahawks': 'Seattle Seahawks',
-        'Tampa Bay Buccaneers': 'Tampa Bay Buccaneers',
-        'Tennessee Titans': 'Tennessee Titans',
-        'Washington Commanders': 'Washington Commanders'
-    }
-    
-    # Try exact match first
-    if team_name in name_mappings:
-        return name_mappings[team_name]
-    
-    # Try partial matches for common variations
-    team_lower = team_name.lower()
-    for full_name, clean_name in name_mappings.items():
-        if full_name.lower() in team_lower or any(word in team_lower for word in full_name.lower().split()):
-            return clean_name
-    
-    # Return original if no match found
-    return team_name
+    # Canonical name for any known spelling or abbreviation; unknown names pass through
+    return nfl_teams.canonical_name(team_name) or team_name
 
 def get_last_updated():
     """Get timestamp of last data update"""
@@ -1636,76 +1290,81 @@ def get_last_updated():
 def mark_tiebreaker_games(conn: sqlite3.Connection | None = None):
     """Mark the last game of each week as the tiebreaker game.
     If a connection is provided, it is reused to avoid locking; otherwise a new
-    connection is opened and closed here.
+    connection is opened and closed here. Returns the weeks that were newly flagged.
     """
+    flagged_weeks = []
     try:
         owns_conn = False
         if conn is None:
             conn = get_db_connection()
             owns_conn = True
         if not conn:
-            return
-        
-        cursor = conn.cursor()
+            return flagged_weeks
         
-        # Get all weeks that have games
-        cursor.execute("SELECT DISTINCT week FROM picks ORDER BY week")
-        weeks = cursor.fetchall()
-        
-        for (week,) in weeks:
-            # If the importer already marked a tiebreaker game, respect it
-            cursor.execute("SELECT COUNT(*) FROM picks WHERE week = ? AND is_tiebreaker_game = 1", (week,))
-            flagged_row = cursor.fetchone()
-            flagged = flagged_row[0] if flagged_row else 0
-            if flagged > 0:
-                continue
-
-            # Otherwise, fallback to the last game of the week
-            cursor.execute("""
-                UPDATE picks 
-                SET is_tiebreaker_game = 1 
-                WHERE week = ? AND game_id = (
-                    SELECT MAX(game_id) FROM picks WHERE week = ?
-                )
-            """, (week, week))
+        flagged_weeks = results_update.flag_tiebreaker_games(conn)
         
         if owns_conn:
+            standings.refresh_weeks(conn, flagged_weeks, PLAYERS)
             conn.commit()
             conn.close()
         
     except Exception as e:
         print(f"Error marking tiebreaker games: {e}")
+    return flagged_weeks
+
+def _job_result(fn):
+    """Adapt a ``(message, success)`` operation to a job function taking ``report``."""
+    def run(report, *args):
+        message, success = fn(*args, progress=report)
+        return {'message': message, 'success': success}
+    return run
+
+
+def render_job_status(job, failure_color="danger"):
+    """Progress bar while a job runs, then the alert the old blocking callback used to show."""
+    if job is None:
+        return ""
+    if job['status'] == jobs.FAILED:
+        error = (job['error'] or "Job failed").splitlines()[0]
+        return dbc.Alert(f"Failed: {error}", color="danger", dismissable=True)
+    if job['status'] == jobs.DONE:
+        result = job['result'] or {}
+        color = "success" if result.get('success') else failure_color
+        return dbc.Alert(result.get('message', "Done"), color=color, dismissable=True)
+    percent = int(round((job['progress'] or 0) * 100))
+    return html.Div([
+        html.Div(job['message'] or "Working...", className="mb-1"),
+        dbc.Progress(value=max(percent, 5), label=f"{percent}%", striped=True, animated=True, style={'height': '14px'}),
+    ])
+
 
 # Upload callback
 @app.callback(
-    Output('upload-status', 'children'),
+    Output('upload-job', 'data'),
     Input('upload-picks', 'contents'),
     State('upload-picks', 'filename')
 )
 def upload_file(contents, filename):
     if contents is None:
-        return ""
-    
+        return None
+    # Decoded here so the queued job holds the workbook bytes, not the base64 text
     try:
-        message, success = process_excel_file(contents, filename)
-        color = "success" if success else "danger"
-        return dbc.Alert(message, color=color, dismissable=True)
-        
+        workbook = decode_upload(contents)
     except Exception as e:
-        return dbc.Alert(f"Upload error: {str(e)}", color="danger", dismissable=True)
+        logger.error(f"Upload of {filename} could not be decoded: {e}")
+        return None
+    # Every upload is its own job: a second file must not be mistaken for the one in flight
+    return job_runner.submit('excel_upload', _job_result(import_picks), workbook, dedupe=False)
 
 
 @app.callback(
-    Output('reload-status', 'children'),
+    Output('reload-job', 'data'),
     Input('reload-file-btn', 'n_clicks')
 )
 def reload_from_disk(n_clicks):
     if not n_clicks:
-        return ""
-
-    message, success = load_excel_from_disk()
-    color = "success" if success else "danger"
-    return dbc.Alert(message, color=color, dismissable=True)
+        return None
+    return job_runner.submit('excel_reload', _job_result(load_excel_from_disk))
 
 # Manual entry modal callback
 @app.callback(
@@ -1748,50 +1407,13 @@ def create_manual_entry_form():
         html.H5("Picks", className="mb-2"),
         dbc.Row([
             dbc.Col([
-                dbc.Label("Bobby"),
-                dbc.Select(id="manual-bobby", options=[
+                dbc.Label(person.title()),
+                dbc.Select(id=f"manual-{person}", options=[
                     {"label": "Away", "value": "away"},
                     {"label": "Home", "value": "home"}
                 ])
-            ], width=4),
-            dbc.Col([
-                dbc.Label("Chet"),
-                dbc.Select(id="manual-chet", options=[
-                    {"label": "Away", "value": "away"},
-                    {"label": "Home", "value": "home"}
-                ])
-            ], width=4),
-            dbc.Col([
-                dbc.Label("Clyde"),
-                dbc.Select(id="manual-clyde", options=[
-                    {"label": "Away", "value": "away"},
-                    {"label": "Home", "value": "home"}
-                ])
-            ], width=4)
-        ], className="mb-2"),
-        
-        dbc.Row([
-            dbc.Col([
-                dbc.Label("Henry"),
-                dbc.Select(id="manual-henry", options=[
-                    {"label": "Away", "value": "away"},
-                    {"label": "Home", "value": "home"}
-                ])
-            ], width=4),
-            dbc.Col([
-                dbc.Label("Nick"),
-                dbc.Select(id="manual-nick", options=[
-                    {"label": "Away", "value": "away"},
-                    {"label": "Home", "value": "home"}
-                ])
-            ], width=4),
-            dbc.Col([
-                dbc.Label("Riley"),
-                dbc.Select(id="manual-riley", options=[
-                    {"label": "Away", "value": "away"},
-                    {"label": "Home", "value": "home"}
-                ])
-            ], width=4)
+            ], width=4, className="mb-2")
+            for person in PLAYERS
         ], className="mb-3"),
         
         dbc.Row([
@@ -1810,19 +1432,42 @@ def create_manual_entry_form():
 
 # Update callback
 @app.callback(
-    Output('update-status', 'children'),
+    Output('update-job', 'data'),
     Input('update-btn', 'n_clicks')
 )
 def update_status(n_clicks):
     if not n_clicks:
-        return ""
-    
+        return None
+    return job_runner.submit('espn_update', _job_result(update_results_from_api))
+
+
+# Job progress: the actions above return a job id at once; this renders it until it finishes
+@app.callback(
+    Output('upload-status', 'children'),
+    Output('reload-status', 'children'),
+    Output('update-status', 'children'),
+    Output('job-poll', 'disabled'),
+    Input('upload-job', 'data'),
+    Input('reload-job', 'data'),
+    Input('update-job', 'data'),
+    Input('job-poll', 'n_intervals'),
+)
+def poll_jobs(upload_job, reload_job, update_job, _):
     try:
-        message, success = update_results_from_api()
-        color = "success" if success else "warning"
-        return dbc.Alert(message, color=color, dismissable=True)
+        found = [job_runner.get(job_id) for job_id in (upload_job, reload_job, update_job)]
     except Exception as e:
-        return dbc.Alert(f"Update failed: {str(e)}", color="danger", dismissable=True)
+        logger.error(f"Job status lookup failed: {e}")
+        return dash.no_update, dash.no_update, dash.no_update, True
+    upload_job, reload_job, update_job = found
+    return (
+        render_job_status(upload_job),
+        render_job_status(reload_job),
+        render_job_status(update_job, failure_color="warning"),
+        all(jobs.is_finished(job) for job in found),
+    )
+
+# Tabs whose content depends only on the picks table
+DATA_VERSIONED_TABS = {"leaderboard", "weekly_records", "weekly_picks", "grid", "live", "stats_dashboard", "team_breakdown"}
 
 # Main tab callback (now using RadioItems)
 @app.callback(
@@ -1830,6 +1475,13 @@ def update_status(n_clicks):
     Input("main-tabs", "value")
 )
 def render_tab_content(active_tab):
+    if active_tab in DATA_VERSIONED_TABS:
+        version = get_data_version()
+        if version is not None:
+            return tab_cache.get_or_build(("tab", active_tab, version), lambda: build_tab_content(active_tab))
+    return build_tab_content(active_tab)
+
+def build_tab_content(active_tab):
     if active_tab == "leaderboard":
         return render_leaderboard_tab()
     elif active_tab == "weekly_records":
@@ -1850,61 +1502,36 @@ def render_tab_content(active_tab):
         return render_postseason_picks_tab()
 
 # Helper function to get standings
+@cached_by_data_version
 def get_current_standings():
     try:
-        conn = get_db_connection()
+        conn = get_standings_connection()
         if not conn:
             return pd.DataFrame()
-        
-        df = pd.read_sql_query("SELECT * FROM picks WHERE actual_winner IS NOT NULL", conn)
-        conn.close()
-        
-        if df.empty:
+        try:
+            wins, losses, ties = standings.read_season_totals(conn, PLAYERS)
+        finally:
+            conn.close()
+        totals = wins + losses + ties
+        if not totals.any():
             return pd.DataFrame()
         
-        people = ['bobby', 'chet', 'clyde', 'henry', 'nick', 'riley']
-        standings = []
-        
-        for person in people:
-            person_pick_col = f'{person}_pick'
-            person_picks = df[df[person_pick_col].notna()]
-            
-            wins = 0
-            total_games = len(person_picks)
-            
-            for _, row in person_picks.iterrows():
-                # Convert picks to team names for comparison
-                if row[person_pick_col] == 'away':
-                    person_team_pick = row['away_team']
-                elif row[person_pick_col] == 'home':
-                    person_team_pick = row['home_team']
-                else:
-                    person_team_pick = row[person_pick_col]
-                
-                # Convert actual winner
-                if row['actual_winner'] == 'away':
-                    actual_team_winner = row['away_team']
-                elif row['actual_winner'] == 'home':
-                    actual_team_winner = row['home_team']
-                else:
-                    actual_team_winner = row['actual_winner']
-                
-                if person_team_pick == actual_team_winner:
-                    wins += 1
-            
-            losses = total_games - wins
-            win_pct = (wins / total_games * 100) if total_games > 0 else 0
-            
-            standings.append({
-                'Rank': 0,
-                'Player': person.title(),
-                'Wins': wins,
-                'Losses': losses,
-                'Total': total_games,
-                'Win %': f"{win_pct:.1f}%"
-            })
+        players = PLAYERS
+        win_pct = np.divide(wins, totals, out=np.zeros(len(totals)), where=totals > 0) * 100
         
-        standings_df = pd.DataFrame(standings)
+        standings_df = pd.DataFrame({
+            'Rank': 0,
+            'Player': [person.title() for person in players],
+            'Wins': wins,
+            'Losses': totals - wins,
+            'Total': totals,
+            'Win %': [f"{pct:.1f}%" for pct in win_pct]
+        })
+        store = get_pick_store()
+        if store is not None and (~store.final).any():
+            odds = get_race_odds(store, store.latest_week())
+            standings_df['Title Odds'] = [f"{odds.get(person, {}).get('season_win_prob', 0) * 100:.1f}%" for person in players]
+            standings_df['Proj. Wins'] = [f"{odds.get(person, {}).get('expected_season_wins', w):.1f}" for person, w in zip(players, wins)]
         standings_df = standings_df.sort_values('Wins', ascending=False)
         standings_df['Rank'] = range(1, len(standings_df) + 1)
         
@@ -2002,7 +1629,7 @@ def render_leaderboard_tab():
                         {"name": "Losses", "id": "Losses"},
                         {"name": "Total", "id": "Total"},
                         {"name": "Win %", "id": "Win %"}
-                    ],
+                    ] + [{"name": c, "id": c} for c in ['Title Odds', 'Proj. Wins'] if c in standings_df.columns],
                     style_cell={'textAlign': 'center', 'padding': '12px'},
                     style_header={'backgroundColor': '#2c3e50', 'color': 'white', 'fontWeight': 'bold'},
                     style_data={'backgroundColor': 'white', 'color': '#1a202c'},
@@ -2145,7 +1772,7 @@ def update_weekly_picks_content(selected_week):
         if df.empty:
             return dbc.Alert(f"No games found for Week {selected_week}.", color="info", className="text-center mt-4")
         
-        people = ['bobby', 'chet', 'clyde', 'henry', 'riley', 'nick']
+        people = PLAYERS
         
         # Create individual game cards with modern design
         game_cards = []
@@ -2915,13 +2542,28 @@ def fetch_playoff_pools(n_clicks):
     locked_players, bubble_players = build_players_pool(locked_ids, bubble_ids)
 
     # Tables
-    # Attach best-effort stats to players
+    # Attach stats from the warehouse (one query); anything missing or stale is fetched in the background,
+    # or, with the refresher off, a bounded batch at a time right here
+    pool_ids = [p.get('id') for p in locked_players + bubble_players if p.get('id')]
+    conn = get_db_connection()
+    try:
+        missing = player_stats.stale_ids(conn, pool_ids, Config.CURRENT_SEASON)
+        if missing and not Config.ENABLE_STATS_REFRESHER:
+            player_stats.prefetch(conn, missing[:Config.STATS_INLINE_LIMIT], Config.CURRENT_SEASON,
+                                  timeout=Config.ESPN_API_TIMEOUT, deadline=Config.ESPN_REFRESH_DEADLINE)
+            missing = player_stats.stale_ids(conn, pool_ids, Config.CURRENT_SEASON)
+        season_stats = player_stats.read_stats(conn, Config.CURRENT_SEASON, pool_ids)
+    finally:
+        conn.close()
+    if missing and Config.ENABLE_STATS_REFRESHER:
+        stats_refresher.request(missing)
+
     def with_stats(players):
         rows = []
         for p in players:
             row = dict(p)
             pid = p.get('id')
-            stats = fetch_player_stats(pid) if pid else {}
+            stats = season_stats.get(str(pid), {}) if pid else {}
             row.update({
                 'GP': stats.get('GP'),
                 'PassYds': stats.get('PassYds'),
@@ -2948,6 +2590,13 @@ def fetch_playoff_pools(n_clicks):
         export_format='csv',
         export_headers='display'
     ) if not lp_df.empty else dbc.Alert("No data yet.", color="light")
+    if missing and not lp_df.empty:
+        lp_table = html.Div([
+            dbc.Alert(f"Fetching season stats for {len(missing)} players in the background; reload in a minute to fill them in."
+                      if Config.ENABLE_STATS_REFRESHER else
+                      f"Season stats for {len(missing)} players are not loaded yet; reload to fetch the next batch.", color="info"),
+            lp_table,
+        ])
 
     bp_table = dash_table.DataTable(
         data=bp_df.to_dict('records'),
@@ -3047,6 +2696,44 @@ def render_live_tab():
         return dbc.Alert(f"Error rendering live tab: {str(e)}", color="danger")
 
 
+@app.callback(
+    Output("live-interval", "interval"),
+    Output("live-interval", "disabled"),
+    Input("live-week", "value"),
+    Input("live-interval", "n_intervals")
+)
+def adapt_live_interval(week, _tick):
+    """Refresh every ~30s while the week has live games, slower before kickoff, never once final."""
+    if not week:
+        return 60_000, False
+    try:
+        conn = get_db_connection()
+        try:
+            if not season_schedule.has_schedule(conn, Config.CURRENT_SEASON):
+                return 60_000, False
+            delay = season_schedule.next_poll_delay(conn, Config.CURRENT_SEASON, int(week))
+        finally:
+            conn.close()
+        if delay is None:
+            return 60_000, True
+        return int(delay * 1000), False
+    except Exception as e:
+        print(f"Error computing live refresh interval: {e}")
+        return 60_000, False
+
+
+def live_data_age_note(week, fetched_at):
+    """'Updated Xs ago', turned into a warning once the snapshot is well past its refresh cadence."""
+    if not fetched_at:
+        return None
+    age = max(0, int(time.time() - fetched_at))
+    label = f"{age}s" if age < 120 else f"{age // 60} min"
+    interval = live_poller.interval(week)
+    if interval is not None and age > max(3 * interval, 120):
+        return dbc.Alert(f"ESPN is not responding; showing scores from {label} ago.", color="warning", className="py-2")
+    return html.Div(f"Updated {label} ago", className="text-muted mb-2", style={'fontSize': '12px'})
+
+
 @app.callback(
     Output("live-content", "children"),
     Input("live-week", "value"),
@@ -3057,9 +2744,10 @@ def update_live_content(week, _refresh_clicks, _tick):
     if not week:
         return dbc.Alert("Select a week.", color="info")
     try:
-        live = fetch_live_scores_for_week(int(week))
+        live = live_poller.snapshot(int(week))
         if not live or not live.get('games'):
             return dbc.Alert("No live data right now for this week.", color="light")
+        freshness = live_data_age_note(int(week), live.get('fetched_at'))
 
         # Summary table per player: currently correct on in-progress games
         summary_df = pd.DataFrame(live['summary']) if live.get('summary') else pd.DataFrame()
@@ -3072,7 +2760,7 @@ def update_live_content(week, _refresh_clicks, _tick):
         ) if not summary_df.empty else dbc.Alert("No in-progress games to summarize.", color="light")
 
         # Game cards with current scores and who is right/wrong so far
-        people = ['bobby', 'chet', 'clyde', 'henry', 'nick', 'riley']
+        people = PLAYERS
         cards = []
         for g in live['games']:
             picks_rows = []
@@ -3102,10 +2790,12 @@ def update_live_content(week, _refresh_clicks, _tick):
             )
 
         return [
+            freshness,
             dbc.Card([
                 dbc.CardHeader("Live Summary"),
                 dbc.CardBody([summary_table])
             ], className="mb-3"),
+            build_week_race_card(int(week), live),
             dbc.Card([
                 dbc.CardHeader("Game-by-Game Live View"),
                 dbc.CardBody(cards)
@@ -3115,20 +2805,72 @@ def update_live_content(week, _refresh_clicks, _tick):
         return dbc.Alert(f"Error fetching live data: {str(e)}", color="danger")
 
 
+def build_week_race_card(week, live):
+    """Exact clinched/alive/eliminated status for the week, using the live tiebreaker score as a floor."""
+    try:
+        store = get_pick_store()
+        if store is None or not len(store):
+            return html.Div()
+
+        floor = 0
+        tb_idx = store.tiebreaker_row(week)
+        if tb_idx is not None:
+            tb_away = clean_team_name(store.team_name(store.away_ids[tb_idx]))
+            tb_home = clean_team_name(store.team_name(store.home_ids[tb_idx]))
+            for g in live.get('games', []):
+                if g['away'] == tb_away and g['home'] == tb_home:
+                    floor = g['away_score'] + g['home_score']
+
+        statuses = clinch_solver.solve_week(store, week, tiebreaker_total_floor=floor)
+        odds = get_race_odds(store, week, tiebreaker_total_floor=floor)
+        week_wins = (store.correctness[store.week_rows(week)] == picks_store.CORRECT).sum(axis=0)
+        rows = []
+        for p, person in enumerate(store.players):
+            player_odds = odds.get(person, {})
+            rows.append({
+                'Player': person.title(),
+                'Wins': int(week_wins[p]),
+                'Status': RACE_STATUS_LABELS[statuses[person]],
+                'Win Week %': f"{player_odds.get('week_win_prob', 0) * 100:.1f}%",
+                'Proj. Wins': f"{player_odds.get('expected_week_wins', week_wins[p]):.1f}",
+                'Win Season %': f"{player_odds.get('season_win_prob', 0) * 100:.1f}%",
+            })
+        rows.sort(key=lambda r: -r['Wins'])
+
+        return dbc.Card([
+            dbc.CardHeader([html.H5(f"Week {week} Race", className="mb-0"), html.Small(f"Status is exact over every remaining outcome; odds from {Config.SIMULATION_TRIALS:,} simulated finishes", className="text-muted")]),
+            dbc.CardBody([
+                dash_table.DataTable(
+                    data=rows,
+                    columns=[{"name": k, "id": k} for k in ['Player', 'Wins', 'Status', 'Win Week %', 'Proj. Wins', 'Win Season %']],
+                    style_cell={'textAlign': 'center', 'padding': '10px'},
+                    style_header={'backgroundColor': '#6610f2', 'color': 'white', 'fontWeight': 'bold'},
+                    style_data={'backgroundColor': 'white', 'color': '#1a202c'},
+                )
+            ])
+        ], className="mb-3")
+    except Exception as e:
+        return dbc.Alert(f"Week race unavailable: {e}", color="light")
+
+
 def fetch_live_scores_for_week(week: int):
     """Scrape ESPN scoreboard for given week and map to picks for 'currently winning'."""
     try:
         current_year = Config.CURRENT_SEASON
-        url = f"https://site.api.espn.com/apis/site/v2/sports/football/nfl/scoreboard?seasontype=2&week={week}&dates={current_year}"
-        import requests
-        resp = requests.get(url, timeout=Config.ESPN_API_TIMEOUT)
+        resp = espn_client.get(espn_client.scoreboard_url(week, current_year), timeout=Config.ESPN_API_TIMEOUT)
         if resp.status_code != 200:
             return None
         data = resp.json()
         games = []
 
-        # Read picks for week
+        # Read picks for week (and keep the schedule's game states current)
         conn = get_db_connection()
+        try:
+            if season_schedule.ingest_scoreboard(conn, current_year, week, data):
+                standings.refresh_weeks(conn, [week], PLAYERS)
+            conn.commit()
+        except Exception as e:
+            print(f"Error updating schedule for week {week}: {e}")
         df = pd.read_sql_query("SELECT * FROM picks WHERE week = ?", conn, params=(week,))
         conn.close()
 
@@ -3177,7 +2919,7 @@ def fetch_live_scores_for_week(week: int):
                 if away_score != home_score:
                     leader = away_name if away_score > home_score else home_name
                 if rec is not None:
-                    for person in ['bobby', 'chet', 'clyde', 'henry', 'nick', 'riley']:
+                    for person in PLAYERS:
                         val = rec.get(f'{person}_pick') if isinstance(rec, pd.Series) else rec[f'{person}_pick']
                         # Normalize stored X picks (team names already stored by importer)
                         picks[person] = val if pd.notna(val) else None
@@ -3194,21 +2936,21 @@ def fetch_live_scores_for_week(week: int):
 
         # Build summary counts per person for in-progress games
         summary = []
-        for person in ['Bobby', 'Chet 🐡', 'Clyde', 'Henry', 'Nick', 'Riley']:
-            pkey = person.lower()
+        for person in PLAYERS:
             correct = 0
             wrong = 0
             for g in games:
-                pick = g['picks'].get(pkey)
+                pick = g['picks'].get(person)
                 if not pick or not g['leader']:
                     continue
                 if pick == g['leader']:
                     correct += 1
                 else:
                     wrong += 1
-            summary.append({'Player': person, 'Right Now': correct, 'Wrong Now': wrong})
+            summary.append({'Player': person.title(), 'Right Now': correct, 'Wrong Now': wrong})
 
-        return {'games': games, 'summary': summary}
+        # A stale cached scoreboard (ESPN down) keeps its real age rather than looking fresh
+        return {'games': games, 'summary': summary, 'fetched_at': time.time() - getattr(resp, 'age', 0.0)}
     except Exception:
         return None
 def render_weekly_records_tab():
@@ -3218,17 +2960,14 @@ def render_weekly_records_tab():
         # Determine latest week clinch status for header badge
         header_badge = None
         try:
-            conn = get_db_connection()
-            if conn:
-                df_all = pd.read_sql_query("SELECT * FROM picks", conn)
-                conn.close()
-                if not df_all.empty:
-                    latest_week = int(df_all['week'].max())
-                    clinched = is_week_clinched(df_all, latest_week, ['bobby','chet','clyde','henry','nick','riley'])
-                    header_badge = html.Span(
-                        "🔒 Latest Week Clinched" if clinched else "⏳ Latest Week In Play",
-                        style={'marginLeft': '10px', 'fontWeight': '700', 'color': '#212529'}
-                    )
+            store = get_pick_store()
+            if store is not None and len(store):
+                latest_week = store.latest_week()
+                clinched = is_week_clinched(store, latest_week)
+                header_badge = html.Span(
+                    "🔒 Latest Week Clinched" if clinched else "⏳ Latest Week In Play",
+                    style={'marginLeft': '10px', 'fontWeight': '700', 'color': '#212529'}
+                )
         except Exception:
             header_badge = None
         
@@ -3362,70 +3101,45 @@ def render_weekly_records_tab():
     except Exception as e:
         return dbc.Alert(f"Error loading weekly records: {str(e)}", color="danger")
 
+RACE_STATUS_LABELS = {
+    clinch_solver.CLINCHED: '🔒 Clinched',
+    clinch_solver.ALIVE: '⏳ Alive',
+    clinch_solver.ELIMINATED: '❌ Eliminated',
+}
+
 def build_live_tiebreaker_card():
     try:
-        conn = get_db_connection()
-        if not conn:
+        store = get_pick_store()
+        if store is None:
             return dbc.Alert("Database unavailable for live tiebreaker.", color="warning")
-
-        df_all = pd.read_sql_query("SELECT * FROM picks", conn)
-        conn.close()
-        if df_all.empty:
+        if not len(store):
             return dbc.Alert("No data for live tiebreaker.", color="light")
 
-        latest_week = int(df_all['week'].max())
-        week_df = df_all[df_all['week'] == latest_week]
-        completed = week_df[week_df['actual_winner'].notna()]
+        latest_week = store.latest_week()
+        rows_slice = store.week_rows(latest_week)
+        week_wins = (store.correctness[rows_slice] == picks_store.CORRECT).sum(axis=0)
 
-        people = ['bobby', 'chet', 'clyde', 'henry', 'nick', 'riley']
-        record_map = {}
-        for person in people:
-            col = f"{person}_pick"
-            picks = completed[completed[col].notna()]
-            wins = 0
-            for _, row in picks.iterrows():
-                if row[col] == 'away':
-                    pick_team = row['away_team']
-                elif row[col] == 'home':
-                    pick_team = row['home_team']
-                else:
-                    pick_team = row[col]
-                if row['actual_winner'] == 'away':
-                    actual = row['away_team']
-                elif row['actual_winner'] == 'home':
-                    actual = row['home_team']
-                else:
-                    actual = row['actual_winner']
-                if pick_team == actual:
-                    wins += 1
-            record_map[person] = {'wins': wins}
+        best_wins = week_wins.max() if week_wins.size else 0
+        contenders = [p for p, wins in zip(store.players, week_wins) if wins == best_wins]
 
-        best_wins = max(v['wins'] for v in record_map.values()) if record_map else 0
-        contenders = [p for p, rec in record_map.items() if rec['wins'] == best_wins]
-
-        tb_row = week_df[week_df.get('is_tiebreaker_game', False) == 1]
-        tb_row = tb_row.iloc[-1] if not tb_row.empty else None
-        if tb_row is None:
+        tb_idx = store.tiebreaker_row(latest_week)
+        if tb_idx is None:
             return dbc.Card([
                 dbc.CardHeader("Current Week Tiebreaker Guesses (Live)"),
                 dbc.CardBody([dbc.Alert("No tiebreaker game configured for latest week.", color="light")])
             ])
 
-        game_matchup = f"{tb_row['away_team']} vs {tb_row['home_team']}"
+        game_matchup = f"{store.team_name(store.away_ids[tb_idx])} vs {store.team_name(store.home_ids[tb_idx])}"
+        statuses = clinch_solver.solve_week(store, latest_week)
         rows = []
         for person in contenders:
-            raw = tb_row.get(f"{person}_tiebreaker")
-            guess = "N/A"
-            if pd.notna(raw):
-                try:
-                    guess = str(int(float(raw)))
-                except Exception:
-                    guess = str(raw)
-            rows.append({'Player': person.title(), 'Guess': guess})
+            raw = store.tiebreakers[tb_idx, store.players.index(person)]
+            guess = "N/A" if np.isnan(raw) else str(int(raw))
+            rows.append({'Player': person.title(), 'Guess': guess, 'Status': RACE_STATUS_LABELS[statuses[person]]})
 
         table = dash_table.DataTable(
             data=rows,
-            columns=[{"name": "Player", "id": "Player"}, {"name": "Guess", "id": "Guess"}],
+            columns=[{"name": "Player", "id": "Player"}, {"name": "Guess", "id": "Guess"}, {"name": "Status", "id": "Status"}],
             style_cell={'textAlign': 'center', 'padding': '10px'},
             style_header={'backgroundColor': '#6610f2', 'color': 'white', 'fontWeight': 'bold'},
             style_data={'backgroundColor': 'white', 'color': '#1a202c'},
@@ -3438,85 +3152,46 @@ def build_live_tiebreaker_card():
     except Exception as e:
         return dbc.Alert(f"Live tiebreaker error: {e}", color="danger")
 
+@cached_by_data_version
 def get_weekly_records_data():
     """Get weekly records data with totals row"""
     try:
-        conn = get_db_connection()
+        conn = get_standings_connection()
         if not conn:
             return pd.DataFrame()
-        
-        df = pd.read_sql_query("SELECT * FROM picks WHERE actual_winner IS NOT NULL", conn)
-        conn.close()
-        
-        if df.empty:
+        try:
+            weeks, wins, losses, ties = standings.read_weekly_records(conn, PLAYERS)
+        finally:
+            conn.close()
+        if not weeks.size:
             return pd.DataFrame()
         
-        people = ['bobby', 'chet', 'clyde', 'henry', 'nick', 'riley']
-        weeks = sorted(df['week'].unique())
+        players = PLAYERS
+        totals = wins + losses + ties
+        losses = totals - wins
+        win_pct = np.divide(wins, totals, out=np.zeros(wins.shape), where=totals > 0) * 100
         
         weekly_records = []
-        totals = {'Week': 'TOTALS'}
-        
-        for week in weeks:
-            week_df = df[df['week'] == week]
+        for w, week in enumerate(weeks):
             week_record = {'Week': f"Week {week}"}
-            
-            for person in people:
-                person_pick_col = f'{person}_pick'
-                person_week_picks = week_df[week_df[person_pick_col].notna()]
-                
-                if len(person_week_picks) > 0:
-                    wins = 0
-                    for _, row in person_week_picks.iterrows():
-                        # Handle pick comparison
-                        if row[person_pick_col] == 'away':
-                            person_team_pick = row['away_team']
-                        elif row[person_pick_col] == 'home':
-                            person_team_pick = row['home_team']
-                        else:
-                            person_team_pick = row[person_pick_col]
-                        
-                        # Handle actual winner
-                        if row['actual_winner'] == 'away':
-                            actual_team_winner = row['away_team']
-                        elif row['actual_winner'] == 'home':
-                            actual_team_winner = row['home_team']
-                        else:
-                            actual_team_winner = row['actual_winner']
-                        
-                        if person_team_pick == actual_team_winner:
-                            wins += 1
-                    
-                    total = len(person_week_picks)
-                    losses = total - wins
-                    win_pct = (wins / total * 100) if total > 0 else 0
-                    
-                    week_record[person.title()] = f"{wins}-{losses} ({win_pct:.0f}%)"
-                    
-                    # Add to totals
-                    if person.title() not in totals:
-                        totals[person.title()] = {'wins': 0, 'total': 0}
-                    totals[person.title()]['wins'] += wins
-                    totals[person.title()]['total'] += total
+            for p, person in enumerate(players):
+                if totals[w, p] > 0:
+                    week_record[person.title()] = f"{wins[w, p]}-{losses[w, p]} ({win_pct[w, p]:.0f}%)"
                 else:
                     week_record[person.title()] = "0-0 (0%)"
-            
             weekly_records.append(week_record)
         
-        # Calculate totals row
-        for person in people:
-            person_title = person.title()
-            if person_title in totals and isinstance(totals[person_title], dict):
-                total_wins = totals[person_title]['wins']
-                total_games = totals[person_title]['total']
-                total_losses = total_games - total_wins
-                total_win_pct = (total_wins / total_games * 100) if total_games > 0 else 0
-                totals[person_title] = f"{total_wins}-{total_losses} ({total_win_pct:.1f}%)"
+        # Totals row
+        total_wins = wins.sum(axis=0)
+        total_games = totals.sum(axis=0)
+        totals_row = {'Week': 'TOTALS'}
+        for p, person in enumerate(players):
+            if total_games[p] > 0:
+                total_win_pct = total_wins[p] / total_games[p] * 100
+                totals_row[person.title()] = f"{total_wins[p]}-{total_games[p] - total_wins[p]} ({total_win_pct:.1f}%)"
             else:
-                totals[person_title] = "0-0 (0%)"
-        
-        # Add totals row
-        weekly_records.append(totals)
+                totals_row[person.title()] = "0-0 (0%)"
+        weekly_records.append(totals_row)
         
         return pd.DataFrame(weekly_records)
         
@@ -3526,199 +3201,38 @@ def get_weekly_records_data():
         return pd.DataFrame()
 
 
+@cached_by_data_version
 def get_weekly_winners():
-    """Determine weekly winners using total points in the last game as tiebreaker."""
+    """Weekly winners (most wins, then closest total points in the tiebreaker game)."""
     try:
-        conn = get_db_connection()
+        conn = get_standings_connection()
         if not conn:
             return []
+        try:
+            rows = standings.read_weekly_winners(conn)
+        finally:
+            conn.close()
 
-        df = pd.read_sql_query("SELECT * FROM picks WHERE actual_winner IS NOT NULL", conn)
-        conn.close()
-
-        if df.empty:
-            return []
-
-        people = ['bobby', 'chet', 'clyde', 'henry', 'nick', 'riley']
-        weeks = sorted(df['week'].unique())
-        winners_rows = []
-
-        for week in weeks:
-            week_df = df[df['week'] == week]
-            record_map = {}
-
-            for person in people:
-                person_col = f'{person}_pick'
-                picks = week_df[week_df[person_col].notna()]
-                wins = 0
-                for _, row in picks.iterrows():
-                    if row[person_col] == 'away':
-                        pick_team = row['away_team']
-                    elif row[person_col] == 'home':
-                        pick_team = row['home_team']
-                    else:
-                        pick_team = row[person_col]
-
-                    if row['actual_winner'] == 'away':
-                        actual = row['away_team']
-                    elif row['actual_winner'] == 'home':
-                        actual = row['home_team']
-                    else:
-                        actual = row['actual_winner']
-
-                    if pick_team == actual:
-                        wins += 1
-
-                total_games = len(picks)
-                record_map[person] = {
-                    'wins': wins,
-                    'total': total_games,
-                    'losses': total_games - wins
-                }
-
-            if not record_map:
-                continue
-
-            best_wins = max(p['wins'] for p in record_map.values())
-            contenders = [p for p, rec in record_map.items() if rec['wins'] == best_wins]
-            winners = contenders[:]
-            tiebreaker_detail = "Tiebreaker not needed"
-
-            if len(contenders) > 1:
-                tb_game_df = week_df[week_df.get('is_tiebreaker_game', False) == 1]
-                tb_row = tb_game_df.iloc[-1] if not tb_game_df.empty else None
-
-                if tb_row is not None and pd.notna(tb_row.get('away_score')) and pd.notna(tb_row.get('home_score')):
-                    actual_total = int(tb_row['away_score']) + int(tb_row['home_score'])
-                    game_matchup = f"{tb_row['away_team']} vs {tb_row['home_team']}"
-                    final_score = f"{int(tb_row['away_score'])}-{int(tb_row['home_score'])}"
-                    
-                    contender_errors = []
-                    for person in contenders:
-                        tb_val_raw = tb_row.get(f"{person}_tiebreaker")
-                        tb_val = None
-                        if pd.notna(tb_val_raw):
-                            try:
-                                tb_val = int(float(tb_val_raw))
-                            except Exception:
-                                tb_val = None
-
-                        error = abs(tb_val - actual_total) if tb_val is not None else float('inf')
-                        contender_errors.append({
-                            'name': person,
-                            'error': error,
-                            'prediction': tb_val
-                        })
-
-                    best_error = min(c['error'] for c in contender_errors)
-                    winners = [c['name'] for c in contender_errors if c['error'] == best_error]
-
-                    detail_parts = []
-                    for c in contender_errors:
-                        pred_text = f"{int(c['prediction'])}" if c['prediction'] is not None else "N/A"
-                        if c['error'] == float('inf'):
-                            diff_text = "no pick"
-                        else:
-                            diff_text = f"off by {int(c['error'])}"
-                        detail_parts.append(f"{c['name'].title()}: {pred_text} ({diff_text})")
-
-                    tiebreaker_detail = f"🏈 {game_matchup} (Final: {final_score}, Total: {actual_total} pts) | " + "; ".join(detail_parts)
-                else:
-                    # If last-game score missing, still list contenders' guesses for transparency
-                    if tb_row is not None:
-                        game_matchup = f"{tb_row['away_team']} vs {tb_row['home_team']}"
-                        detail_parts = []
-                        for person in contenders:
-                            tb_val_raw = tb_row.get(f"{person}_tiebreaker")
-                            pred_text = "N/A"
-                            if pd.notna(tb_val_raw):
-                                try:
-                                    pred_text = str(int(float(tb_val_raw)))
-                                except Exception:
-                                    pred_text = str(tb_val_raw)
-                            detail_parts.append(f"{person.title()}: {pred_text}")
-                        tiebreaker_detail = f"🏈 {game_matchup} (Final: TBD) | Contenders' guesses: " + ", ".join(detail_parts)
-                    else:
-                        tiebreaker_detail = "Tiebreaker unavailable (missing last-game setup)."
-
-            # Determine lock status (clinched) for the week based on remaining games and pick differences
-            clinched = is_week_clinched(df, week, people)
-
-            winner_names = ", ".join([w.title() for w in winners]) if winners else "-"
-            primary_winner = winners[0] if winners else contenders[0]
-            rec = record_map.get(primary_winner, {'wins': 0, 'losses': 0})
-            record_text = f"{rec['wins']}-{rec['losses']}"
-
-            winners_rows.append({
+        return [
+            {
                 'Week': f"Week {week}",
-                'Winner': winner_names,
-                'Record': record_text,
+                'Winner': winners or "-",
+                'Record': f"{wins}-{losses}",
                 'Tiebreaker': tiebreaker_detail,
                 'Status': '🔒 Clinched' if clinched else '⏳ In Play'
-            })
-
-        return winners_rows
+            }
+            for week, winners, wins, losses, tiebreaker_detail, clinched in rows
+        ]
 
     except Exception as e:
         print(f"Error computing weekly winners: {e}")
         return []
 
-def is_week_clinched(df_all, week, people):
-    """Approximate clinch detection: if no trailing player can catch the leader given remaining differing picks.
-    - Compute wins so far for each player.
-    - Identify current unique leader; if tie at top, not clinched.
-    - Count remaining games and for each trailing player, count games where their pick differs from leader's.
-    - If trailing player's wins + differing_remaining < leader_wins, they cannot catch; if true for all, clinched.
-    """
+def is_week_clinched(store, week):
+    """True once some player is guaranteed at least a share of the week (see clinch_solver)."""
     try:
-        week_df = df_all[df_all['week'] == week]
-        completed = week_df[week_df['actual_winner'].notna()]
-        remaining = week_df[week_df['actual_winner'].isna()]
-
-        # wins so far
-        wins_map = {}
-        for person in people:
-            col = f"{person}_pick"
-            wins = 0
-            for _, row in completed.iterrows():
-                pick_team = row['away_team'] if row[col] == 'away' else (row['home_team'] if row[col] == 'home' else row[col])
-                actual = row['away_team'] if row['actual_winner'] == 'away' else (row['home_team'] if row['actual_winner'] == 'home' else row['actual_winner'])
-                if pick_team == actual:
-                    wins += 1
-            wins_map[person] = wins
-
-        if not wins_map:
-            return False
-
-        # current leader(s)
-        max_wins = max(wins_map.values())
-        leaders = [p for p, w in wins_map.items() if w == max_wins]
-        if len(leaders) != 1:
-            return False  # tie at top, not clinched
-        leader = leaders[0]
-
-        # For each trailing player, can they catch or pass?
-        leader_wins = wins_map[leader]
-        for person in people:
-            if person == leader:
-                continue
-            person_wins = wins_map[person]
-            deficit = leader_wins - person_wins
-            if deficit <= 0:
-                return False
-            # Count remaining games with differing picks
-            diff_count = 0
-            lcol = f"{leader}_pick"
-            pcol = f"{person}_pick"
-            for _, row in remaining.iterrows():
-                lpick = row['away_team'] if row[lcol] == 'away' else (row['home_team'] if row[lcol] == 'home' else row[lcol])
-                ppick = row['away_team'] if row[pcol] == 'away' else (row['home_team'] if row[pcol] == 'home' else row[pcol])
-                if lpick != ppick:
-                    diff_count += 1
-            # If even sweeping all differing games can't erase deficit, person cannot catch
-            if person_wins + diff_count >= leader_wins:
-                return False
-        return True
+        statuses = clinch_solver.solve_week(store, week)
+        return any(status == clinch_solver.CLINCHED for status in statuses.values())
     except Exception:
         return False
 
@@ -3726,62 +3240,21 @@ def is_week_clinched(df_all, week, people):
 def create_weekly_trends_chart():
     """Create a line chart showing weekly win percentage trends"""
     try:
-        conn = get_db_connection()
-        if not conn:
+        store = get_pick_store()
+        if store is None or not store.has_results():
             return go.Figure()
         
-        df = pd.read_sql_query("SELECT * FROM picks WHERE actual_winner IS NOT NULL", conn)
-        conn.close()
-        
-        if df.empty:
-            return go.Figure()
-        
-        people = ['bobby', 'chet', 'clyde', 'henry', 'nick', 'riley']
-        weeks = sorted(df['week'].unique())
+        weeks, wins, totals = store.weekly_tally()
+        weekly_percentages = np.divide(wins, totals, out=np.zeros(wins.shape), where=totals > 0) * 100
         
         fig = go.Figure()
         
         colors = ['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd', '#8c564b']
         
-        for i, person in enumerate(people):
-            person_pick_col = f'{person}_pick'
-            weekly_percentages = []
-            
-            for week in weeks:
-                week_df = df[df['week'] == week]
-                person_week_picks = week_df[week_df[person_pick_col].notna()]
-                
-                if len(person_week_picks) > 0:
-                    wins = 0
-                    for _, row in person_week_picks.iterrows():
-                        # Handle pick comparison
-                        if row[person_pick_col] == 'away':
-                            person_team_pick = row['away_team']
-                        elif row[person_pick_col] == 'home':
-                            person_team_pick = row['home_team']
-                        else:
-                            person_team_pick = row[person_pick_col]
-                        
-                        # Handle actual winner
-                        if row['actual_winner'] == 'away':
-                            actual_team_winner = row['away_team']
-                        elif row['actual_winner'] == 'home':
-                            actual_team_winner = row['home_team']
-                        else:
-                            actual_team_winner = row['actual_winner']
-                        
-                        if person_team_pick == actual_team_winner:
-                            wins += 1
-                    
-                    total = len(person_week_picks)
-                    win_pct = (wins / total * 100) if total > 0 else 0
-                    weekly_percentages.append(win_pct)
-                else:
-                    weekly_percentages.append(0)
-            
+        for i, person in enumerate(store.players):
             fig.add_trace(go.Scatter(
                 x=[f"Week {w}" for w in weeks],
-                y=weekly_percentages,
+                y=weekly_percentages[:, i],
                 mode='lines+markers',
                 name=person.title(),
                 line=dict(color=colors[i % len(colors)], width=3),
@@ -3807,20 +3280,20 @@ def create_weekly_trends_chart():
 def render_stats_dashboard_tab():
     """Comprehensive statistics dashboard with streaks and advanced analytics"""
     try:
-        conn = get_db_connection()
-        if not conn:
+        store = get_pick_store()
+        if store is None:
             return dbc.Alert("Database temporarily unavailable.", color="warning")
         
-        df = pd.read_sql_query("SELECT * FROM picks WHERE actual_winner IS NOT NULL ORDER BY week, game_id", conn)
-        conn.close()
-        
-        if df.empty:
+        if not store.has_results():
             return dbc.Alert("No completed games available for statistics.", color="info")
         
+        df = store.completed_frame()
+        
         # Calculate various statistics
-        streak_data = calculate_streaks(df)
-        best_worst_weeks = calculate_best_worst_weeks(df)
-        head_to_head = calculate_head_to_head_records(df)
+        streak_data = calculate_streaks(store)
+        best_worst_weeks = calculate_best_worst_weeks(store)
+        h2h_matrix = head_to_head.HeadToHead(store)
+        h2h_records = calculate_head_to_head_records(store, h2h_matrix)
         player_insights = calculate_player_insights(df)
         tiebreaker_stats = calculate_tiebreaker_accuracy(df)
         
@@ -3833,7 +3306,8 @@ def render_stats_dashboard_tab():
                             html.H4([html.I(className="fas fa-fire me-2", style={'color': '#D50A0A'}), "Current Streaks"], className="mb-0")
                         ]),
                         dbc.CardBody([
-                            create_streaks_display(streak_data)
+                            create_streaks_display(streak_data),
+                            dcc.Graph(figure=create_streak_timeline(store), className="mt-4")
                         ])
                     ], className="content-card")
                 ], width=12)
@@ -3923,7 +3397,8 @@ def render_stats_dashboard_tab():
                                 html.Strong("Explanation: "),
                                 "When two players pick different teams for the same game, whoever picked the winning team gets a head-to-head win. This measures individual game decision-making skill."
                             ], color="info", className="mb-3"),
-                            create_head_to_head_display(head_to_head)
+                            create_head_to_head_display(h2h_records),
+                            dcc.Graph(figure=create_head_to_head_heatmap(h2h_matrix), className="mt-4")
                         ])
                     ], className="content-card")
                 ], width=12)
@@ -3933,93 +3408,62 @@ def render_stats_dashboard_tab():
     except Exception as e:
         return dbc.Alert(f"Error loading statistics: {str(e)}", color="danger")
 
-def calculate_streaks(df):
+def calculate_streaks(store):
     """Calculate current winning/losing streaks for each player"""
-    people = ['bobby', 'chet', 'clyde', 'henry', 'nick', 'riley']
     streak_data = []
+    histories = streaks.player_streaks(store)
     
-    for person in people:
-        person_pick_col = f'{person}_pick'
-        person_df = df[df[person_pick_col].notna()].sort_values(['week', 'game_id'])
-        
-        if len(person_df) == 0:
+    for person in store.players:
+        history = histories.get(person)
+        if history is None or not len(history):
             continue
         
-        # Calculate current streak
-        current_streak = 0
-        streak_type = None
-        max_win_streak = 0
-        max_loss_streak = 0
-        
-        # Get results in chronological order
-        results = []
-        for _, row in person_df.iterrows():
-            # Handle pick comparison
-            if row[person_pick_col] == 'away':
-                person_team_pick = row['away_team']
-            elif row[person_pick_col] == 'home':
-                person_team_pick = row['home_team']
-            else:
-                person_team_pick = row[person_pick_col]
-            
-            # Handle actual winner
-            if row['actual_winner'] == 'away':
-                actual_team_winner = row['away_team']
-            elif row['actual_winner'] == 'home':
-                actual_team_winner = row['home_team']
-            else:
-                actual_team_winner = row['actual_winner']
-            
-            correct = person_team_pick == actual_team_winner
-            results.append(correct)
-        
-        # Find current streak (from most recent games)
-        if results:
-            last_result = results[-1]
-            current_streak = 1
-            
-            # Count backwards to find streak length
-            for i in range(len(results) - 2, -1, -1):
-                if results[i] == last_result:
-                    current_streak += 1
-                else:
-                    break
-            
-            streak_type = "Win" if last_result else "Loss"
-        
-        # Find max streaks
-        temp_streak = 0
-        temp_type = None
-        
-        for result in results:
-            if temp_type is None:
-                temp_type = result
-                temp_streak = 1
-            elif temp_type == result:
-                temp_streak += 1
-            else:
-                if temp_type:
-                    max_win_streak = max(max_win_streak, temp_streak)
-                else:
-                    max_loss_streak = max(max_loss_streak, temp_streak)
-                temp_type = result
-                temp_streak = 1
-        
-        # Check final streak
-        if temp_type:
-            max_win_streak = max(max_win_streak, temp_streak)
-        else:
-            max_loss_streak = max(max_loss_streak, temp_streak)
+        current_streak, streak_type = history.current()
         
         streak_data.append({
             'Player': person.title(),
             'Current Streak': f"{current_streak} {streak_type}" if streak_type else "No games",
-            'Longest Win Streak': max_win_streak,
-            'Longest Loss Streak': max_loss_streak
+            'Longest Win Streak': history.longest(picks_store.CORRECT),
+            'Longest Loss Streak': history.longest(picks_store.WRONG),
+            'Best Week Streak': history.longest(picks_store.CORRECT, within_week=True)
         })
     
     return streak_data
 
+def create_streak_timeline(store):
+    """Every win/loss streak per player laid out over their decided picks."""
+    histories = streaks.player_streaks(store)
+    fig = go.Figure()
+    for result, color in (('Win', '#28a745'), ('Loss', '#dc3545')):
+        names, bases, lengths, hover = [], [], [], []
+        for person in store.players:
+            history = histories.get(person)
+            if history is None:
+                continue
+            for run in history.history():
+                if run['result'] != result:
+                    continue
+                names.append(person.title())
+                bases.append(run['start'])
+                lengths.append(run['length'])
+                hover.append(f"{run['length']} {result}{'s' if run['length'] != 1 else ''}: Week {run['start_week']} to Week {run['end_week']}")
+        fig.add_trace(go.Bar(
+            y=names, x=lengths, base=bases, orientation='h', name=result,
+            marker=dict(color=color, line=dict(color='white', width=0.5)),
+            hovertext=hover, hoverinfo='text'
+        ))
+    fig.update_layout(
+        barmode='overlay',
+        height=max(300, 45 * len(store.players) + 120),
+        xaxis_title="Decided picks (chronological)",
+        plot_bgcolor='white',
+        paper_bgcolor='white',
+        margin=dict(l=40, r=20, t=30, b=40),
+        legend=dict(orientation='h', y=1.08)
+    )
+    fig.update_yaxes(autorange='reversed')
+    return fig
+
 def create_streaks_display(streak_data):
     """Create display for streak information"""
     if not streak_data:
@@ -4031,7 +3475,8 @@ def create_streaks_display(streak_data):
             {"name": "Player", "id": "Player"},
             {"name": "Current Streak", "id": "Current Streak"},
             {"name": "Best Win Streak", "id": "Longest Win Streak"},
-            {"name": "Worst Loss Streak", "id": "Longest Loss Streak"}
+            {"name": "Worst Loss Streak", "id": "Longest Loss Streak"},
+            {"name": "Best Week Streak", "id": "Best Week Streak"}
         ],
         style_cell={
             'textAlign': 'center',
@@ -4068,62 +3513,29 @@ def create_streaks_display(streak_data):
         style_table={'overflowX': 'auto'}
     )
 
-def calculate_best_worst_weeks(df):
+def calculate_best_worst_weeks(store):
     """Calculate best and worst week performances"""
-    people = ['bobby', 'chet', 'clyde', 'henry', 'nick', 'riley']
-    weeks = sorted(df['week'].unique())
+    weeks, wins, totals = store.weekly_tally()
+    win_pct = np.divide(wins, totals, out=np.zeros(wins.shape), where=totals > 0) * 100
     
     best_worst_data = []
     
-    for person in people:
-        person_pick_col = f'{person}_pick'
-        weekly_records = []
+    for p, person in enumerate(store.players):
+        played = np.flatnonzero(totals[:, p] > 0)
+        if played.size == 0:
+            continue
         
-        for week in weeks:
-            week_df = df[df['week'] == week]
-            person_week_picks = week_df[week_df[person_pick_col].notna()]
-            
-            if len(person_week_picks) > 0:
-                wins = 0
-                for _, row in person_week_picks.iterrows():
-                    # Handle pick comparison
-                    if row[person_pick_col] == 'away':
-                        person_team_pick = row['away_team']
-                    elif row[person_pick_col] == 'home':
-                        person_team_pick = row['home_team']
-                    else:
-                        person_team_pick = row[person_pick_col]
-                    
-                    # Handle actual winner
-                    if row['actual_winner'] == 'away':
-                        actual_team_winner = row['away_team']
-                    elif row['actual_winner'] == 'home':
-                        actual_team_winner = row['home_team']
-                    else:
-                        actual_team_winner = row['actual_winner']
-                    
-                    if person_team_pick == actual_team_winner:
-                        wins += 1
-                
-                total = len(person_week_picks)
-                win_pct = (wins / total * 100) if total > 0 else 0
-                
-                weekly_records.append({
-                    'week': week,
-                    'wins': wins,
-                    'total': total,
-                    'win_pct': win_pct
-                })
+        pct = win_pct[played, p]
+        won = wins[played, p]
+        # Earliest week wins ties, matching max()/min() over the week list
+        best = played[np.lexsort((-played, won, pct))[-1]]
+        worst = played[np.lexsort((played, -won, pct))[0]]
         
-        if weekly_records:
-            best_week = max(weekly_records, key=lambda x: (x['win_pct'], x['wins']))
-            worst_week = min(weekly_records, key=lambda x: (x['win_pct'], -x['wins']))
-            
-            best_worst_data.append({
-                'Player': person.title(),
-                'Best Week': f"Week {best_week['week']} ({best_week['wins']}/{best_week['total']}, {best_week['win_pct']:.0f}%)",
-                'Worst Week': f"Week {worst_week['week']} ({worst_week['wins']}/{worst_week['total']}, {worst_week['win_pct']:.0f}%)"
-            })
+        best_worst_data.append({
+            'Player': person.title(),
+            'Best Week': f"Week {weeks[best]} ({wins[best, p]}/{totals[best, p]}, {win_pct[best, p]:.0f}%)",
+            'Worst Week': f"Week {weeks[worst]} ({wins[worst, p]}/{totals[worst, p]}, {win_pct[worst, p]:.0f}%)"
+        })
     
     return best_worst_data
 
@@ -4163,72 +3575,60 @@ def create_best_worst_weeks_display(best_worst_data):
         style_table={'overflowX': 'auto'}
     )
 
-def calculate_head_to_head_records(df):
+def calculate_head_to_head_records(store, matrix=None):
     """Calculate head-to-head win/loss records between players"""
-    people = ['bobby', 'chet', 'clyde', 'henry', 'nick', 'riley']
-    h2h_summary = []
+    if matrix is None:
+        matrix = head_to_head.HeadToHead(store)
+    wins_against, total_comparisons = matrix.summary()
     
-    for person in people:
-        person_pick_col = f'{person}_pick'
-        person_df = df[df[person_pick_col].notna()]
-        
-        wins_against = 0
-        total_comparisons = 0
-        
-        for _, row in person_df.iterrows():
-            # Handle person's pick
-            if row[person_pick_col] == 'away':
-                person_team_pick = row['away_team']
-            elif row[person_pick_col] == 'home':
-                person_team_pick = row['home_team']
-            else:
-                person_team_pick = row[person_pick_col]
-            
-            # Handle actual winner
-            if row['actual_winner'] == 'away':
-                actual_team_winner = row['away_team']
-            elif row['actual_winner'] == 'home':
-                actual_team_winner = row['home_team']
-            else:
-                actual_team_winner = row['actual_winner']
-            
-            person_correct = person_team_pick == actual_team_winner
-            
-            # Compare against each other player for this game
-            for other_person in people:
-                if other_person != person:
-                    other_pick_col = f'{other_person}_pick'
-                    if pd.notna(row[other_pick_col]):
-                        # Handle other person's pick
-                        if row[other_pick_col] == 'away':
-                            other_team_pick = row['away_team']
-                        elif row[other_pick_col] == 'home':
-                            other_team_pick = row['home_team']
-                        else:
-                            other_team_pick = row[other_pick_col]
-                        
-                        other_correct = other_team_pick == actual_team_winner
-                        
-                        if person_correct and not other_correct:
-                            wins_against += 1
-                        if person_correct != other_correct:  # Only count games where outcomes differed
-                            total_comparisons += 1
-        
-        win_rate = (wins_against / total_comparisons * 100) if total_comparisons > 0 else 0
+    h2h_summary = []
+    for p, person in enumerate(store.players):
+        win_rate = (wins_against[p] / total_comparisons[p] * 100) if total_comparisons[p] > 0 else 0
         
         h2h_summary.append({
             'Player': person.title(),
-            'Head-to-Head Wins': wins_against,
-            'Total Comparisons': total_comparisons,
+            'Head-to-Head Wins': int(wins_against[p]),
+            'Total Comparisons': int(total_comparisons[p]),
             'H2H Win Rate': f"{win_rate:.1f}%"
         })
     
     return sorted(h2h_summary, key=lambda x: float(x['H2H Win Rate'].rstrip('%')), reverse=True)
 
 
+def create_head_to_head_heatmap(matrix):
+    """Row player vs column player: win rate when their picks' outcomes differed, and pick agreement."""
+    names = [p.title() for p in matrix.players]
+    win_rate = matrix.win_rate() * 100
+    agreement = matrix.agreement_rate() * 100
+    np.fill_diagonal(win_rate, np.nan)
+    np.fill_diagonal(agreement, np.nan)
+    losses = matrix.wins.T
+    record_text = [[f"{matrix.wins[i, j]}-{losses[i, j]}" if i != j else "" for j in range(len(names))] for i in range(len(names))]
+    agree_text = [[f"{matrix.agreed[i, j]}/{matrix.shared[i, j]}" if i != j else "" for j in range(len(names))] for i in range(len(names))]
+    annotate = len(names) <= 16
+
+    fig = make_subplots(rows=1, cols=2, subplot_titles=("H2H Win Rate (row vs column)", "Pick Agreement"), horizontal_spacing=0.12)
+    fig.add_trace(go.Heatmap(
+        z=win_rate, x=names, y=names, zmin=0, zmax=100, colorscale='RdYlGn',
+        text=record_text, texttemplate="%{text}" if annotate else None,
+        hovertemplate="%{y} vs %{x}<br>%{text} (%{z:.1f}%)<extra></extra>",
+        colorbar=dict(title="Win %", x=0.44)
+    ), row=1, col=1)
+    fig.add_trace(go.Heatmap(
+        z=agreement, x=names, y=names, zmin=0, zmax=100, colorscale='Blues',
+        text=agree_text, texttemplate="%{text}" if annotate else None,
+        hovertemplate="%{y} & %{x}<br>agreed on %{text} (%{z:.1f}%)<extra></extra>",
+        colorbar=dict(title="Agree %")
+    ), row=1, col=2)
+    fig.update_yaxes(autorange='reversed')
+    fig.update_layout(height=max(420, 28 * len(names) + 160), margin=dict(l=40, r=40, t=60, b=40),
+                      plot_bgcolor='white', paper_bgcolor='white')
+    return fig
+
+
 def calculate_player_insights(df):
     """Create per-player insight rows: volume, accuracy, best/worst team, pick bias."""
-    people = ['bobby', 'chet', 'clyde', 'henry', 'nick', 'riley']
+    people = PLAYERS
     insights = []
     for person in people:
         col = f'{person}_pick'
@@ -4279,7 +3679,7 @@ def calculate_player_insights(df):
 
 def calculate_tiebreaker_accuracy(df):
     """Compute tiebreaker accuracy using stored predictions vs total points scored."""
-    people = ['bobby', 'chet', 'clyde', 'henry', 'nick', 'riley']
+    people = PLAYERS
     rows = []
     for person in people:
         col = f'{person}_tiebreaker'
@@ -4393,7 +3793,7 @@ def create_grid_week_content(week_df, week_num):
     if week_df.empty:
         return html.P(f"No data for Week {week_num}")
     
-    people = ['bobby', 'chet', 'clyde', 'henry', 'nick', 'riley']
+    people = PLAYERS
     display_data = []
     
     for _, row in week_df.iterrows():
@@ -4523,7 +3923,7 @@ def render_teams_tab():
                 all_teams.add(row['home_team'])
         
         all_teams = sorted(list(all_teams))
-        people = ['bobby', 'chet', 'clyde', 'henry', 'nick', 'riley']
+        people = PLAYERS
         
         # Build enhanced team breakdown data with more stats
         team_breakdown = []
@@ -4647,6 +4047,28 @@ if postseason_app and hasattr(postseason_app, "server"):
 # Auto-load picks on startup - runs regardless of how the app starts
 auto_load_picks_on_startup()
 
+# In-process results poller (python season_schedule.py runs the same loop without the web app)
+if Config.ENABLE_RESULTS_POLLER:
+    season_schedule.AdaptivePoller(update_results_from_api, Config.CURRENT_SEASON).start()
+
+# One live-score poller thread per process; the picks.db lease lets a single worker fetch
+live_poller = live_scores.LiveScorePoller(fetch_live_scores_for_week, Config.CURRENT_SEASON)
+if Config.ENABLE_LIVE_POLLER:
+    live_poller.start()
+
+# Quick actions (ESPN update, Excel upload/reload) run here, off the request threads
+job_runner = jobs.JobRunner('picks.db', max_workers=Config.JOB_WORKERS)
+
+# Opt-in: imports the picks workbook when it changes on disk; one worker polls (picks.db lease)
+workbook_watcher_service = workbook_watcher.WorkbookWatcher(import_picks)
+if Config.ENABLE_WORKBOOK_WATCHER:
+    workbook_watcher_service.start()
+
+# Player season stats for the playoff pools, refreshed in the background on a TTL
+stats_refresher = player_stats.StatsRefresher(Config.CURRENT_SEASON)
+if Config.ENABLE_STATS_REFRESHER:
+    stats_refresher.start()
+
 if __name__ == '__main__':
     logger.info(f"Starting NFL Picks Tracker on {Config.HOST}:{Config.PORT}")
     app.run(host=Config.HOST, port=Config.PORT, debug=Config.DEBUG_MODE)
@@ -0,0 +1,158 @@
+"""Bulk import of past seasons' picks workbooks.
+
+Each workbook in a directory is tagged with the season in its file name
+(``nfl_picks_2019.xlsx`` -> 2019); files without a year are skipped. Sheets
+are parsed in a process pool, one task per (workbook, sheet), and each worker
+keeps its read-only workbooks open between tasks. A ten-season archive
+therefore spreads over every core instead of parsing one sheet at a time.
+The parent process is the only SQLite writer. It loads one transaction per
+season through excel_import's incremental writer, so re-running over the same
+archive only rewrites sheets that changed.
+
+Rows go into the normalized schema with their season. ``games`` has a unique
+(season, week, away, home) index, so every lookup is season-partitioned. The
+target defaults to a separate ``picks_archive.db``: the web app shows
+picks.db as a single season, and past seasons mixed into it would show up
+in the current standings.
+
+    python archive_import.py archive/ [--db picks_archive.db] [--workers N] [--serial]
+"""
+import argparse
+import os
+import re
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import openpyxl
+
+import excel_import
+import league_schema
+
+ARCHIVE_DB_PATH = os.getenv('ARCHIVE_DB_PATH', 'picks_archive.db')
+
+# Workbooks opened by this (worker) process, by path
+_workbooks = {}
+
+
+def season_of(path):
+    """Season year in a workbook's file name, or None."""
+    match = re.search(r'(?<!\d)(19|20)\d{2}(?!\d)', os.path.basename(path))
+    return int(match.group(0)) if match else None
+
+
+def archive_workbooks(directory):
+    """{path: season} for the workbooks in ``directory`` whose name carries a year."""
+    found = {}
+    for entry in sorted(os.scandir(directory), key=lambda e: e.name):
+        if not entry.is_file() or not _is_workbook(entry.name):
+            continue
+        season = season_of(entry.path)
+        if season is None:
+            print(f"Skipping {entry.name}: no season year in the file name")
+            continue
+        found[entry.path] = season
+    return found
+
+
+def _is_workbook(name):
+    lowered = name.lower()
+    return lowered.endswith(('.xlsx', '.xlsm')) and not name.startswith('~$') and not lowered.startswith('temp_')
+
+
+def _sheet_tasks(workbooks, people):
+    tasks = []
+    for path, season in workbooks.items():
+        workbook = openpyxl.load_workbook(path, read_only=True)
+        try:
+            tasks.extend((path, season, name, people) for name in workbook.sheetnames if excel_import.week_number(name))
+        finally:
+            workbook.close()
+    return tasks
+
+
+def parse_sheet(task):
+    """(season, week, sheet, games, tiebreakers, content hash) for one sheet; runs in a worker."""
+    path, season, sheet_name, people = task
+    workbook = _workbooks.get(path)
+    if workbook is None:
+        workbook = _workbooks[path] = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    games, tiebreakers = excel_import.parse_week_rows(workbook[sheet_name].iter_rows(values_only=True), people)
+    return (season, excel_import.week_number(sheet_name), sheet_name, games, tiebreakers,
+            excel_import.content_hash(games, tiebreakers))
+
+
+def parse_archive(tasks, workers=None):
+    """Parsed sheets for ``tasks``; in a process pool unless ``workers`` is 1."""
+    if workers == 1:
+        return [parse_sheet(task) for task in tasks]
+    workers = workers or os.cpu_count() or 1
+    # Contiguous chunks keep each worker on the same few workbooks
+    chunksize = max(1, len(tasks) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(parse_sheet, tasks, chunksize=chunksize))
+
+
+def load_seasons(conn, parsed, players):
+    """Write parsed sheets, one transaction per season; returns {season: (games written, weeks skipped)}."""
+    player_ids = league_schema.player_ids(conn)
+    team_ids = {}
+    by_season = {}
+    for row in parsed:
+        by_season.setdefault(row[0], []).append(row)
+
+    summary = {}
+    for season, sheets in sorted(by_season.items()):
+        written = skipped = 0
+        for _, week, sheet_name, games, tiebreakers, digest in sorted(sheets, key=lambda r: r[1]):
+            if excel_import.is_unchanged(conn, season, week, digest):
+                skipped += 1
+                continue
+            count = excel_import.write_week(conn, season, week, games, tiebreakers, player_ids, team_ids)
+            excel_import.record_import(conn, season, week, sheet_name, digest, count)
+            written += count
+        conn.commit()
+        summary[season] = (written, skipped)
+    return summary
+
+
+def import_archive(directory, db_path=ARCHIVE_DB_PATH, players=None, people=excel_import.PLAYER_ORDER, workers=None):
+    """Import every season workbook in ``directory`` into ``db_path``; returns the per-season summary."""
+    players = players or list(people)
+    workbooks = archive_workbooks(directory)
+    if not workbooks:
+        return {}
+    tasks = _sheet_tasks(workbooks, list(people))
+    parsed = parse_archive(tasks, workers)
+
+    conn = sqlite3.connect(db_path, timeout=30)
+    try:
+        league_schema.migrate(conn, players)
+        excel_import.ensure_manifest_table(conn)
+        conn.commit()
+        return load_seasons(conn, parsed, players)
+    finally:
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import a directory of past seasons' picks workbooks")
+    parser.add_argument('directory')
+    parser.add_argument('--db', default=ARCHIVE_DB_PATH)
+    parser.add_argument('--workers', type=int, default=None, help="parser processes (default: one per core)")
+    parser.add_argument('--serial', action='store_true', help="parse in this process, for comparison")
+    parser.add_argument('--players', default=os.getenv('PLAYERS', 'bobby,chet,clyde,henry,nick,riley'),
+                        help="comma-separated player names")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    summary = import_archive(args.directory, args.db, args.players.split(','),
+                             workers=1 if args.serial else args.workers)
+    elapsed = time.perf_counter() - start
+    for season, (games, skipped) in summary.items():
+        print(f"{season}: {games} games written, {skipped} unchanged weeks skipped")
+    print(f"Imported {len(summary)} seasons into {args.db} in {elapsed:.2f}s")
+
+
+if __name__ == '__main__':
+    main()
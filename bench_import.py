@@ -0,0 +1,184 @@
+"""Benchmark the picks-workbook import on a synthetic multi-season workbook.
+
+Compares two importers writing into fresh normalized databases:
+
+  pandas      the original path: pd.ExcelFile, then pd.read_excel per sheet on the
+              same BytesIO (re-parsing the zip), iterrows(), and one INSERT plus
+              a picks executemany per game
+  streaming   excel_import: openpyxl read-only, one pass per sheet, one
+              executemany per table per week
+
+Both must store identical games, picks and tiebreakers. Peak memory is
+measured with tracemalloc. Usage:
+    python bench_import.py [--seasons 5] [--repeat 2]
+"""
+import argparse
+import io
+import os
+import random
+import sqlite3
+import tempfile
+import time
+import tracemalloc
+
+import openpyxl
+import pandas as pd
+
+import excel_import
+import league_schema
+import nfl_teams
+
+PEOPLE = ['bobby', 'chet', 'clyde', 'henry', 'riley', 'nick']
+SEASON = 2025
+
+
+def build_workbook(seasons, seed=11):
+    """Workbook bytes in the weekly-sheet layout: 18 week sheets per season plus Cumulative."""
+    rng = random.Random(seed)
+    teams = [name for name, _, _ in nfl_teams.TEAMS]
+    workbook = openpyxl.Workbook(write_only=True)
+    for week in range(1, 18 * seasons + 1):
+        sheet = workbook.create_sheet(f"Sheet{week}")
+        sheet.append([f"week{week}"] + [p.title() for p in PEOPLE] + [None] * 3 + [p.title() for p in PEOPLE])
+        sheet.append(["\xa0Date"] + [None] * 6 + ["\xa0Away Team", "Time (ET)", "\xa0Home Team"] + [None] * 6)
+        rng.shuffle(teams)
+        for g in range(16):
+            row = [None] * 16
+            row[7], row[8], row[9] = f"\xa0{teams[2 * g]}", "13:00:00", f"\xa0{teams[2 * g + 1]}"
+            for i in range(len(PEOPLE)):
+                if rng.random() < 0.95:
+                    row[1 + i if rng.random() < 0.5 else 10 + i] = 'x'
+            sheet.append(row)
+        sheet.append([None] * 16)
+        sheet.append([None] + [rng.randint(20, 60) for _ in PEOPLE] + [None] * 9)
+    workbook.create_sheet("Cumulative").append(["Week"] + [p.title() for p in PEOPLE])
+    out = io.BytesIO()
+    workbook.save(out)
+    return out.getvalue()
+
+
+def fresh_db(path):
+    conn = sqlite3.connect(path)
+    league_schema.migrate(conn, PEOPLE, SEASON)
+    conn.commit()
+    return conn
+
+
+def pandas_import(conn, data):
+    excel_file = io.BytesIO(data)
+    player_ids = league_schema.player_ids(conn)
+    team_ids = {}
+    for sheet_name in pd.ExcelFile(excel_file).sheet_names:
+        week = excel_import.week_number(sheet_name)
+        if week is None:
+            continue
+        df = pd.read_excel(excel_file, sheet_name=sheet_name, header=None)
+        conn.execute("DELETE FROM games WHERE season = ? AND week = ?", (SEASON, week))
+        entries = []
+        for idx, row in df.iterrows():
+            if idx < 2 or pd.isna(row.iloc[7]) or pd.isna(row.iloc[9]):
+                continue
+            if not any(isinstance(v, str) and v.strip().lower() == 'x' for v in list(row.iloc[1:7]) + list(row.iloc[10:16])):
+                continue
+            away, home = str(row.iloc[7]).strip(), str(row.iloc[9]).strip()
+            picks = {}
+            for i, person in enumerate(PEOPLE):
+                if pd.notna(row.iloc[i + 1]) and str(row.iloc[i + 1]).strip().lower() == 'x':
+                    picks[person] = away
+                elif pd.notna(row.iloc[i + 10]) and str(row.iloc[i + 10]).strip().lower() == 'x':
+                    picks[person] = home
+            game_id = conn.execute(
+                "INSERT INTO games (season, week, away_team_id, home_team_id) VALUES (?, ?, ?, ?)",
+                (SEASON, week, league_schema.team_id(conn, away, team_ids), league_schema.team_id(conn, home, team_ids)),
+            ).lastrowid
+            conn.executemany(
+                "INSERT INTO player_picks (game_id, player_id, pick_team_id) VALUES (?, ?, ?)",
+                [(game_id, player_ids[p], league_schema.team_id(conn, t, team_ids)) for p, t in picks.items()],
+            )
+            entries.append((idx, game_id))
+        if entries:
+            last_idx, last_game_id = entries[-1]
+            for offset in range(1, 4):
+                if last_idx + offset >= len(df):
+                    break
+                nxt = df.iloc[last_idx + offset]
+                tbs = {}
+                for i, person in enumerate(PEOPLE):
+                    for candidate in (nxt.iloc[i + 1], nxt.iloc[i + 10]):
+                        if pd.notna(candidate) and str(candidate).replace('.', '', 1).isdigit():
+                            tbs[person] = int(float(candidate))
+                            break
+                if tbs:
+                    conn.executemany(
+                        """
+                        INSERT INTO player_picks (game_id, player_id, tiebreaker) VALUES (?, ?, ?)
+                        ON CONFLICT (game_id, player_id) DO UPDATE SET tiebreaker = excluded.tiebreaker
+                        """,
+                        [(last_game_id, player_ids[p], v) for p, v in tbs.items()],
+                    )
+                    conn.execute("UPDATE games SET is_tiebreaker_game = 1 WHERE game_id = ?", (last_game_id,))
+                    break
+    conn.commit()
+
+
+def streaming_import(conn, data):
+    player_ids = league_schema.player_ids(conn)
+    team_ids = {}
+    for week in excel_import.iter_weeks(io.BytesIO(data), PEOPLE):
+        excel_import.write_week(conn, SEASON, week['week'], week['games'], week['tiebreakers'], player_ids, team_ids)
+    conn.commit()
+
+
+def dump(conn):
+    return conn.execute("""
+        SELECT g.week, ta.name, th.name, g.is_tiebreaker_game, p.name, tp.name, pp.tiebreaker
+        FROM games g
+        JOIN teams ta ON ta.team_id = g.away_team_id
+        JOIN teams th ON th.team_id = g.home_team_id
+        LEFT JOIN player_picks pp ON pp.game_id = g.game_id
+        LEFT JOIN players p ON p.player_id = pp.player_id
+        LEFT JOIN teams tp ON tp.team_id = pp.pick_team_id
+        ORDER BY g.week, g.game_id, p.name
+    """).fetchall()
+
+
+def measure(fn, data, tmp, repeat):
+    """(best seconds, peak traced bytes, dump of the last run)."""
+    best, peak, rows = float('inf'), 0, None
+    for n in range(repeat):
+        conn = fresh_db(os.path.join(tmp, f"{fn.__name__}{n}.db"))
+        tracemalloc.start()
+        start = time.perf_counter()
+        fn(conn, data)
+        best = min(best, time.perf_counter() - start)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+        rows = dump(conn)
+        conn.close()
+    return best, peak, rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--seasons', type=int, default=5)
+    parser.add_argument('--repeat', type=int, default=2)
+    args = parser.parse_args()
+
+    data = build_workbook(args.seasons)
+    print(f"{args.seasons} seasons, {18 * args.seasons} week sheets, {len(data) / 1e6:.1f} MB workbook")
+    with tempfile.TemporaryDirectory() as tmp:
+        t_pandas, m_pandas, expected = measure(pandas_import, data, tmp, args.repeat)
+        t_stream, m_stream, streamed = measure(streaming_import, data, tmp, args.repeat)
+
+    if streamed != expected:
+        diff = [a for a, b in zip(streamed, expected) if a != b]
+        raise SystemExit(f"streaming disagrees with pandas ({len(streamed)} vs {len(expected)} rows), e.g. {diff[:3]}")
+
+    print(f"{'pandas':<12}{t_pandas * 1000:10.1f} ms  peak {m_pandas / 1e6:7.1f} MB")
+    print(f"{'streaming':<12}{t_stream * 1000:10.1f} ms  peak {m_stream / 1e6:7.1f} MB  "
+          f"({t_pandas / t_stream:.1f}x faster, {m_pandas / max(m_stream, 1):.1f}x less memory)")
+    print(f"{len(expected)} pick rows, both importers agree")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,152 @@
+"""Benchmark standings/weekly-records aggregation on a synthetic multi-season league.
+
+Compares three ways of getting per-player, per-week records:
+
+  pandas      the original path: SELECT * of completed wide rows, then per-player
+              iterrows() with 'away'/'home' normalization in Python
+  wide-sql    the same wide table aggregated inside SQLite (GROUP BY week,
+              SUM(pick = actual_winner) with the legacy markers normalized in CASE)
+  normalized  standings.aggregate_records over games/player_picks after
+              league_schema.migrate
+
+All three must agree. Usage:
+    python bench_standings.py [--seasons 5] [--players 12] [--repeat 3]
+"""
+import argparse
+import os
+import random
+import sqlite3
+import tempfile
+import time
+
+import pandas as pd
+
+import league_schema
+import standings
+
+TEAMS = [f"Team {chr(65 + i // 26)}{chr(65 + i % 26)}" for i in range(32)]
+
+
+def build_wide_db(path, seasons, players, seed=7):
+    """Legacy wide picks table: ~272 games a season, some picks stored as 'away'/'home'."""
+    rng = random.Random(seed)
+    conn = sqlite3.connect(path)
+    pick_cols = ", ".join(f"{p}_pick TEXT, {p}_tiebreaker INTEGER" for p in players)
+    conn.execute(f"""
+        CREATE TABLE picks (
+            game_id INTEGER PRIMARY KEY, week INTEGER, away_team TEXT, home_team TEXT,
+            {pick_cols}, actual_winner TEXT, game_date TEXT,
+            away_score INTEGER, home_score INTEGER, is_tiebreaker_game BOOLEAN DEFAULT 0
+        )
+    """)
+    rows = []
+    for season in range(seasons):
+        for week in range(1, 18):
+            teams = TEAMS[:]
+            rng.shuffle(teams)
+            for g in range(16):
+                away, home = teams[2 * g], teams[2 * g + 1]
+                # Most games final, a few ties, a few still open
+                r = rng.random()
+                winner = None if r < 0.03 else 'TIE' if r < 0.04 else rng.choice([away, home, 'away', 'home'])
+                picks = []
+                for _ in players:
+                    choice = rng.random()
+                    picks.append(None if choice < 0.05 else rng.choice([away, home, 'away', 'home']))
+                    picks.append(rng.randint(20, 60) if g == 15 else None)
+                rows.append((season * 100 + week, away, home, *picks, winner, rng.randint(0, 40), rng.randint(0, 40), int(g == 15)))
+    cols = ", ".join(f"{p}_pick, {p}_tiebreaker" for p in players)
+    marks = ", ".join("?" * (len(rows[0])))
+    conn.executemany(
+        f"INSERT INTO picks (week, away_team, home_team, {cols}, actual_winner, away_score, home_score, is_tiebreaker_game) VALUES ({marks})",
+        rows,
+    )
+    conn.commit()
+    return conn, len(rows)
+
+
+def pandas_records(conn, players):
+    df = pd.read_sql_query("SELECT * FROM picks WHERE actual_winner IS NOT NULL", conn)
+    out = {}
+    for week in sorted(df['week'].unique()):
+        week_df = df[df['week'] == week]
+        for person in players:
+            col = f'{person}_pick'
+            person_picks = week_df[week_df[col].notna()]
+            if not len(person_picks):
+                continue
+            wins = ties = 0
+            for _, row in person_picks.iterrows():
+                pick = row['away_team'] if row[col] == 'away' else row['home_team'] if row[col] == 'home' else row[col]
+                winner = row['away_team'] if row['actual_winner'] == 'away' else row['home_team'] if row['actual_winner'] == 'home' else row['actual_winner']
+                wins += pick == winner
+                ties += winner == 'TIE'
+            out[(int(week), person)] = (wins, len(person_picks) - wins - ties, ties)
+    return out
+
+
+def wide_sql_records(conn, players):
+    winner = "CASE actual_winner WHEN 'away' THEN away_team WHEN 'home' THEN home_team ELSE actual_winner END"
+    parts = []
+    for p in players:
+        pick = f"CASE {p}_pick WHEN 'away' THEN away_team WHEN 'home' THEN home_team ELSE {p}_pick END"
+        parts.append(f"""
+            SELECT week, '{p}',
+                   SUM(({pick}) = ({winner})),
+                   SUM(actual_winner != 'TIE' AND ({pick}) != ({winner})),
+                   SUM(actual_winner = 'TIE')
+            FROM picks WHERE actual_winner IS NOT NULL AND {p}_pick IS NOT NULL
+            GROUP BY week
+        """)
+    rows = conn.execute(" UNION ALL ".join(parts)).fetchall()
+    return {(week, player): (w, l, t) for week, player, w, l, t in rows}
+
+
+def normalized_records(conn):
+    return {(week, player): (w, l, t) for week, player, w, l, t in standings.aggregate_records(conn)}
+
+
+def timed(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--seasons', type=int, default=5)
+    parser.add_argument('--players', type=int, default=12)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    players = [f"player{i}" for i in range(args.players)]
+    with tempfile.TemporaryDirectory() as tmp:
+        conn, n_games = build_wide_db(os.path.join(tmp, 'bench.db'), args.seasons, players)
+        print(f"{args.seasons} seasons, {n_games} games, {len(players)} players")
+
+        t_pandas, expected = timed(lambda: pandas_records(conn, players), args.repeat)
+        t_wide, wide = timed(lambda: wide_sql_records(conn, players), args.repeat)
+
+        start = time.perf_counter()
+        league_schema.migrate(conn, players)
+        conn.commit()
+        t_migrate = time.perf_counter() - start
+        t_norm, normalized = timed(lambda: normalized_records(conn), args.repeat)
+        conn.close()
+
+    for name, result in (('wide-sql', wide), ('normalized', normalized)):
+        if result != expected:
+            diff = sorted(k for k in set(result) | set(expected) if result.get(k) != expected.get(k))
+            raise SystemExit(f"{name} disagrees with pandas on {len(diff)} rows, e.g. {diff[:3]}")
+
+    print(f"{'pandas':<12}{t_pandas * 1000:10.1f} ms")
+    print(f"{'wide-sql':<12}{t_wide * 1000:10.1f} ms  ({t_pandas / t_wide:.0f}x)")
+    print(f"{'normalized':<12}{t_norm * 1000:10.1f} ms  ({t_pandas / t_norm:.0f}x)   one-time migration {t_migrate * 1000:.0f} ms")
+    print(f"{len(expected)} (week, player) records, all paths agree")
+
+
+if __name__ == '__main__':
+    main()
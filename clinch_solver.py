@@ -0,0 +1,141 @@
+"""Exact weekly clinch / elimination solver.
+
+A player wins the week with the most correct picks; players tied on wins are
+separated by the tiebreaker game (closest guess to the total points, missing
+guesses lose, equal errors share the week). For every player the solver
+decides whether they are guaranteed a share of the week (clinched), cannot
+get one under any outcome of the remaining games (eliminated), or neither.
+
+Remaining games are treated as won by one side or the other; NFL ties are
+too rare to enumerate. When the tiebreaker game is still open its total can
+be anything at or above ``tiebreaker_total_floor`` (the live score), and is
+assumed independent of which side wins.
+"""
+import numpy as np
+
+import picks_store
+
+CLINCHED = 'clinched'
+ELIMINATED = 'eliminated'
+ALIVE = 'alive'
+
+
+def _errors(guesses, total):
+    """Absolute tiebreaker errors with missing guesses as +inf."""
+    err = np.abs(guesses - total)
+    return np.where(np.isnan(err), np.inf, err)
+
+
+def _remaining_sides(store, rows):
+    """Remaining games x players pick sides (-1 = no usable pick), dropping games nobody disagrees on."""
+    sides = store.picks[rows][~store.final[rows]].astype(np.int8)
+    sides[sides == picks_store.PICK_OTHER] = picks_store.NO_PICK
+    if sides.shape[1] == 0:
+        return sides
+    relevant = (sides != sides[:, :1]).any(axis=1)
+    return sides[relevant]
+
+
+def _tiebreak_beats(guesses, known_errors, floor):
+    """beats[o, p]: is there a tiebreaker total at which o's guess is strictly closer than p's."""
+    if known_errors is not None:
+        return known_errors[:, None] < known_errors[None, :]
+    g_o = guesses[:, None]
+    g_p = guesses[None, :]
+    o_has = ~np.isnan(g_o)
+    p_has = ~np.isnan(g_p)
+    # Higher guess wins for a large enough total; a lower guess needs a total
+    # below the midpoint, which the live floor may already have passed.
+    return o_has & (~p_has | (g_o > g_p) | ((g_o < g_p) & (2 * floor < g_o + g_p)))
+
+
+def _clinched(sides, wins, beats):
+    """Pairwise check: p is clinched unless some o can finish above p, or level with p and ahead on the tiebreaker."""
+    has = sides >= 0
+    differ = sides[:, :, None] != sides[:, None, :]             # [game, o, p]
+    up = (has[:, :, None] & differ).sum(axis=0)                 # games that can swing toward o
+    down = (has[:, None, :] & differ).sum(axis=0)               # games that can swing toward p
+    half = (differ & (has[:, :, None] ^ has[:, None, :])).sum(axis=0)
+    base = wins[:, None] - wins[None, :]
+    max_diff = base + up
+    min_diff = base - down
+    # With only head-to-head disagreements the margin moves in steps of two
+    can_tie = (min_diff <= 0) & (max_diff >= 0) & ((half > 0) | (min_diff % 2 == 0))
+    threat = (max_diff > 0) | (can_tie & beats)
+    np.fill_diagonal(threat, False)
+    return ~threat.any(axis=0)
+
+
+def _assign_free_games(sides, slack):
+    """Branch and bound: can these games be decided so no class gains more than its slack?"""
+    if (slack >= (sides >= 0).sum(axis=0)).all():
+        return True
+    game, rest = sides[0], sides[1:]
+    for outcome in (picks_store.PICK_AWAY, picks_store.PICK_HOME):
+        left = slack - (game == outcome)
+        if (left >= 0).all() and _assign_free_games(rest, left):
+            return True
+    return False
+
+
+def _can_win(p, sides, wins, errors):
+    """Is there an outcome of the remaining games where p gets a share of the week."""
+    # Letting p's picks win never hurts p against anyone, so fix those games
+    p_has = sides[:, p] >= 0
+    fixed = sides[p_has]
+    p_final = wins[p] + int(p_has.sum())
+    base = wins + (fixed == fixed[:, [p]]).sum(axis=0)
+
+    # Opponents may reach p's total only if p wins the tiebreak against them
+    cap = np.where(errors >= errors[p], p_final, p_final - 1)
+    others = np.arange(len(wins)) != p
+    slack = (cap - base)[others]
+    if (slack < 0).any():
+        return False
+
+    free = sides[~p_has][:, others]
+    if free.size == 0:
+        return True
+
+    # Opponents with identical picks on the free games rise and fall together
+    classes, members = np.unique(free.T, axis=0, return_inverse=True)
+    class_slack = np.full(len(classes), np.iinfo(np.int64).max)
+    np.minimum.at(class_slack, members.ravel(), slack)
+    return _assign_free_games(classes.T, class_slack)
+
+
+def solve_week(store, week, tiebreaker_total_floor=0):
+    """Return {player: CLINCHED | ELIMINATED | ALIVE} for ``week``."""
+    players = store.players
+    if not players:
+        return {}
+
+    rows = store.week_rows(week)
+    wins = (store.correctness[rows] == picks_store.CORRECT).sum(axis=0).astype(np.int64)
+    sides = _remaining_sides(store, rows)
+
+    tb_idx = store.tiebreaker_row(week)
+    guesses = store.tiebreakers[tb_idx] if tb_idx is not None else np.full(len(players), np.nan)
+    floor = tiebreaker_total_floor or 0
+    known_errors = None
+    if tb_idx is None:
+        known_errors = np.zeros(len(players))  # no tiebreaker configured: ties share the week
+    elif store.final[tb_idx]:
+        total = store.away_scores[tb_idx] + store.home_scores[tb_idx]
+        known_errors = np.zeros(len(players)) if np.isnan(total) else _errors(guesses, total)
+
+    clinched = _clinched(sides, wins, _tiebreak_beats(guesses, known_errors, floor))
+
+    statuses = {}
+    for p, person in enumerate(players):
+        if clinched[p]:
+            statuses[person] = CLINCHED
+            continue
+        if known_errors is not None:
+            errors = known_errors
+        else:
+            # p's best total is their own guess, or the floor if that's already passed
+            best_total = floor if np.isnan(guesses[p]) else max(floor, guesses[p])
+            errors = _errors(guesses, best_total)
+        statuses[person] = ALIVE if _can_win(p, sides, wins, errors) else ELIMINATED
+    return statuses
@@ -0,0 +1,277 @@
+"""Shared ESPN HTTP client for the web app and the automator.
+
+One keep-alive ``requests.Session`` with a connection pool and urllib3
+retries is reused by every caller, and ``fetch_scoreboards`` pulls many weeks
+at once on a small bounded thread pool. A full 18-week refresh therefore
+takes about as long as the slowest single week, and never longer than the
+overall deadline: weeks still outstanding at the deadline come back as None.
+
+Every GET goes through the on-disk conditional cache in http_cache
+(ESPN_CACHE_PATH; set ESPN_OFFLINE=true to serve from it only).
+ESPN_BASE_URL sends every ESPN request to a stand-in server instead, such as
+the record/replay server in espn_replay.
+
+Each endpoint (scoreboard, standings, roster, athlete) has its own time
+budget, which caps the timeout a caller asks for. It also has its own
+circuit breaker: after a run of consecutive failures the breaker opens and
+requests fail at once for a cooldown. The cache can then answer with its
+last good copy. After the cooldown a single probe request decides whether
+the breaker closes again. During an ESPN incident a page therefore waits on
+at most one slow request per endpoint, not one per call.
+"""
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+import http_cache
+
+SCOREBOARD_URL = "https://site.api.espn.com/apis/site/v2/sports/football/nfl/scoreboard"
+
+MAX_WORKERS = int(os.getenv('ESPN_MAX_WORKERS', '16'))
+REQUEST_TIMEOUT = int(os.getenv('ESPN_API_TIMEOUT', '10'))
+REFRESH_DEADLINE = float(os.getenv('ESPN_REFRESH_DEADLINE', '30'))
+CACHE_PATH = os.getenv('ESPN_CACHE_PATH', 'espn_cache.db')
+OFFLINE = os.getenv('ESPN_OFFLINE', 'False').lower() == 'true'
+BASE_URL = os.getenv('ESPN_BASE_URL', '').rstrip('/')
+BREAKER_FAILURES = int(os.getenv('ESPN_BREAKER_FAILURES', '5'))
+BREAKER_COOLDOWN = float(os.getenv('ESPN_BREAKER_COOLDOWN', '30'))
+
+# Most seconds a single request to each endpoint may take
+BUDGETS = {
+    'scoreboard': float(os.getenv('ESPN_BUDGET_SCOREBOARD', '5')),
+    'standings': float(os.getenv('ESPN_BUDGET_STANDINGS', '5')),
+    'roster': float(os.getenv('ESPN_BUDGET_ROSTER', '8')),
+    'athlete': float(os.getenv('ESPN_BUDGET_ATHLETE', '8')),
+}
+
+_lock = threading.Lock()
+_session = None
+_executor = None
+_cache = None
+_breakers = {}
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """Raised without a request while an endpoint's breaker is open."""
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker: closed -> open (for ``cooldown``) -> one half-open probe."""
+
+    def __init__(self, name, failures=BREAKER_FAILURES, cooldown=BREAKER_COOLDOWN):
+        self.name = name
+        self.failures = failures
+        self.cooldown = cooldown
+        self.consecutive = 0
+        self.opened_at = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return 'closed'
+        return 'half-open' if time.monotonic() - self.opened_at >= self.cooldown else 'open'
+
+    def allow(self):
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if time.monotonic() - self.opened_at < self.cooldown or self._probing:
+                return False
+            self._probing = True
+            return True
+
+    def record(self, ok):
+        with self._lock:
+            self._probing = False
+            if ok:
+                self.consecutive = 0
+                self.opened_at = None
+                return
+            self.consecutive += 1
+            if self.opened_at is not None or self.consecutive >= self.failures:
+                if self.opened_at is None:
+                    print(f"ESPN {self.name} circuit open after {self.consecutive} failures")
+                self.opened_at = time.monotonic()
+
+
+def endpoint_for(url):
+    """Budget/breaker name of an ESPN URL."""
+    if '/scoreboard' in url:
+        return 'scoreboard'
+    if '/standings' in url:
+        return 'standings'
+    if '/roster' in url:
+        return 'roster'
+    if '/athletes/' in url:
+        return 'athlete'
+    return 'other'
+
+
+def get_breaker(endpoint):
+    with _lock:
+        if endpoint not in _breakers:
+            _breakers[endpoint] = CircuitBreaker(endpoint)
+        return _breakers[endpoint]
+
+
+def breaker_states():
+    """{endpoint: state} for every breaker created so far."""
+    with _lock:
+        breakers = list(_breakers.values())
+    return {b.name: b.state for b in breakers}
+
+
+class _GuardedSession:
+    """The shared session behind an endpoint's breaker; 5xx and 429 count as failures."""
+
+    def __init__(self, breaker):
+        self.breaker = breaker
+
+    def get(self, url, timeout=None, headers=None):
+        if not self.breaker.allow():
+            raise CircuitOpenError(f"ESPN {self.breaker.name} circuit open; skipped {url}")
+        try:
+            response = get_session().get(url, timeout=timeout, headers=headers)
+        except requests.RequestException:
+            self.breaker.record(False)
+            raise
+        self.breaker.record(response.status_code < 500 and response.status_code != 429)
+        return response
+
+
+def get_session():
+    """The shared pooled session, created on first use."""
+    global _session
+    with _lock:
+        if _session is None:
+            retry = Retry(
+                total=3,
+                connect=2,
+                read=2,
+                backoff_factor=0.5,
+                status_forcelist=[429, 500, 502, 503, 504],
+                allowed_methods=frozenset(['GET']),
+                raise_on_status=False,
+            )
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=MAX_WORKERS, max_retries=retry)
+            session = requests.Session()
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _session = session
+        return _session
+
+
+def _get_executor():
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix='espn')
+        return _executor
+
+
+def get_cache():
+    """The shared response cache, or None when ESPN_CACHE_PATH is empty."""
+    global _cache
+    with _lock:
+        if _cache is None and CACHE_PATH:
+            _cache = http_cache.ResponseCache(CACHE_PATH, offline=OFFLINE)
+        return _cache
+
+
+def set_base_url(base_url):
+    """Send ESPN requests to ``base_url`` from now on (None or '' for the real hosts)."""
+    global BASE_URL
+    BASE_URL = (base_url or '').rstrip('/')
+
+
+def resolve(url):
+    """``url`` rewritten to ``BASE_URL/<host>/<path>?<query>`` when an ESPN stand-in is configured."""
+    if not BASE_URL:
+        return url
+    parts = urlsplit(url)
+    if not parts.netloc.endswith('espn.com'):
+        return url
+    return f"{BASE_URL}/{parts.netloc}{parts.path}" + (f"?{parts.query}" if parts.query else "")
+
+
+def get(url, timeout=None, use_cache=True, stale_ok=False):
+    """GET through the cache, the endpoint's breaker and the shared session; returns a Response.
+
+    ``stale_ok`` lets the cache answer with an expired copy while it refreshes
+    in the background (for UI paths that would rather be fast than current).
+    """
+    url = resolve(url)
+    endpoint = endpoint_for(url)
+    timeout = min(timeout or REQUEST_TIMEOUT, BUDGETS.get(endpoint, REQUEST_TIMEOUT))
+    session = _GuardedSession(get_breaker(endpoint))
+    cache = get_cache() if use_cache else None
+    if cache is None:
+        return session.get(url, timeout=timeout)
+    return cache.get(session, url, timeout, stale_ok=stale_ok)
+
+
+def scoreboard_url(week, season=None, seasontype=2):
+    url = f"{SCOREBOARD_URL}?seasontype={seasontype}&week={week}"
+    if season:
+        url += f"&dates={season}"
+    return url
+
+
+def fetch_scoreboard(week, season=None, timeout=None):
+    """Scoreboard JSON for one week. Raises on HTTP and network errors."""
+    response = get(scoreboard_url(week, season), timeout=timeout)
+    response.raise_for_status()
+    return response.json()
+
+
+def fetch_json(url, timeout=None, stale_ok=False):
+    """JSON body of ``url``. Raises on HTTP and network errors."""
+    response = get(url, timeout=timeout, stale_ok=stale_ok)
+    response.raise_for_status()
+    return response.json()
+
+
+def _gather(calls, deadline, label):
+    """Run {key: (fn, args)} on the shared pool; {key: result or None} within ``deadline`` seconds."""
+    executor = _get_executor()
+    futures = {executor.submit(fn, *args): key for key, (fn, args) in calls.items()}
+    start = time.monotonic()
+    done, pending = wait(futures, timeout=deadline)
+
+    results = {key: None for key in calls}
+    for future in done:
+        key = futures[future]
+        try:
+            results[key] = future.result()
+        except Exception as e:
+            print(f"Error fetching ESPN {label} {key}: {e}")
+    for future in pending:
+        future.cancel()
+    if pending:
+        late = sorted(str(futures[f]) for f in pending)
+        print(f"ESPN deadline ({time.monotonic() - start:.1f}s) reached; skipped {label} {late}")
+    return results
+
+
+def fetch_scoreboards(weeks, season=None, timeout=None, deadline=None):
+    """{week: scoreboard JSON or None} for ``weeks``, fetched concurrently.
+
+    A week that fails after retries, or is still in flight when ``deadline``
+    seconds have passed, maps to None so callers can skip it.
+    """
+    deadline = REFRESH_DEADLINE if deadline is None else deadline
+    return _gather({week: (fetch_scoreboard, (week, season, timeout)) for week in weeks}, deadline, 'week')
+
+
+def fetch_json_many(urls, timeout=None, deadline=None, stale_ok=False):
+    """{url: JSON or None} for ``urls``, fetched concurrently like fetch_scoreboards."""
+    deadline = REFRESH_DEADLINE if deadline is None else deadline
+    return _gather({url: (fetch_json, (url, timeout, stale_ok)) for url in dict.fromkeys(urls)}, deadline, 'url')
@@ -0,0 +1,236 @@
+"""Record-and-replay stand-in for the ESPN APIs.
+
+Point the app at a local server with ``ESPN_BASE_URL`` and every ESPN request
+(site scoreboard and standings, core roster/athlete/statistics documents) is
+sent there instead. espn_client rewrites ``https://<host>/<path>`` to
+``<base>/<host>/<path>``. The server answers from a gzip-compressed JSON-lines
+archive keyed by host, path and query.
+
+    # capture real responses while using the app (forwards misses upstream)
+    python espn_replay.py record espn_archive.jsonl.gz
+    ESPN_BASE_URL=http://127.0.0.1:8765 ESPN_CACHE_PATH= python app.py
+
+    # replay with no network, optionally with injected latency and failures
+    python espn_replay.py serve espn_archive.jsonl.gz --latency 0.2 --jitter 0.1 \\
+        --error-rate 0.05 --throttle-rate 0.05
+
+Leave ESPN_CACHE_PATH empty while benchmarking so http_cache does not answer
+ahead of the server. Replay mode answers unknown URLs with 404.
+"""
+import argparse
+import gzip
+import json
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import requests
+
+DEFAULT_PORT = int(os.getenv('ESPN_REPLAY_PORT', '8765'))
+
+
+def archive_key(host, path, query):
+    """Scheme-independent key with the query parameters in a stable order."""
+    query = urlencode(sorted(parse_qsl(query, keep_blank_values=True)))
+    return f"{host.lower()}{path}" + (f"?{query}" if query else "")
+
+
+def key_for_url(url):
+    parts = urlsplit(url)
+    return archive_key(parts.netloc, parts.path, parts.query)
+
+
+class Archive:
+    """In-memory {key: (status, content_type, body)} loaded from and saved to a .jsonl.gz file."""
+
+    def __init__(self, path):
+        self.path = path
+        self.entries = {}
+        self.dirty = False
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            self.load()
+
+    def load(self):
+        with gzip.open(self.path, 'rt', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    self.entries[entry['key']] = (entry['status'], entry.get('content_type'), entry['body'].encode('utf-8'))
+        return len(self.entries)
+
+    def get(self, key):
+        return self.entries.get(key)
+
+    def put(self, key, status, content_type, body):
+        with self._lock:
+            self.entries[key] = (status, content_type, body)
+            self.dirty = True
+
+    def save(self):
+        """Write the archive atomically (temp file + rename); returns the entry count."""
+        with self._lock:
+            entries = sorted(self.entries.items())
+            self.dirty = False
+        tmp = f"{self.path}.tmp"
+        with gzip.open(tmp, 'wt', encoding='utf-8') as f:
+            for key, (status, content_type, body) in entries:
+                f.write(json.dumps({'key': key, 'status': status, 'content_type': content_type,
+                                    'body': body.decode('utf-8', errors='replace')}) + "\n")
+        os.replace(tmp, self.path)
+        return len(entries)
+
+
+class Faults:
+    """Latency and failure injection applied to every replayed response."""
+
+    def __init__(self, latency=0.0, jitter=0.0, error_rate=0.0, throttle_rate=0.0, retry_after=1, seed=None):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def delay(self):
+        with self._lock:
+            extra = self._random.uniform(0, self.jitter) if self.jitter else 0.0
+        return self.latency + extra
+
+    def failure(self):
+        """None, or the (status, headers) of an injected failure."""
+        with self._lock:
+            roll = self._random.random()
+        if roll < self.throttle_rate:
+            return 429, {'Retry-After': str(self.retry_after)}
+        if roll < self.throttle_rate + self.error_rate:
+            return 503, {}
+        return None
+
+
+class ReplayServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, archive, faults=None, record=False, upstream_timeout=15):
+        super().__init__(address, ReplayHandler)
+        self.archive = archive
+        self.faults = faults or Faults()
+        self.record = record
+        self.upstream_timeout = upstream_timeout
+        self.session = requests.Session() if record else None
+        self.counts = {'served': 0, 'recorded': 0, 'missing': 0, 'injected': 0}
+        self._counts_lock = threading.Lock()
+
+    def count(self, name):
+        with self._counts_lock:
+            self.counts[name] += 1
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def fetch_upstream(self, host, path, query):
+        url = f"https://{host}{path}" + (f"?{query}" if query else "")
+        response = self.session.get(url, timeout=self.upstream_timeout)
+        return response.status_code, response.headers.get('Content-Type'), response.content
+
+
+class ReplayHandler(BaseHTTPRequestHandler):
+    """GET /<espn host>/<path>?<query> from the archive (or upstream when recording)."""
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, content_type, body, headers=None):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type or 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        server = self.server
+        parts = urlsplit(self.path)
+        host, _, path = parts.path.lstrip('/').partition('/')
+        path = '/' + path
+        key = archive_key(host, path, parts.query)
+
+        delay = server.faults.delay()
+        if delay:
+            time.sleep(delay)
+        failure = server.faults.failure()
+        if failure is not None:
+            server.count('injected')
+            status, headers = failure
+            return self._send(status, 'application/json', b'{"error": "injected"}', headers)
+
+        entry = server.archive.get(key)
+        if entry is None and server.record and host.endswith('espn.com'):
+            try:
+                entry = server.fetch_upstream(host, path, parts.query)
+            except requests.RequestException as e:
+                return self._send(502, 'application/json', json.dumps({'error': str(e)}).encode('utf-8'))
+            if entry[0] == 200:
+                server.archive.put(key, *entry)
+                server.count('recorded')
+        if entry is None:
+            server.count('missing')
+            return self._send(404, 'application/json', json.dumps({'error': f"not in archive: {key}"}).encode('utf-8'))
+        server.count('served')
+        self._send(*entry)
+
+
+def start_server(archive_path, host='127.0.0.1', port=0, faults=None, record=False):
+    """Serve ``archive_path`` on a daemon thread (port 0 picks a free one); returns the server."""
+    server = ReplayServer((host, port), Archive(archive_path), faults=faults, record=record)
+    threading.Thread(target=server.serve_forever, name='espn-replay', daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record or replay ESPN API responses on a local server")
+    parser.add_argument('mode', choices=['record', 'serve'])
+    parser.add_argument('archive', help="gzip JSON-lines archive (.jsonl.gz)")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--latency', type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument('--jitter', type=float, default=0.0, help="extra random delay, up to this many seconds")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="fraction of requests answered 503")
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help="fraction of requests answered 429")
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+
+    faults = Faults(args.latency, args.jitter, args.error_rate, args.throttle_rate, seed=args.seed)
+    record = args.mode == 'record'
+    server = ReplayServer((args.host, args.port), Archive(args.archive), faults=faults, record=record)
+    print(f"ESPN {args.mode} server on {server.base_url} ({len(server.archive.entries)} archived responses)")
+    print(f"Set ESPN_BASE_URL={server.base_url} to use it")
+
+    if record:
+        # Save every few seconds so a killed recorder loses little
+        def autosave():
+            while True:
+                time.sleep(5)
+                if server.archive.dirty:
+                    server.archive.save()
+        threading.Thread(target=autosave, name='espn-replay-save', daemon=True).start()
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if record and server.archive.dirty:
+            print(f"Saved {server.archive.save()} responses to {args.archive}")
+        print(f"Counts: {server.counts}")
+
+
+if __name__ == '__main__':
+    main()
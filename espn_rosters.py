@@ -0,0 +1,84 @@
+"""Concurrent NFL roster loading from the ESPN core API.
+
+A roster page lists players as ``$ref`` links to athlete documents, so a
+naive loader makes one blocking request per player. ``load_rosters`` works in
+two flat phases on the shared espn_client pool: first every team's roster
+page, then every athlete not already known, deduplicated across teams.
+Athlete documents are kept in memory by id (and on disk via the HTTP cache),
+so later pool builds only fetch players they have not seen.
+"""
+import re
+import threading
+
+import espn_client
+
+ROSTER_URL = "https://sports.core.api.espn.com/v2/sports/football/leagues/nfl/teams/{team_id}/roster?season={season}"
+LOAD_DEADLINE = 120
+
+_athletes = {}
+_athletes_lock = threading.Lock()
+
+
+def _athlete_id(ref):
+    match = re.search(r'/athletes/(\d+)', ref or '')
+    return match.group(1) if match else ref
+
+
+def _player_row(doc, team_id):
+    position = doc.get('position') or {}
+    return {
+        'id': str(doc.get('id')) if doc.get('id') is not None else None,
+        'name': doc.get('fullName') or doc.get('displayName') or doc.get('name'),
+        'position': position.get('abbreviation') or position.get('name') or '',
+        'number': doc.get('jersey'),
+        'teamId': str(team_id),
+    }
+
+
+def athlete_docs(refs, timeout=10, deadline=LOAD_DEADLINE, stale_ok=False):
+    """{athlete id: document} for ``refs``, fetching only ids not cached yet."""
+    wanted = {_athlete_id(ref): ref for ref in refs if ref}
+    with _athletes_lock:
+        missing = {aid: ref for aid, ref in wanted.items() if aid not in _athletes}
+    if missing:
+        fetched = espn_client.fetch_json_many(missing.values(), timeout=timeout, deadline=deadline, stale_ok=stale_ok)
+        with _athletes_lock:
+            for aid, ref in missing.items():
+                if fetched.get(ref) is not None:
+                    _athletes[aid] = fetched[ref]
+    with _athletes_lock:
+        return {aid: _athletes[aid] for aid in wanted if aid in _athletes}
+
+
+def load_rosters(team_ids, season=2025, timeout=10, deadline=LOAD_DEADLINE, stale_ok=False):
+    """{team_id: [player dicts]} for every team in ``team_ids``, loaded concurrently.
+
+    ``stale_ok`` serves expired cached pages at once and refreshes them in the background.
+    """
+    team_ids = list(dict.fromkeys(team_ids))
+    urls = {tid: ROSTER_URL.format(team_id=tid, season=season) for tid in team_ids}
+    pages = espn_client.fetch_json_many(urls.values(), timeout=timeout, deadline=deadline, stale_ok=stale_ok)
+
+    entries = {}
+    refs = []
+    for tid in team_ids:
+        page = pages.get(urls[tid]) or {}
+        items = page.get('entries') or page.get('items') or []
+        entries[tid] = [p for p in items if isinstance(p, dict)]
+        refs.extend(p['player'].get('$ref') for p in entries[tid] if isinstance(p.get('player'), dict))
+
+    docs = athlete_docs(refs, timeout=timeout, deadline=deadline, stale_ok=stale_ok)
+
+    rosters = {}
+    for tid in team_ids:
+        players = []
+        for p in entries[tid]:
+            if 'player' in p:
+                ref = p['player'].get('$ref') if isinstance(p['player'], dict) else None
+                doc = docs.get(_athlete_id(ref)) if ref else None
+                if doc is not None:
+                    players.append(_player_row(doc, tid))
+            else:
+                players.append(_player_row(p, tid))
+        rosters[tid] = players
+    return rosters
@@ -0,0 +1,384 @@
+"""Single-pass importer for the weekly picks workbook.
+
+The workbook has one sheet per week (``Sheet1`` .. ``Sheet18``, plus a
+``Cumulative`` sheet that is ignored). Each game row has the away team in
+column H, the home team in column J, and an ``x`` under each player's name:
+columns B-G for the away team, K-P for the home team. The players' total-points
+tiebreakers sit in the first row after the last game that has numbers in it.
+
+``iter_weeks`` opens the workbook once in openpyxl's read-only streaming mode.
+It visits each sheet's rows once and yields the parsed week. pandas, a second
+parse of the zip and per-row ``iterrows`` are all gone. ``write_week`` stores
+a week with one ``executemany`` per table, inside the caller's transaction.
+
+Imports are incremental. Each week's normalized content is hashed into
+``import_manifest``, and a week whose hash and game count are unchanged is
+skipped. A changed week is upserted on its matchups: games that are still
+in the sheet keep their game_id, results and scores, and only their picks
+are rewritten. A weekly upload therefore touches one sheet and never loses
+results that came from ESPN.
+
+``import_workbook`` is the core entry point. It takes a path (memory-mapped,
+never read whole), bytes, or any binary file object. The Dash upload and
+the disk reload in app.py are thin adapters over it. Running this module
+imports a workbook from the command line without starting the web app:
+
+    python excel_import.py nfl_picks_2025.xlsx [--db picks.db] [--season 2025]
+"""
+import argparse
+import contextlib
+import hashlib
+import io
+import json
+import mmap
+import os
+import sqlite3
+import time
+
+import openpyxl
+
+import league_schema
+import nfl_teams
+import picks_store
+import standings
+
+AWAY_TEAM_COL = 7
+HOME_TEAM_COL = 9
+AWAY_PICK_COL = 1
+HOME_PICK_COL = 10
+HEADER_ROWS = 2
+TIEBREAKER_LOOKAHEAD = 3
+
+# Players in the workbook's pick columns, left to right
+PLAYER_ORDER = ['bobby', 'chet', 'clyde', 'henry', 'riley', 'nick']
+
+MANIFEST_DDL = """
+    CREATE TABLE IF NOT EXISTS import_manifest (
+        season INTEGER NOT NULL,
+        week INTEGER NOT NULL,
+        sheet TEXT,
+        content_hash TEXT NOT NULL,
+        games INTEGER NOT NULL,
+        imported_at REAL NOT NULL,
+        PRIMARY KEY (season, week)
+    )
+"""
+
+
+def ensure_manifest_table(conn):
+    conn.execute(MANIFEST_DDL)
+
+
+def week_number(sheet_name):
+    """Week of a ``SheetN`` sheet, or None for any other sheet."""
+    name = sheet_name.lower()
+    if not name.startswith('sheet'):
+        return None
+    try:
+        return int(name[len('sheet'):])
+    except ValueError:
+        return None
+
+
+def _cell(row, col):
+    return row[col] if col < len(row) else None
+
+
+def _is_x(value):
+    return isinstance(value, str) and value.strip().lower() == 'x'
+
+
+def _team(value):
+    if value is None:
+        return None
+    team = str(value).strip()
+    if not team or team == 'nan':
+        return None
+    # Footnote markers on some team names
+    return team.replace(' ¹', '').replace(' ²', '').replace(' ³', '')
+
+
+def _number(value):
+    if value is None:
+        return None
+    text = str(value)
+    if text.replace('.', '', 1).isdigit():
+        return int(float(text))
+    return None
+
+
+def parse_week_rows(rows, people):
+    """(games, tiebreakers) from one sheet's rows, in a single pass.
+
+    ``games`` is a list of (away, home, {person: picked team}); ``tiebreakers``
+    is {person: total points} from the first numeric row within a few rows
+    after the last game.
+    """
+    games = []
+    tiebreakers = {}
+    rows_since_game = None
+    for idx, row in enumerate(rows):
+        if idx < HEADER_ROWS:
+            continue
+        away, home = _team(_cell(row, AWAY_TEAM_COL)), _team(_cell(row, HOME_TEAM_COL))
+        pick_cells = [_cell(row, c) for c in range(AWAY_PICK_COL, AWAY_PICK_COL + 6)] + \
+                     [_cell(row, c) for c in range(HOME_PICK_COL, HOME_PICK_COL + 6)]
+        # Rows without any 'x' (score rows, blanks) are never games
+        if away and home and any(_is_x(v) for v in pick_cells):
+            picks = {}
+            for i, person in enumerate(people):
+                if _is_x(_cell(row, AWAY_PICK_COL + i)):
+                    picks[person] = away
+                elif _is_x(_cell(row, HOME_PICK_COL + i)):
+                    picks[person] = home
+            games.append((away, home, picks))
+            tiebreakers = {}
+            rows_since_game = 0
+            continue
+
+        if rows_since_game is None or rows_since_game >= TIEBREAKER_LOOKAHEAD or tiebreakers:
+            continue
+        rows_since_game += 1
+        for i, person in enumerate(people):
+            for col in (AWAY_PICK_COL + i, HOME_PICK_COL + i):
+                value = _number(_cell(row, col))
+                if value is not None:
+                    tiebreakers[person] = value
+                    break
+    return games, tiebreakers
+
+
+def iter_weeks(source, people):
+    """Yield {'week', 'sheet', 'games', 'tiebreakers'} per week sheet of ``source`` (path or file object)."""
+    workbook = openpyxl.load_workbook(source, read_only=True, data_only=True)
+    try:
+        for sheet_name in workbook.sheetnames:
+            week = week_number(sheet_name)
+            if week is None:
+                continue
+            games, tiebreakers = parse_week_rows(workbook[sheet_name].iter_rows(values_only=True), people)
+            yield {'week': week, 'sheet': sheet_name, 'games': games, 'tiebreakers': tiebreakers}
+    finally:
+        workbook.close()
+
+
+def content_hash(games, tiebreakers):
+    """Stable digest of a parsed week: team spellings canonicalized, picks and tiebreakers sorted."""
+    def team(name):
+        return nfl_teams.canonical_name(name) or name
+
+    normalized = {
+        'games': [[team(away), team(home), sorted((p, team(t)) for p, t in picks.items())] for away, home, picks in games],
+        'tiebreakers': sorted(tiebreakers.items()),
+    }
+    return hashlib.sha256(json.dumps(normalized, separators=(',', ':')).encode('utf-8')).hexdigest()
+
+
+def is_unchanged(conn, season, week, digest):
+    """True when ``week`` was last imported with this digest and still has that many games."""
+    row = conn.execute(
+        "SELECT content_hash, games FROM import_manifest WHERE season = ? AND week = ?", (season, week)
+    ).fetchone()
+    if row is None or row[0] != digest:
+        return False
+    stored = conn.execute("SELECT COUNT(*) FROM games WHERE season = ? AND week = ?", (season, week)).fetchone()[0]
+    return stored == row[1]
+
+
+def record_import(conn, season, week, sheet, digest, games):
+    conn.execute(
+        "INSERT OR REPLACE INTO import_manifest (season, week, sheet, content_hash, games, imported_at) VALUES (?, ?, ?, ?, ?, ?)",
+        (season, week, sheet, digest, games, time.time()),
+    )
+
+
+def write_week(conn, season, week, games, tiebreakers, player_ids, team_ids=None):
+    """Upsert one week's games and picks on matchup; returns the game count. Does not commit.
+
+    Games still in the sheet keep their row (and so their result and score);
+    games no longer in it are deleted and new ones inserted. Picks of the
+    week are rewritten. The last game carries the tiebreakers and is flagged
+    as the tiebreaker game.
+    """
+    team_ids = {} if team_ids is None else team_ids
+
+    def tid(name):
+        return league_schema.team_id(conn, name, team_ids)
+
+    existing = {
+        (away, home): game_id
+        for game_id, away, home in conn.execute(
+            "SELECT game_id, away_team_id, home_team_id FROM games WHERE season = ? AND week = ?", (season, week)
+        )
+    }
+    keys = list(dict.fromkeys((tid(away), tid(home)) for away, home, _ in games))
+    wanted = set(keys)
+    gone = [(game_id,) for key, game_id in existing.items() if key not in wanted]
+    if gone:
+        conn.executemany("DELETE FROM games WHERE game_id = ?", gone)
+    conn.executemany(
+        "INSERT INTO games (season, week, away_team_id, home_team_id) VALUES (?, ?, ?, ?)",
+        [(season, week, away, home) for away, home in keys if (away, home) not in existing],
+    )
+    if not games:
+        return 0
+
+    game_ids_by_key = {
+        (away, home): game_id
+        for game_id, away, home in conn.execute(
+            "SELECT game_id, away_team_id, home_team_id FROM games WHERE season = ? AND week = ?", (season, week)
+        )
+    }
+    game_ids = [game_ids_by_key[(tid(away), tid(home))] for away, home, _ in games]
+    conn.executemany("DELETE FROM player_picks WHERE game_id = ?", [(gid,) for gid in game_ids_by_key.values()])
+    conn.execute("UPDATE games SET is_tiebreaker_game = 0 WHERE season = ? AND week = ? AND is_tiebreaker_game != 0", (season, week))
+
+    pick_rows = []
+    for game_id, (_, _, picks) in zip(game_ids, games):
+        for person, team in picks.items():
+            if person in player_ids:
+                pick_rows.append((game_id, player_ids[person], tid(team), None))
+    last_game_id = game_ids[-1]
+    tiebreaker_rows = [
+        (last_game_id, player_ids[person], None, value)
+        for person, value in tiebreakers.items()
+        if person in player_ids
+    ]
+    conn.executemany(
+        """
+        INSERT INTO player_picks (game_id, player_id, pick_team_id, tiebreaker) VALUES (?, ?, ?, ?)
+        ON CONFLICT (game_id, player_id) DO UPDATE SET tiebreaker = excluded.tiebreaker
+        """,
+        pick_rows + tiebreaker_rows,
+    )
+    if tiebreaker_rows:
+        conn.execute("UPDATE games SET is_tiebreaker_game = 1 WHERE game_id = ?", (last_game_id,))
+    return len(game_ids_by_key)
+
+
+class _MappedFile(io.RawIOBase):
+    """Read-only, seekable file object over an mmap (zipfile needs ``seekable``, which mmap lacks before 3.13)."""
+
+    def __init__(self, mapped):
+        self._map = mapped
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, buffer):
+        data = self._map.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        return self._map.seek(offset, whence) or self._map.tell()
+
+    def tell(self):
+        return self._map.tell()
+
+
+@contextlib.contextmanager
+def open_source(source):
+    """A seekable binary file object for a path, bytes-like object or file object."""
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                raise ValueError(f"Empty workbook: {source}")
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                yield _MappedFile(mapped)
+    elif isinstance(source, (bytes, bytearray, memoryview)):
+        yield io.BytesIO(source)
+    else:
+        yield source
+
+
+def import_workbook(conn, source, season, players, people=PLAYER_ORDER, progress=None):
+    """Import every changed week of a workbook in one transaction and refresh their standings.
+
+    ``source`` is a path, bytes or binary file object. Returns (games written,
+    weeks written, weeks skipped as unchanged). A sheet that fails to import
+    is logged and leaves its week as it was. ``progress(fraction, message)``
+    is called after each week sheet when given. Commits.
+    """
+    standings.ensure_current(conn, players)
+    ensure_manifest_table(conn)
+    total_games = 0
+    touched_weeks = set()
+    unchanged_weeks = set()
+    player_ids = league_schema.player_ids(conn)
+    team_ids = {}
+
+    with open_source(source) as workbook_file:
+        for week_sheet in iter_weeks(workbook_file, people):
+            week = week_sheet['week']
+            digest = content_hash(week_sheet['games'], week_sheet['tiebreakers'])
+            if is_unchanged(conn, season, week, digest):
+                unchanged_weeks.add(week)
+                continue
+            try:
+                conn.execute("SAVEPOINT import_week")
+                games = write_week(conn, season, week, week_sheet['games'], week_sheet['tiebreakers'], player_ids, team_ids)
+                record_import(conn, season, week, week_sheet['sheet'], digest, games)
+                conn.execute("RELEASE import_week")
+                total_games += games
+                touched_weeks.add(week)
+            except Exception as e:
+                # A bad sheet leaves its week as it was
+                conn.execute("ROLLBACK TO import_week")
+                conn.execute("RELEASE import_week")
+                print(f"Error processing sheet {week_sheet['sheet']}: {e}")
+            if progress:
+                progress(min(week / 18, 0.9), f"Imported {week_sheet['sheet']}")
+
+    if progress:
+        progress(0.95, "Updating standings")
+    standings.refresh_weeks(conn, touched_weeks, players)
+    conn.commit()
+    return total_games, sorted(touched_weeks), sorted(unchanged_weeks)
+
+
+def describe_import(total_games, touched_weeks, unchanged_weeks):
+    """(message, success) for an ``import_workbook`` result."""
+    if total_games == 0 and unchanged_weeks and not touched_weeks:
+        return f"No changes: all {len(unchanged_weeks)} weeks are already up to date", True
+    if total_games == 0:
+        return "No valid games found in the Excel file", False
+
+    message = f"Successfully imported {total_games} games from {len(touched_weeks)} weeks"
+    if unchanged_weeks:
+        message += f" ({len(unchanged_weeks)} unchanged weeks skipped)"
+    return message, True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import a picks workbook into the database without the web app")
+    parser.add_argument('workbook', help="path to the .xlsx workbook")
+    parser.add_argument('--db', default='picks.db')
+    parser.add_argument('--season', type=int, default=int(os.getenv('CURRENT_SEASON', '2025')))
+    parser.add_argument('--players', default=os.getenv('PLAYERS', 'bobby,chet,clyde,henry,nick,riley'),
+                        help="comma-separated player names")
+    args = parser.parse_args()
+
+    players = args.players.split(',')
+    conn = sqlite3.connect(args.db, timeout=30)
+    try:
+        league_schema.migrate(conn, players, args.season)
+        picks_store.ensure_data_version(conn)
+        standings.ensure_standings_tables(conn)
+        conn.commit()
+        start = time.perf_counter()
+        games, written, skipped = import_workbook(
+            conn, args.workbook, args.season, players,
+            progress=lambda fraction, message: print(f"{fraction:4.0%} {message}"),
+        )
+    finally:
+        conn.close()
+    print(f"Imported {games} games from {len(written)} weeks {written} in {time.perf_counter() - start:.2f}s; "
+          f"{len(skipped)} unchanged weeks skipped")
+
+
+if __name__ == '__main__':
+    main()
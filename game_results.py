@@ -0,0 +1,149 @@
+"""Batched application of final game results.
+
+Callers collect every final they saw (from one or many scoreboards) and hand
+them to ``apply_results``. The stored games for those weeks are read in one
+query and diffed in Python. Only rows that actually change are written,
+with a single ``executemany``. The returned ``ChangeSet`` says which games
+became final and which already-final games had their score or result
+corrected, so callers can refresh exactly the affected weeks.
+"""
+import league_schema
+import nfl_teams
+
+
+class ChangeSet:
+    """Games newly final and score corrections from one apply."""
+
+    def __init__(self):
+        self.newly_final = []
+        self.corrections = []
+
+    def __bool__(self):
+        return bool(self.newly_final or self.corrections)
+
+    def __len__(self):
+        return len(self.newly_final) + len(self.corrections)
+
+    @property
+    def weeks(self):
+        return sorted({c['week'] for c in self.newly_final + self.corrections})
+
+    @property
+    def game_ids(self):
+        return sorted({c['game_id'] for c in self.newly_final + self.corrections})
+
+    def summary(self):
+        parts = []
+        if self.newly_final:
+            parts.append(f"{len(self.newly_final)} newly final")
+        if self.corrections:
+            parts.append(f"{len(self.corrections)} corrected")
+        return ", ".join(parts) or "no changes"
+
+
+def final_result(away_id, home_id, away_score, home_score):
+    """(winner_team_id, is_tie) for a final score."""
+    if away_score == home_score:
+        return None, 1
+    return (away_id if away_score > home_score else home_id), 0
+
+
+def diff_results(conn, season, results):
+    """ChangeSet plus the UPDATE rows needed to store ``results``.
+
+    ``results`` is an iterable of (week, away_team_id, home_team_id,
+    away_score, home_score) for final games. A result also matches a game
+    stored with home and away swapped, with the scores swapped to suit.
+    """
+    results = list(results)
+    changes = ChangeSet()
+    if not results:
+        return changes, []
+
+    weeks = sorted({r[0] for r in results})
+    marks = ",".join("?" * len(weeks))
+    stored = {}
+    for game_id, week, away, home, winner, is_tie, away_score, home_score in conn.execute(
+        f"""
+        SELECT game_id, week, away_team_id, home_team_id, winner_team_id, is_tie, away_score, home_score
+        FROM games WHERE season = ? AND week IN ({marks})
+        """,
+        [season] + weeks,
+    ):
+        stored[(week, away, home)] = (game_id, winner, is_tie, away_score, home_score)
+
+    updates = []
+    seen = set()
+    for week, away, home, away_score, home_score in results:
+        if (week, away, home) not in stored and (week, home, away) in stored:
+            away, home, away_score, home_score = home, away, home_score, away_score
+        row = stored.get((week, away, home))
+        if row is None:
+            continue
+        game_id, old_winner, old_tie, old_away_score, old_home_score = row
+        if game_id in seen:
+            continue
+        seen.add(game_id)
+
+        winner, is_tie = final_result(away, home, away_score, home_score)
+        new = (winner, is_tie, away_score, home_score)
+        old = (old_winner, old_tie, old_away_score, old_home_score)
+        if new == old:
+            continue
+
+        change = {'game_id': game_id, 'week': week, 'winner_team_id': winner, 'is_tie': is_tie,
+                  'away_score': away_score, 'home_score': home_score}
+        if old_winner is None and not old_tie:
+            changes.newly_final.append(change)
+        else:
+            change['previous'] = {'winner_team_id': old_winner, 'is_tie': old_tie,
+                                  'away_score': old_away_score, 'home_score': old_home_score}
+            changes.corrections.append(change)
+        updates.append((winner, is_tie, away_score, home_score, game_id))
+    return changes, updates
+
+
+def apply_results(conn, season, results):
+    """Write only the changed results with one executemany; returns the ChangeSet. Does not commit."""
+    changes, updates = diff_results(conn, season, results)
+    if updates:
+        conn.executemany(
+            "UPDATE games SET winner_team_id = ?, is_tie = ?, away_score = ?, home_score = ? WHERE game_id = ?",
+            updates,
+        )
+    return changes
+
+
+def results_from_scoreboard(conn, week, data, team_ids=None):
+    """Final results in one ESPN scoreboard as (week, away_id, home_id, away_score, home_score).
+
+    Teams resolve to canonical ids by abbreviation first (it never changes with
+    sponsorships or relocations), then display name; unknown teams are skipped.
+    """
+    team_ids = {} if team_ids is None else team_ids
+    results = []
+    for event in data.get('events', []):
+        try:
+            competition = event['competitions'][0]
+            if competition.get('status', {}).get('type', {}).get('name') != 'STATUS_FINAL':
+                continue
+            competitors = competition.get('competitors', [])
+            if len(competitors) != 2:
+                continue
+            sides = {}
+            for team in competitors:
+                info = team.get('team', {})
+                tid = None
+                for name in (info.get('abbreviation'), info.get('displayName')):
+                    if nfl_teams.canonical_name(name):
+                        tid = league_schema.team_id(conn, name, team_ids)
+                        break
+                sides[team.get('homeAway')] = (tid, int(team.get('score', 0)))
+            (away_id, away_score), (home_id, home_score) = sides['away'], sides['home']
+            if away_id is None or home_id is None:
+                continue
+            results.append((week, away_id, home_id, away_score, home_score))
+        except (KeyError, IndexError, TypeError, ValueError) as e:
+            print(f"Error processing game: {e}")
+            continue
+    return results
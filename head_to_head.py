@@ -0,0 +1,70 @@
+"""Pairwise head-to-head and pick-agreement matrices from bit-packed vectors.
+
+Each player's correct / wrong / picked-away / picked-home flags over all
+games are packed eight games to a byte, so comparing two players is a
+handful of AND + popcount operations over ``games / 8`` bytes. Pairs are
+processed in row blocks to keep memory flat for large leagues.
+"""
+import numpy as np
+
+import picks_store
+
+BLOCK_ROWS = 64
+
+if hasattr(np, 'bitwise_count'):
+    _popcount = np.bitwise_count
+else:
+    _POPCOUNT_TABLE = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+    def _popcount(values):
+        return _POPCOUNT_TABLE[values]
+
+
+def pack_columns(flags):
+    """Pack a games x players bool matrix into players x ceil(games/8) bytes."""
+    return np.packbits(np.asarray(flags, dtype=bool).T, axis=1)
+
+
+def pair_counts(a, b):
+    """counts[i, j] = popcount(a[i] & b[j]) for packed players x bytes matrices."""
+    counts = np.zeros((a.shape[0], b.shape[0]), dtype=np.int64)
+    for start in range(0, a.shape[0], BLOCK_ROWS):
+        block = a[start:start + BLOCK_ROWS, None, :] & b[None, :, :]
+        counts[start:start + BLOCK_ROWS] = _popcount(block).sum(axis=2, dtype=np.int64)
+    return counts
+
+
+class HeadToHead:
+    """N x N head-to-head results for a PickStore.
+
+    wins[i, j]      games i got right that j got wrong
+    differed[i, j]  games where exactly one of i and j was right
+    shared[i, j]    games both i and j picked
+    agreed[i, j]    of those, games where they picked the same side
+    """
+
+    def __init__(self, store):
+        self.players = list(store.players)
+        correct = pack_columns(store.correctness == picks_store.CORRECT)
+        wrong = pack_columns(store.correctness == picks_store.WRONG)
+        away = pack_columns(store.picks == picks_store.PICK_AWAY)
+        home = pack_columns(store.picks == picks_store.PICK_HOME)
+        picked = pack_columns(store.picks != picks_store.NO_PICK)
+
+        self.wins = pair_counts(correct, wrong)
+        self.differed = self.wins + self.wins.T
+        self.shared = pair_counts(picked, picked)
+        self.agreed = pair_counts(away, away) + pair_counts(home, home)
+
+    def win_rate(self):
+        """Share of decided disagreements each row player won (NaN where there were none)."""
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(self.differed > 0, self.wins / self.differed, np.nan)
+
+    def agreement_rate(self):
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(self.shared > 0, self.agreed / self.shared, np.nan)
+
+    def summary(self):
+        """One row per player: total head-to-head wins and comparisons."""
+        return self.wins.sum(axis=1), self.differed.sum(axis=1)
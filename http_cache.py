@@ -0,0 +1,230 @@
+"""On-disk conditional HTTP cache for ESPN responses.
+
+Responses are stored in a small SQLite file keyed by URL, together with
+their ETag / Last-Modified validators. A fresh entry is served without a
+request; a stale one is revalidated with If-None-Match / If-Modified-Since,
+so an unchanged resource costs a 304 and no body. How long an entry stays
+fresh depends on the endpoint (see ``ttl_for``): a scoreboard whose games are
+all final never goes stale, live scoreboards last seconds, rosters hours.
+
+Stale entries also cover for ESPN. If a request fails, or returns 5xx or
+429, the last good body is served instead (stale-if-error). Callers that
+pass ``stale_ok`` get a stale entry immediately while it is revalidated on a
+background thread (stale-while-revalidate). Every response from the cache
+carries ``stale`` and ``age`` (seconds since it was fetched), so the UI can
+say how old the data is.
+
+In offline mode nothing goes to the network and every cached entry is served
+regardless of age.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+
+import requests
+
+LIVE_TTL = float(os.getenv('ESPN_LIVE_TTL', '15'))
+STANDINGS_TTL = float(os.getenv('ESPN_STANDINGS_TTL', '600'))
+ROSTER_TTL = float(os.getenv('ESPN_ROSTER_TTL', str(6 * 3600)))
+DEFAULT_TTL = float(os.getenv('ESPN_DEFAULT_TTL', '60'))
+
+CACHE_DDL = """
+    CREATE TABLE IF NOT EXISTS http_cache (
+        url TEXT PRIMARY KEY,
+        status INTEGER NOT NULL,
+        content_type TEXT,
+        body BLOB NOT NULL,
+        etag TEXT,
+        last_modified TEXT,
+        fetched_at REAL NOT NULL,
+        expires_at REAL
+    )
+"""
+
+
+def _all_final(body):
+    """True when a scoreboard payload has events and every one of them is completed."""
+    try:
+        events = json.loads(body).get('events') or []
+        return bool(events) and all(
+            e['competitions'][0]['status']['type'].get('completed') for e in events
+        )
+    except Exception:
+        return False
+
+
+def ttl_for(url, body):
+    """Seconds an entry stays fresh, or None to keep it forever."""
+    if '/scoreboard' in url:
+        return None if _all_final(body) else LIVE_TTL
+    if '/standings' in url:
+        return STANDINGS_TTL
+    if '/roster' in url or '/athletes/' in url:
+        return ROSTER_TTL
+    return DEFAULT_TTL
+
+
+def _response(url, status, content_type, body, fetched_at=None, stale=False):
+    response = requests.Response()
+    response.url = url
+    response.status_code = status
+    response._content = body
+    response.encoding = 'utf-8'
+    if content_type:
+        response.headers['Content-Type'] = content_type
+    response.from_cache = True
+    response.stale = stale
+    response.age = 0.0 if fetched_at is None else max(0.0, time.time() - fetched_at)
+    return response
+
+
+class ResponseCache:
+    """URL -> response cache in SQLite with hit/revalidation/miss counters."""
+
+    def __init__(self, path, offline=False):
+        self.path = path
+        self.offline = offline
+        self._lock = threading.Lock()
+        self._ready = False
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self.stale_served = 0
+        self._revalidating = set()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=10)
+        if not self._ready:
+            conn.execute(CACHE_DDL)
+            conn.commit()
+            self._ready = True
+        return conn
+
+    def _count(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def _lookup(self, url):
+        conn = self._connect()
+        try:
+            return conn.execute(
+                "SELECT status, content_type, body, etag, last_modified, expires_at, fetched_at FROM http_cache WHERE url = ?",
+                (url,),
+            ).fetchone()
+        finally:
+            conn.close()
+
+    def _store(self, url, response, now):
+        body = response.content
+        conn = self._connect()
+        try:
+            ttl = ttl_for(url, body)
+            conn.execute(
+                "INSERT OR REPLACE INTO http_cache (url, status, content_type, body, etag, last_modified, fetched_at, expires_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    url, response.status_code, response.headers.get('Content-Type'), body,
+                    response.headers.get('ETag'), response.headers.get('Last-Modified'),
+                    now, None if ttl is None else now + ttl,
+                ),
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _touch(self, url, body, now):
+        conn = self._connect()
+        try:
+            ttl = ttl_for(url, body)
+            conn.execute(
+                "UPDATE http_cache SET fetched_at = ?, expires_at = ? WHERE url = ?",
+                (now, None if ttl is None else now + ttl, url),
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def get(self, session, url, timeout, stale_ok=False):
+        """Response for ``url`` from the cache, a conditional request, or a full fetch.
+
+        With ``stale_ok`` an expired entry is returned at once and revalidated
+        in the background.
+        """
+        now = time.time()
+        cached = self._lookup(url)
+        if cached is not None:
+            status, content_type, body, etag, last_modified, expires_at, fetched_at = cached
+            if self.offline or expires_at is None or expires_at > now:
+                self._count('hits')
+                return _response(url, status, content_type, body, fetched_at)
+            if stale_ok:
+                self._count('stale_served')
+                self._revalidate_async(session, url, timeout)
+                return _response(url, status, content_type, body, fetched_at, stale=True)
+        elif self.offline:
+            raise requests.exceptions.ConnectionError(f"Offline and not cached: {url}")
+        return self._fetch(session, url, timeout, cached, now)
+
+    def _fetch(self, session, url, timeout, cached, now):
+        headers = {}
+        if cached is not None:
+            status, content_type, body, etag, last_modified, expires_at, fetched_at = cached
+            if etag:
+                headers['If-None-Match'] = etag
+            if last_modified:
+                headers['If-Modified-Since'] = last_modified
+
+        try:
+            response = session.get(url, timeout=timeout, headers=headers)
+        except requests.RequestException:
+            if cached is None:
+                raise
+            self._count('stale_served')
+            return _response(url, status, content_type, body, fetched_at, stale=True)
+
+        if response.status_code == 304 and cached is not None:
+            self._touch(url, body, now)
+            self._count('revalidated')
+            return _response(url, status, content_type, body, now)
+        if cached is not None and (response.status_code >= 500 or response.status_code == 429):
+            self._count('stale_served')
+            return _response(url, status, content_type, body, fetched_at, stale=True)
+
+        self._count('misses')
+        if response.status_code == 200:
+            self._store(url, response, now)
+        response.stale = False
+        response.age = 0.0
+        return response
+
+    def _revalidate_async(self, session, url, timeout):
+        """Refresh ``url`` on a daemon thread, at most one at a time per URL."""
+        with self._lock:
+            if url in self._revalidating:
+                return
+            self._revalidating.add(url)
+
+        def run():
+            try:
+                self._fetch(session, url, timeout, self._lookup(url), time.time())
+            except Exception as e:
+                print(f"Background revalidation failed for {url}: {e}")
+            finally:
+                with self._lock:
+                    self._revalidating.discard(url)
+
+        threading.Thread(target=run, name='http-cache-revalidate', daemon=True).start()
+
+    def clear(self):
+        conn = self._connect()
+        try:
+            conn.execute("DELETE FROM http_cache")
+            conn.commit()
+        finally:
+            conn.close()
+
+    def stats(self):
+        return {'hits': self.hits, 'revalidated': self.revalidated, 'misses': self.misses,
+                'stale_served': self.stale_served}
@@ -0,0 +1,172 @@
+"""In-process background jobs with their records in SQLite.
+
+Long operations (ESPN refresh, Excel import) are submitted to a small worker
+thread pool, so the Dash callback that starts one returns at once. Each job
+has a row in ``jobs`` with its status, progress, message, result and error.
+Any gunicorn worker can therefore report on it, whichever worker runs it.
+Submitting a kind that is already queued or running returns the existing
+job instead of starting a second copy.
+
+Jobs such as the Excel import report progress while their own write
+transaction is open. A blocking progress write would then wait on that same
+transaction. Progress is therefore kept in memory, where this process's
+callbacks read it, and written to the row only when the database is free.
+"""
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+# A running job not heard from for this long is assumed dead (its worker exited)
+STALE_AFTER = 600
+
+JOBS_DDL = [
+    """
+    CREATE TABLE IF NOT EXISTS jobs (
+        job_id TEXT PRIMARY KEY,
+        kind TEXT NOT NULL,
+        status TEXT NOT NULL,
+        progress REAL NOT NULL DEFAULT 0,
+        message TEXT,
+        result TEXT,
+        error TEXT,
+        owner TEXT,
+        created_at REAL NOT NULL,
+        updated_at REAL NOT NULL,
+        finished_at REAL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_jobs_kind_status ON jobs (kind, status)",
+]
+
+JOB_COLUMNS = ['job_id', 'kind', 'status', 'progress', 'message', 'result', 'error', 'created_at', 'updated_at', 'finished_at']
+
+
+def ensure_jobs_table(conn):
+    for stmt in JOBS_DDL:
+        conn.execute(stmt)
+
+
+class JobRunner:
+    """Thread-pool job queue; ``fn(report, *args)`` runs in the background and returns a JSON-able result."""
+
+    def __init__(self, db_path='picks.db', max_workers=2):
+        self.db_path = db_path
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='job')
+        self._submit_lock = threading.Lock()
+        self._progress = {}
+
+    def _connect(self, timeout=30):
+        return sqlite3.connect(self.db_path, timeout=timeout)
+
+    def _update(self, job_id, timeout=30, **fields):
+        fields['updated_at'] = time.time()
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        conn = self._connect(timeout)
+        try:
+            conn.execute(f"UPDATE jobs SET {assignments} WHERE job_id = ?", list(fields.values()) + [job_id])
+            conn.commit()
+        finally:
+            conn.close()
+
+    def active(self, kind):
+        """The queued or running job of ``kind``, if one is alive."""
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                f"""
+                SELECT {', '.join(JOB_COLUMNS)} FROM jobs
+                WHERE kind = ? AND status IN (?, ?) AND updated_at >= ?
+                ORDER BY created_at DESC LIMIT 1
+                """,
+                (kind, QUEUED, RUNNING, time.time() - STALE_AFTER),
+            ).fetchone()
+        finally:
+            conn.close()
+        return _job_dict(row)
+
+    def submit(self, kind, fn, *args, dedupe=True):
+        """Queue ``fn`` and return its job id (or, with ``dedupe``, the id of the same kind already in flight)."""
+        with self._submit_lock:
+            existing = self.active(kind) if dedupe else None
+            if existing is not None:
+                return existing['job_id']
+            job_id = uuid.uuid4().hex
+            now = time.time()
+            conn = self._connect()
+            try:
+                conn.execute(
+                    "INSERT INTO jobs (job_id, kind, status, progress, message, owner, created_at, updated_at) VALUES (?, ?, ?, 0, ?, ?, ?, ?)",
+                    (job_id, kind, QUEUED, "Queued", self.owner, now, now),
+                )
+                conn.commit()
+            finally:
+                conn.close()
+        self._executor.submit(self._run, job_id, fn, args)
+        return job_id
+
+    def _run(self, job_id, fn, args):
+        self._update(job_id, status=RUNNING, message="Started")
+
+        def report(progress, message=None):
+            fields = {'progress': max(0.0, min(1.0, float(progress)))}
+            if message is not None:
+                fields['message'] = message
+            self._progress.setdefault(job_id, {}).update(fields)
+            try:
+                self._update(job_id, timeout=0.05, **fields)
+            except sqlite3.OperationalError:
+                pass  # the job holds the write lock; this process's readers see self._progress
+
+        try:
+            result = fn(report, *args)
+            self._update(job_id, status=DONE, progress=1.0, message="Finished",
+                         result=json.dumps(result, default=str), finished_at=time.time())
+        except Exception as e:
+            print(f"Job {job_id} failed: {e}")
+            self._update(job_id, status=FAILED, message="Failed", error=f"{e}\n{traceback.format_exc(limit=5)}",
+                         finished_at=time.time())
+        finally:
+            self._progress.pop(job_id, None)
+
+    def get(self, job_id):
+        """The job record as a dict (result decoded), or None."""
+        if not job_id:
+            return None
+        conn = self._connect()
+        try:
+            row = conn.execute(f"SELECT {', '.join(JOB_COLUMNS)} FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        finally:
+            conn.close()
+        job = _job_dict(row)
+        live = self._progress.get(job_id)
+        if job is not None and live and job['status'] == RUNNING:
+            job.update(live)
+        return job
+
+
+def _job_dict(row):
+    if row is None:
+        return None
+    job = dict(zip(JOB_COLUMNS, row))
+    if job['result'] is not None:
+        job['result'] = json.loads(job['result'])
+    if job['status'] in (QUEUED, RUNNING) and time.time() - job['updated_at'] > STALE_AFTER:
+        job['status'] = FAILED
+        job['error'] = job['error'] or "Job stopped reporting (worker restarted?)"
+    return job
+
+
+def is_finished(job):
+    return job is None or job['status'] in (DONE, FAILED)
@@ -0,0 +1,401 @@
+"""Normalized storage for games, players and picks.
+
+Picks used to live in one wide ``picks`` table with a ``<name>_pick`` and
+``<name>_tiebreaker`` column per player, so the league size was fixed by the
+schema. They now live in::
+
+    teams(team_id, name)
+    team_aliases(alias, team_id)
+    players(player_id, name, display_order)
+    games(game_id, season, week, away_team_id, home_team_id, winner_team_id,
+          is_tie, game_date, away_score, home_score, is_tiebreaker_game)
+    player_picks(game_id, player_id, pick_team_id, tiebreaker)
+
+Team names are resolved to canonical ids once, on write, through
+``team_aliases`` (seeded from nfl_teams), and each (season, week, away, home)
+matchup is unique, so result updates are indexed probes on integer ids.
+
+``picks`` is kept as a view with the old wide columns, regenerated whenever a
+player is added, and INSTEAD OF triggers route writes through it to the
+normalized tables, so existing queries keep working during the transition.
+Code that needs write counts (``cursor.rowcount``) must write to the tables
+directly: SQLite does not count rows changed through a view.
+"""
+import re
+import sqlite3
+
+import nfl_teams
+
+PICKS_VIEW = 'picks'
+LEGACY_TABLE = 'picks_wide_legacy'
+
+BASE_DDL = [
+    """
+    CREATE TABLE IF NOT EXISTS teams (
+        team_id INTEGER PRIMARY KEY,
+        name TEXT NOT NULL UNIQUE
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS team_aliases (
+        alias TEXT PRIMARY KEY,
+        team_id INTEGER NOT NULL REFERENCES teams(team_id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS players (
+        player_id INTEGER PRIMARY KEY,
+        name TEXT NOT NULL UNIQUE,
+        display_order INTEGER NOT NULL DEFAULT 0
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS games (
+        game_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        season INTEGER,
+        week INTEGER NOT NULL,
+        away_team_id INTEGER REFERENCES teams(team_id),
+        home_team_id INTEGER REFERENCES teams(team_id),
+        winner_team_id INTEGER REFERENCES teams(team_id),
+        is_tie INTEGER NOT NULL DEFAULT 0,
+        game_date TEXT,
+        away_score INTEGER,
+        home_score INTEGER,
+        is_tiebreaker_game INTEGER NOT NULL DEFAULT 0
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS player_picks (
+        game_id INTEGER NOT NULL REFERENCES games(game_id),
+        player_id INTEGER NOT NULL REFERENCES players(player_id),
+        pick_team_id INTEGER REFERENCES teams(team_id),
+        tiebreaker INTEGER,
+        PRIMARY KEY (game_id, player_id)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_games_week ON games (week, game_id)",
+    "CREATE INDEX IF NOT EXISTS idx_player_picks_player ON player_picks (player_id, game_id, pick_team_id)",
+    # player_picks has no ON DELETE CASCADE in effect unless PRAGMA foreign_keys is on
+    """
+    CREATE TRIGGER IF NOT EXISTS games_delete_picks AFTER DELETE ON games
+    BEGIN
+        DELETE FROM player_picks WHERE game_id = OLD.game_id;
+    END
+    """,
+]
+
+
+def player_column(name):
+    """Column-safe form of a player name, as used in the ``<name>_pick`` view columns."""
+    return re.sub(r'\W+', '_', str(name).strip().lower()).strip('_')
+
+
+def normalize_players(players):
+    """Column-safe, de-duplicated player names in their configured order."""
+    seen = []
+    for name in players:
+        col = player_column(name)
+        if col and col not in seen:
+            seen.append(col)
+    return seen
+
+
+def _object_type(conn, name):
+    row = conn.execute("SELECT type FROM sqlite_master WHERE name = ?", (name,)).fetchone()
+    return row[0] if row else None
+
+
+def list_players(conn):
+    return [r[0] for r in conn.execute("SELECT name FROM players ORDER BY display_order, player_id")]
+
+
+def player_ids(conn):
+    return dict(conn.execute("SELECT name, player_id FROM players"))
+
+
+def team_id(conn, name, cache=None):
+    """Canonical id for any spelling of a team, registering unknown names. ``cache`` is an optional dict."""
+    key = nfl_teams.alias_key(name)
+    if not key:
+        return None
+    if cache is not None and key in cache:
+        return cache[key]
+    row = conn.execute("SELECT team_id FROM team_aliases WHERE alias = ?", (key,)).fetchone()
+    if row:
+        tid = row[0]
+    else:
+        canonical = nfl_teams.canonical_name(name) or re.sub(r'\s+', ' ', str(name)).strip()
+        conn.execute("INSERT OR IGNORE INTO teams (name) VALUES (?)", (canonical,))
+        tid = conn.execute("SELECT team_id FROM teams WHERE name = ?", (canonical,)).fetchone()[0]
+        conn.execute("INSERT OR IGNORE INTO team_aliases (alias, team_id) VALUES (?, ?)", (key, tid))
+    if cache is not None:
+        cache[key] = tid
+    return tid
+
+
+def seed_teams(conn):
+    """Register the canonical NFL teams and every alias that maps to them."""
+    for name, abbrevs, extra in nfl_teams.TEAMS:
+        conn.execute("INSERT OR IGNORE INTO teams (name) VALUES (?)", (name,))
+        tid = conn.execute("SELECT team_id FROM teams WHERE name = ?", (name,)).fetchone()[0]
+        conn.executemany(
+            "INSERT OR REPLACE INTO team_aliases (alias, team_id) VALUES (?, ?)",
+            [(nfl_teams.alias_key(alias), tid) for alias in [name] + abbrevs + extra],
+        )
+
+
+def canonicalize_teams(conn):
+    """Fold teams stored under a non-canonical spelling into the canonical team. Returns teams merged."""
+    merged = 0
+    for tid, name in conn.execute("SELECT team_id, name FROM teams").fetchall():
+        canonical = nfl_teams.canonical_name(name)
+        if not canonical or canonical == name:
+            conn.execute("INSERT OR IGNORE INTO team_aliases (alias, team_id) VALUES (?, ?)", (nfl_teams.alias_key(name), tid))
+            continue
+        target = conn.execute("SELECT team_id FROM teams WHERE name = ?", (canonical,)).fetchone()[0]
+        for col in ('away_team_id', 'home_team_id', 'winner_team_id'):
+            conn.execute(f"UPDATE games SET {col} = ? WHERE {col} = ?", (target, tid))
+        conn.execute("UPDATE player_picks SET pick_team_id = ? WHERE pick_team_id = ?", (target, tid))
+        conn.execute("UPDATE team_aliases SET team_id = ? WHERE team_id = ?", (target, tid))
+        conn.execute("DELETE FROM teams WHERE team_id = ?", (tid,))
+        merged += 1
+    return merged
+
+
+def _ensure_matchup_index(conn):
+    try:
+        conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_games_matchup ON games (season, week, away_team_id, home_team_id)")
+    except sqlite3.IntegrityError:
+        dupes = conn.execute("""
+            SELECT season, week, away_team_id, home_team_id, COUNT(*) FROM games
+            GROUP BY season, week, away_team_id, home_team_id HAVING COUNT(*) > 1
+        """).fetchall()
+        print(f"Duplicate games prevent the unique matchup index: {dupes[:5]}")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_games_matchup_nonunique ON games (season, week, away_team_id, home_team_id)")
+
+
+def _view_sql(players):
+    pick_cols = [
+        f"(SELECT t.name FROM player_picks pp JOIN teams t ON t.team_id = pp.pick_team_id "
+        f"WHERE pp.game_id = g.game_id AND pp.player_id = {pid}) AS {name}_pick"
+        for name, pid in players
+    ]
+    tb_cols = [
+        f"(SELECT pp.tiebreaker FROM player_picks pp "
+        f"WHERE pp.game_id = g.game_id AND pp.player_id = {pid}) AS {name}_tiebreaker"
+        for name, pid in players
+    ]
+    columns = (
+        ["g.game_id AS game_id", "g.week AS week", "ta.name AS away_team", "th.name AS home_team"]
+        + pick_cols
+        + ["CASE WHEN g.is_tie THEN 'TIE' ELSE tw.name END AS actual_winner",
+           "g.game_date AS game_date", "g.away_score AS away_score", "g.home_score AS home_score"]
+        + tb_cols
+        + ["g.is_tiebreaker_game AS is_tiebreaker_game", "g.season AS season"]
+    )
+    return (
+        f"CREATE VIEW {PICKS_VIEW} AS SELECT\n    " + ",\n    ".join(columns) + "\n"
+        "FROM games g\n"
+        "LEFT JOIN teams ta ON ta.team_id = g.away_team_id\n"
+        "LEFT JOIN teams th ON th.team_id = g.home_team_id\n"
+        "LEFT JOIN teams tw ON tw.team_id = g.winner_team_id"
+    )
+
+
+def _team_lookup(expr):
+    return f"(SELECT team_id FROM team_aliases WHERE alias = LOWER(TRIM({expr})))"
+
+
+def _sentinel(expr):
+    return f"LOWER(TRIM({expr}))"
+
+
+def _winner_lookup():
+    # Legacy rows may store 'away'/'home' (any case) instead of the team name
+    winner = _sentinel("NEW.actual_winner")
+    return (
+        f"CASE WHEN NEW.actual_winner IS NULL OR {winner} = 'tie' THEN NULL "
+        f"WHEN {winner} = 'away' THEN " + _team_lookup("NEW.away_team") + " "
+        f"WHEN {winner} = 'home' THEN " + _team_lookup("NEW.home_team") + " "
+        "ELSE " + _team_lookup("NEW.actual_winner") + " END"
+    )
+
+
+def _pick_lookup(col):
+    pick = _sentinel(f"NEW.{col}")
+    return (
+        f"CASE WHEN {pick} = 'away' THEN " + _team_lookup("NEW.away_team") + " "
+        f"WHEN {pick} = 'home' THEN " + _team_lookup("NEW.home_team") + " "
+        "ELSE " + _team_lookup(f"NEW.{col}") + " END"
+    )
+
+
+def _ensure_teams_sql(columns):
+    # Names with no alias yet become teams of their own (canonical spellings are pre-seeded);
+    # the away/home/tie sentinels never do
+    stmts = []
+    for c in columns:
+        sentinel = f"{_sentinel(f'NEW.{c}')} IN ('away', 'home', 'tie')"
+        known = f"NEW.{c} IS NULL OR {sentinel} OR EXISTS (SELECT 1 FROM team_aliases WHERE alias = LOWER(TRIM(NEW.{c})))"
+        stmts.append(f"    INSERT OR IGNORE INTO teams (name) SELECT TRIM(NEW.{c}) WHERE NOT ({known});")
+        stmts.append(
+            f"    INSERT OR IGNORE INTO team_aliases (alias, team_id) SELECT LOWER(TRIM(NEW.{c})), team_id FROM teams "
+            f"WHERE name = TRIM(NEW.{c}) AND NOT {sentinel};"
+        )
+    return "\n".join(stmts)
+
+
+def _trigger_sql(players):
+    names = [name for name, _ in players]
+    team_cols = ['away_team', 'home_team', 'actual_winner'] + [f"{n}_pick" for n in names]
+
+    def upsert_picks(game_expr, changed_only):
+        stmts = []
+        for name, pid in players:
+            cond = f"NEW.{name}_pick IS NOT NULL OR NEW.{name}_tiebreaker IS NOT NULL"
+            if changed_only:
+                cond = f"NEW.{name}_pick IS NOT OLD.{name}_pick OR NEW.{name}_tiebreaker IS NOT OLD.{name}_tiebreaker"
+            stmts.append(
+                f"    INSERT INTO player_picks (game_id, player_id, pick_team_id, tiebreaker)\n"
+                f"    SELECT {game_expr}, {pid}, {_pick_lookup(name + '_pick')}, NEW.{name}_tiebreaker WHERE {cond}\n"
+                f"    ON CONFLICT (game_id, player_id) DO UPDATE SET pick_team_id = excluded.pick_team_id, tiebreaker = excluded.tiebreaker;"
+            )
+        return "\n".join(stmts)
+
+    insert = (
+        f"CREATE TRIGGER {PICKS_VIEW}_view_insert INSTEAD OF INSERT ON {PICKS_VIEW}\nBEGIN\n"
+        + _ensure_teams_sql(team_cols) + "\n"
+        "    INSERT INTO games (game_id, season, week, away_team_id, home_team_id, winner_team_id, is_tie, game_date, away_score, home_score, is_tiebreaker_game)\n"
+        "    VALUES (NEW.game_id, COALESCE(NEW.season, (SELECT MAX(season) FROM games)), NEW.week, " + _team_lookup("NEW.away_team") + ", " + _team_lookup("NEW.home_team") + ", "
+        + _winner_lookup() + ", COALESCE(LOWER(TRIM(NEW.actual_winner)) = 'tie', 0), NEW.game_date, NEW.away_score, NEW.home_score, COALESCE(NEW.is_tiebreaker_game, 0));\n"
+        # last_insert_rowid() moves on with each pick row, so find the new game by id
+        + upsert_picks("COALESCE(NEW.game_id, (SELECT MAX(game_id) FROM games))", False) + "\n"
+        "END"
+    )
+    update = (
+        f"CREATE TRIGGER {PICKS_VIEW}_view_update INSTEAD OF UPDATE ON {PICKS_VIEW}\nBEGIN\n"
+        + _ensure_teams_sql(team_cols) + "\n"
+        "    UPDATE games SET\n"
+        "        game_id = NEW.game_id, season = NEW.season, week = NEW.week,\n"
+        "        away_team_id = " + _team_lookup("NEW.away_team") + ",\n"
+        "        home_team_id = " + _team_lookup("NEW.home_team") + ",\n"
+        "        winner_team_id = " + _winner_lookup() + ",\n"
+        "        is_tie = COALESCE(LOWER(TRIM(NEW.actual_winner)) = 'tie', 0),\n"
+        "        game_date = NEW.game_date, away_score = NEW.away_score, home_score = NEW.home_score,\n"
+        "        is_tiebreaker_game = COALESCE(NEW.is_tiebreaker_game, 0)\n"
+        "    WHERE game_id = OLD.game_id;\n"
+        + upsert_picks("NEW.game_id", True) + "\n"
+        "END"
+    )
+    delete = (
+        f"CREATE TRIGGER {PICKS_VIEW}_view_delete INSTEAD OF DELETE ON {PICKS_VIEW}\nBEGIN\n"
+        "    DELETE FROM games WHERE game_id = OLD.game_id;\n"
+        "END"
+    )
+    return [insert, update, delete]
+
+
+def rebuild_view(conn):
+    """(Re)create the wide ``picks`` view and its write triggers for the current players."""
+    players = [(player_column(name), pid) for name, pid in
+               conn.execute("SELECT name, player_id FROM players ORDER BY display_order, player_id")]
+    conn.execute(f"DROP VIEW IF EXISTS {PICKS_VIEW}")
+    conn.execute(_view_sql(players))
+    for stmt in _trigger_sql(players):
+        conn.execute(stmt)
+
+
+def sync_players(conn, players):
+    """Register any configured players that are missing; rebuilds the view when one was added."""
+    players = normalize_players(players)
+    existing = set(list_players(conn))
+    added = False
+    for order, name in enumerate(players):
+        if name in existing:
+            conn.execute("UPDATE players SET display_order = ? WHERE name = ?", (order, name))
+        else:
+            conn.execute("INSERT INTO players (name, display_order) VALUES (?, ?)", (name, order))
+            added = True
+    if added or _object_type(conn, PICKS_VIEW) != 'view':
+        rebuild_view(conn)
+    return added
+
+
+def _migrate_wide_table(conn, season):
+    """Copy rows from the old wide picks table into the normalized tables."""
+    columns = [r[1] for r in conn.execute(f"PRAGMA table_info({PICKS_VIEW})")]
+    wide_players = [c[:-len('_pick')] for c in columns if c.endswith('_pick')]
+    for name in wide_players:
+        conn.execute(
+            "INSERT OR IGNORE INTO players (name, display_order) VALUES (?, (SELECT COUNT(*) FROM players))",
+            (name,),
+        )
+    pids = player_ids(conn)
+    teams = {}
+
+    game_rows = []
+    pick_rows = []
+    for row in conn.execute(f"SELECT * FROM {PICKS_VIEW}"):
+        rec = dict(zip(columns, row))
+        away = team_id(conn, rec.get('away_team'), teams)
+        home = team_id(conn, rec.get('home_team'), teams)
+
+        def side(value):
+            sentinel = value.strip().lower() if isinstance(value, str) else value
+            if sentinel == 'away':
+                return away
+            if sentinel == 'home':
+                return home
+            return team_id(conn, value, teams)
+
+        winner = rec.get('actual_winner')
+        is_tie = isinstance(winner, str) and winner.strip().lower() == 'tie'
+        game_rows.append((
+            rec['game_id'], season, rec['week'], away, home,
+            None if winner is None or is_tie else side(winner),
+            1 if is_tie else 0,
+            rec.get('game_date'), rec.get('away_score'), rec.get('home_score'),
+            1 if rec.get('is_tiebreaker_game') else 0,
+        ))
+        for name in wide_players:
+            pick = rec.get(f'{name}_pick')
+            tiebreaker = rec.get(f'{name}_tiebreaker')
+            if pick is not None or tiebreaker is not None:
+                pick_rows.append((rec['game_id'], pids[name], side(pick), tiebreaker))
+
+    conn.executemany(
+        "INSERT INTO games (game_id, season, week, away_team_id, home_team_id, winner_team_id, is_tie, game_date, away_score, home_score, is_tiebreaker_game) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        game_rows,
+    )
+    conn.executemany(
+        "INSERT INTO player_picks (game_id, player_id, pick_team_id, tiebreaker) VALUES (?, ?, ?, ?)",
+        pick_rows,
+    )
+    for suffix in ('insert', 'update', 'delete'):
+        conn.execute(f"DROP TRIGGER IF EXISTS picks_revision_{suffix}")
+    conn.execute(f"ALTER TABLE {PICKS_VIEW} RENAME TO {LEGACY_TABLE}")
+    return len(game_rows)
+
+
+def migrate(conn, players, season=None):
+    """Create the normalized schema, move a legacy wide table into it, and register players.
+
+    Safe to run on every start. Games without a season are assigned ``season``.
+    The old table is kept as ``picks_wide_legacy``. Does not commit.
+    """
+    for stmt in BASE_DDL:
+        conn.execute(stmt)
+    if 'season' not in {r[1] for r in conn.execute("PRAGMA table_info(games)")}:
+        conn.execute("ALTER TABLE games ADD COLUMN season INTEGER")
+    seed_teams(conn)
+    migrated = 0
+    if _object_type(conn, PICKS_VIEW) == 'table':
+        migrated = _migrate_wide_table(conn, season)
+    canonicalize_teams(conn)
+    if season is not None:
+        conn.execute("UPDATE games SET season = ? WHERE season IS NULL", (season,))
+    _ensure_matchup_index(conn)
+    sync_players(conn, players)
+    rebuild_view(conn)
+    return migrated
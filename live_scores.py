@@ -0,0 +1,245 @@
+"""Shared live-score snapshots for the Live tab.
+
+Every process runs one ``LiveScorePoller`` thread, but only the holder of
+the ``poller_lease`` row in picks.db actually fetches. The lease is renewed
+on every tick and taken over by another worker once it expires. The leader
+rebuilds the snapshot of each week someone has viewed recently, on that
+week's cadence from season_schedule, and stores it in ``live_snapshots``.
+Dash callbacks only read those rows. ESPN traffic therefore stays the same
+however many browsers have the Live tab open.
+"""
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+
+import season_schedule
+
+TICK_SECONDS = float(os.getenv('LIVE_POLL_TICK', '5'))
+WATCH_WINDOW = float(os.getenv('LIVE_WATCH_WINDOW', '900'))
+DEFAULT_INTERVAL = 60.0
+LEASE_NAME = 'live_scores'
+
+LIVE_DDL = [
+    """
+    CREATE TABLE IF NOT EXISTS live_snapshots (
+        season INTEGER NOT NULL,
+        week INTEGER NOT NULL,
+        payload TEXT NOT NULL,
+        fetched_at REAL NOT NULL,
+        PRIMARY KEY (season, week)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS live_watch (
+        season INTEGER NOT NULL,
+        week INTEGER NOT NULL,
+        requested_at REAL NOT NULL,
+        PRIMARY KEY (season, week)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS poller_lease (
+        name TEXT PRIMARY KEY,
+        owner TEXT NOT NULL,
+        expires_at REAL NOT NULL
+    )
+    """,
+]
+
+
+def ensure_live_tables(conn):
+    for stmt in LIVE_DDL:
+        conn.execute(stmt)
+
+
+def acquire_lease(conn, name, owner, ttl):
+    """Take or renew the named lease; True when ``owner`` holds it. Commits."""
+    now = time.time()
+    conn.execute(
+        """
+        INSERT INTO poller_lease (name, owner, expires_at) VALUES (?, ?, ?)
+        ON CONFLICT (name) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at
+        WHERE poller_lease.owner = excluded.owner OR poller_lease.expires_at < ?
+        """,
+        (name, owner, now + ttl, now),
+    )
+    conn.commit()
+    row = conn.execute("SELECT owner FROM poller_lease WHERE name = ?", (name,)).fetchone()
+    return row is not None and row[0] == owner
+
+
+def release_lease(conn, name, owner):
+    conn.execute("DELETE FROM poller_lease WHERE name = ? AND owner = ?", (name, owner))
+    conn.commit()
+
+
+def read_snapshot(conn, season, week):
+    """(payload dict, fetched_at) for a week, or (None, None)."""
+    row = conn.execute(
+        "SELECT payload, fetched_at FROM live_snapshots WHERE season = ? AND week = ?", (season, week)
+    ).fetchone()
+    if row is None:
+        return None, None
+    return json.loads(row[0]), row[1]
+
+
+def write_snapshot(conn, season, week, payload, fetched_at=None):
+    conn.execute(
+        "INSERT OR REPLACE INTO live_snapshots (season, week, payload, fetched_at) VALUES (?, ?, ?, ?)",
+        (season, week, json.dumps(payload, default=str), fetched_at or time.time()),
+    )
+    conn.commit()
+
+
+class LiveScorePoller:
+    """Per-process poller; the lease holder refreshes snapshots with ``build(week)``."""
+
+    def __init__(self, build, season, db_path='picks.db', tick=TICK_SECONDS):
+        self.build = build
+        self.season = season
+        self.db_path = db_path
+        self.tick = tick
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{id(self)}"
+        self.refreshes = 0
+        self._build_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def interval(self, week):
+        """Refresh cadence of ``week`` in seconds (None once it is all final)."""
+        conn = self._connect()
+        try:
+            return self._interval(conn, week)
+        finally:
+            conn.close()
+
+    def _interval(self, conn, week):
+        """Seconds between refreshes of a week, or None once every game in it is final."""
+        if not season_schedule.has_schedule(conn, self.season):
+            return DEFAULT_INTERVAL
+        return season_schedule.next_poll_delay(conn, self.season, week)
+
+    def due_weeks(self, conn, now=None):
+        """Recently viewed weeks whose snapshot is missing or older than the week's cadence."""
+        now = now or time.time()
+        watched = conn.execute(
+            """
+            SELECT w.week, s.fetched_at FROM live_watch w
+            LEFT JOIN live_snapshots s ON s.season = w.season AND s.week = w.week
+            WHERE w.season = ? AND w.requested_at >= ?
+            """,
+            (self.season, now - WATCH_WINDOW),
+        ).fetchall()
+        due = []
+        for week, fetched_at in watched:
+            if fetched_at is None:
+                due.append(week)
+                continue
+            interval = self._interval(conn, week)
+            if interval is not None and now - fetched_at >= interval:
+                due.append(week)
+        return sorted(due)
+
+    def refresh(self, week):
+        """Rebuild and store one week's snapshot; returns the payload (None if the build failed)."""
+        with self._build_lock:
+            return self._refresh(week)
+
+    def _refresh(self, week):
+        payload = self.build(week)
+        if payload is None:
+            return None
+        fetched_at = payload.pop('fetched_at', None)
+        conn = self._connect()
+        try:
+            write_snapshot(conn, self.season, week, payload, fetched_at)
+        finally:
+            conn.close()
+        self.refreshes += 1
+        return payload
+
+    def _read(self, week):
+        conn = self._connect()
+        try:
+            return read_snapshot(conn, self.season, week)
+        finally:
+            conn.close()
+
+    def run_once(self):
+        """One tick: renew the lease and, as leader, refresh due weeks. Returns True when leading."""
+        conn = self._connect()
+        try:
+            if not acquire_lease(conn, LEASE_NAME, self.owner, ttl=max(30.0, self.tick * 6)):
+                return False
+            weeks = self.due_weeks(conn)
+        finally:
+            conn.close()
+        for week in weeks:
+            self.refresh(week)
+        return True
+
+    def run_forever(self):
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception as e:
+                print(f"Live score poller error: {e}")
+            self._stop.wait(self.tick)
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self.run_forever, name='live-score-poller', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        try:
+            conn = self._connect()
+            release_lease(conn, LEASE_NAME, self.owner)
+            conn.close()
+        except Exception:
+            pass
+
+    def snapshot(self, week):
+        """Latest payload for ``week`` for a callback, marking the week as watched.
+
+        The payload carries ``fetched_at`` so the page can show its age. Only a
+        week nobody has fetched yet is built here (once per process);
+        everything after that comes from the leader.
+        """
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute(
+                "INSERT OR IGNORE INTO live_watch (season, week, requested_at) VALUES (?, ?, ?)",
+                (self.season, week, now),
+            )
+            # Coarse timestamp so steady viewing doesn't write on every callback
+            conn.execute(
+                "UPDATE live_watch SET requested_at = ? WHERE season = ? AND week = ? AND requested_at < ?",
+                (now, self.season, week, now - 60),
+            )
+            conn.commit()
+            payload, fetched_at = read_snapshot(conn, self.season, week)
+        finally:
+            conn.close()
+        if payload is not None:
+            return dict(payload, fetched_at=fetched_at)
+
+        with self._build_lock:
+            payload, fetched_at = self._read(week)
+            if payload is not None:
+                return dict(payload, fetched_at=fetched_at)
+            payload = self._refresh(week)
+            if payload is None:
+                return None
+            _, fetched_at = self._read(week)
+            return dict(payload, fetched_at=fetched_at)
@@ -2,8 +2,8 @@ import pandas as pd
 import requests
 import datetime
 import sqlite3
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
+
+import espn_client
 
 # Connect to SQLite DB (creates if not exists)
 conn = sqlite3.connect('picks.db', check_same_thread=False)
@@ -44,56 +44,37 @@ week1_fallback = {
     "Minnesota Vikings @ Chicago Bears": {'winner': 'Away', 'total_points': 51}  # 27 + 24
 }
 
-def create_session_with_retries():
-    """Create a requests session with retry strategy and timeout"""
-    session = requests.Session()
-    retry_strategy = Retry(
-        total=3,
-        backoff_factor=1,
-        status_forcelist=[429, 500, 502, 503, 504],
-    )
-    adapter = HTTPAdapter(max_retries=retry_strategy)
-    session.mount("http://", adapter)
-    session.mount("https://", adapter)
-    return session
+def results_from_scoreboard(data):
+    """{'Away @ Home': {'winner', 'total_points'}} from one week's scoreboard JSON"""
+    games = {}
+    
+    for event in data.get('events', []):
+        try:
+            competition = event['competitions'][0]
+            away_team = competition['competitors'][1]['team']['displayName'].strip().rstrip('¹').strip()
+            home_team = competition['competitors'][0]['team']['displayName'].strip().rstrip('¹').strip()
+            game_key = f"{away_team} @ {home_team}"
+            status = competition['status']['type']['completed']
+            
+            if status:
+                away_score = int(competition['competitors'][1]['score'])
+                home_score = int(competition['competitors'][0]['score'])
+                total_points = away_score + home_score
+                winner = 'Away' if away_score > home_score else 'Home' if home_score > away_score else 'Tie'
+                games[game_key] = {'winner': winner, 'total_points': total_points}
+                print(f"Game: {game_key}, Scores: {away_score}-{home_score}, Total: {total_points}, Winner: {winner}")
+            else:
+                games[game_key] = {'winner': None, 'total_points': None}
+        except (KeyError, ValueError) as e:
+            print(f"Error processing game data: {e}")
+            continue
+            
+    return games
 
 def fetch_nfl_results(week, season=2025):
-    url = f"https://site.api.espn.com/apis/site/v2/sports/football/nfl/scoreboard?seasontype=2&week={week}"
     try:
-        session = create_session_with_retries()
-        response = session.get(url, timeout=10)  # 10 second timeout
-        
-        if response.status_code != 200:
-            print(f"Error fetching Week {week} data from API. Status: {response.status_code}")
-            if week == 1:
-                return week1_fallback
-            return {}
-            
-        data = response.json()
-        games = {}
-        
-        for event in data.get('events', []):
-            try:
-                competition = event['competitions'][0]
-                away_team = competition['competitors'][1]['team']['displayName'].strip().rstrip('¹').strip()
-                home_team = competition['competitors'][0]['team']['displayName'].strip().rstrip('¹').strip()
-                game_key = f"{away_team} @ {home_team}"
-                status = competition['status']['type']['completed']
-                
-                if status:
-                    away_score = int(competition['competitors'][1]['score'])
-                    home_score = int(competition['competitors'][0]['score'])
-                    total_points = away_score + home_score
-                    winner = 'Away' if away_score > home_score else 'Home' if home_score > away_score else 'Tie'
-                    games[game_key] = {'winner': winner, 'total_points': total_points}
-                    print(f"Game: {game_key}, Scores: {away_score}-{home_score}, Total: {total_points}, Winner: {winner}")
-                else:
-                    games[game_key] = {'winner': None, 'total_points': None}
-            except (KeyError, ValueError) as e:
-                print(f"Error processing game data: {e}")
-                continue
-                
-        return games
+        data = espn_client.fetch_scoreboard(week, season, timeout=10)  # 10 second timeout
+        return results_from_scoreboard(data)
         
     except requests.exceptions.Timeout:
         print(f"Timeout fetching Week {week} data. Using fallback if available.")
@@ -184,14 +165,31 @@ def import_from_excel(file_path='nfl_picks_2025.xlsx'):
         print(f"Error importing from Excel: {e}")
         raise
 
+def pick_side(row, picked):
+    """'Away'/'Home' for a pick stored as either the side or the team name (the app's picks view)."""
+    if picked == row['away_team']:
+        return 'Away'
+    if picked == row['home_team']:
+        return 'Home'
+    return picked
+
 def update_picks(week_num=None, timeout_per_week=5):
     try:
         weeks = range(1, 19) if not week_num else [week_num]
-        all_weekly_results = {}
+        # person -> week -> [wins, losses, ties]
+        all_weekly_results = {person: {} for person in people}
+        result_updates = []
+        
+        # Every week's scoreboard at once over the shared session
+        scoreboards = espn_client.fetch_scoreboards(weeks, 2025, timeout=timeout_per_week)
         
         for w in weeks:
             print(f"Updating Week {w}...")
-            results = fetch_nfl_results(w)
+            if scoreboards.get(w) is not None:
+                results = results_from_scoreboard(scoreboards[w])
+            else:
+                print(f"Could not fetch Week {w} data. Using fallback if available.")
+                results = week1_fallback if w == 1 else {}
             
             if not results:
                 print(f"No results available for Week {w}")
@@ -212,22 +210,13 @@ def update_picks(week_num=None, timeout_per_week=5):
                     actual_total = game_result['total_points']
                     print(f"Found result: {actual_winner}, Total: {actual_total}")
                     
-                    cursor.execute(f"UPDATE picks SET actual_winner = ?, actual_total_points = ? WHERE week = ? AND game_id = ?", 
-                                 (actual_winner, actual_total, w, row['game_id']))
-                    conn.commit()
+                    result_updates.append((actual_winner, actual_total, w, row['game_id']))
                     
                     for person in people:
-                        picked = row[f'{person.lower()}_pick']
+                        picked = pick_side(row, row[f'{person.lower()}_pick'])
                         if picked:
-                            result = 'Win' if picked == actual_winner else 'Loss' if actual_winner != 'Tie' else 'Tie'
-                            if person not in all_weekly_results:
-                                all_weekly_results[person] = {'wins': [], 'losses': [], 'ties': []}
-                            if result == 'Win':
-                                all_weekly_results[person]['wins'].append((w, 1))
-                            elif result == 'Loss':
-                                all_weekly_results[person]['losses'].append((w, 1))
-                            elif result == 'Tie':
-                                all_weekly_results[person]['ties'].append((w, 1))
+                            slot = 0 if picked == actual_winner else 1 if actual_winner != 'Tie' else 2
+                            all_weekly_results[person].setdefault(w, [0, 0, 0])[slot] += 1
                 else:
                     print(f"No result found for: {game_key}")
                     if results:
@@ -236,20 +225,38 @@ def update_picks(week_num=None, timeout_per_week=5):
                             print(f"  - {api_game}")
                         break  # Only show this once per week
         
-        # Update cumulative stats
-        cumulative_df = pd.DataFrame(columns=['week'] + [p.lower() for p in people])
+        # Build the cumulative stats from the weekly tallies
+        running = {person: [0, 0, 0] for person in people}
+        cumulative_rows = []
         for week in range(1, 19):
             row = {'week': week}
             for person in people:
-                wins_up_to_week = sum(v for w, v in all_weekly_results.get(person, {'wins':[]})['wins'] if w <= week)
-                losses_up_to_week = sum(v for w, v in all_weekly_results.get(person, {'losses':[]})['losses'] if w <= week)
-                ties_up_to_week = sum(v for w, v in all_weekly_results.get(person, {'ties':[]})['ties'] if w <= week)
+                totals = running[person]
+                for slot, count in enumerate(all_weekly_results[person].get(week, (0, 0, 0))):
+                    totals[slot] += count
+                wins_up_to_week, losses_up_to_week, ties_up_to_week = totals
                 total = wins_up_to_week + losses_up_to_week + ties_up_to_week
                 win_pct = (wins_up_to_week / total * 100) if total > 0 else 0
                 row[person.lower()] = f"{wins_up_to_week}-{losses_up_to_week}-{ties_up_to_week} ({win_pct:.2f}%)"
-            cumulative_df = pd.concat([cumulative_df, pd.DataFrame([row])], ignore_index=True)
+            cumulative_rows.append(row)
+        columns = ['week'] + [p.lower() for p in people]
+        cumulative_df = pd.DataFrame(cumulative_rows, columns=columns)
         
-        cumulative_df.to_sql('cumulative', conn, if_exists='replace', index=False)
+        # The app's picks view stores the winner (its triggers map Away/Home/Tie to
+        # teams) but has no actual_total_points; this script's own table has both
+        if 'actual_total_points' in {r[1] for r in conn.execute("PRAGMA table_info(picks)")}:
+            result_sql = "UPDATE picks SET actual_winner = ?, actual_total_points = ? WHERE week = ? AND game_id = ?"
+        else:
+            result_sql = "UPDATE picks SET actual_winner = ? WHERE week = ? AND game_id = ?"
+            result_updates = [(winner, week, game_id) for winner, _, week, game_id in result_updates]
+        with conn:
+            conn.executemany(result_sql, result_updates)
+        with conn:
+            conn.execute("DELETE FROM cumulative")
+            conn.executemany(
+                f"INSERT INTO cumulative ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+                cumulative_df.itertuples(index=False, name=None),
+            )
         print("Successfully updated picks and cumulative stats")
         
     except Exception as e:
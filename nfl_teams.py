@@ -0,0 +1,62 @@
+"""Canonical NFL teams and the names they show up under.
+
+Spreadsheets, ESPN and older seasons spell teams differently ("Chiefs",
+"KC", "Kansas City Chiefs", "Oakland Raiders"). Every spelling maps to one
+canonical name here; league_schema seeds these into ``teams`` /
+``team_aliases`` so games and picks carry a single integer id per team.
+"""
+import re
+
+# canonical name, ESPN abbreviation(s), extra aliases
+TEAMS = [
+    ('Arizona Cardinals', ['ARI', 'ARZ'], ['Cardinals', 'Arizona', 'St. Louis Cardinals', 'Phoenix Cardinals']),
+    ('Atlanta Falcons', ['ATL'], ['Falcons', 'Atlanta']),
+    ('Baltimore Ravens', ['BAL'], ['Ravens', 'Baltimore']),
+    ('Buffalo Bills', ['BUF'], ['Bills', 'Buffalo']),
+    ('Carolina Panthers', ['CAR'], ['Panthers', 'Carolina']),
+    ('Chicago Bears', ['CHI'], ['Bears', 'Chicago']),
+    ('Cincinnati Bengals', ['CIN'], ['Bengals', 'Cincinnati']),
+    ('Cleveland Browns', ['CLE'], ['Browns', 'Cleveland']),
+    ('Dallas Cowboys', ['DAL'], ['Cowboys', 'Dallas']),
+    ('Denver Broncos', ['DEN'], ['Broncos', 'Denver']),
+    ('Detroit Lions', ['DET'], ['Lions', 'Detroit']),
+    ('Green Bay Packers', ['GB', 'GNB'], ['Packers', 'Green Bay']),
+    ('Houston Texans', ['HOU'], ['Texans', 'Houston']),
+    ('Indianapolis Colts', ['IND'], ['Colts', 'Indianapolis']),
+    ('Jacksonville Jaguars', ['JAX', 'JAC'], ['Jaguars', 'Jacksonville']),
+    ('Kansas City Chiefs', ['KC', 'KAN'], ['Chiefs', 'Kansas City']),
+    ('Las Vegas Raiders', ['LV', 'LVR', 'OAK'], ['Raiders', 'Las Vegas', 'Oakland Raiders']),
+    ('Los Angeles Chargers', ['LAC'], ['Chargers', 'LA Chargers', 'San Diego Chargers']),
+    ('Los Angeles Rams', ['LAR', 'LA'], ['Rams', 'LA Rams', 'St. Louis Rams']),
+    ('Miami Dolphins', ['MIA'], ['Dolphins', 'Miami']),
+    ('Minnesota Vikings', ['MIN'], ['Vikings', 'Minnesota']),
+    ('New England Patriots', ['NE', 'NWE'], ['Patriots', 'New England']),
+    ('New Orleans Saints', ['NO', 'NOR'], ['Saints', 'New Orleans']),
+    ('New York Giants', ['NYG'], ['Giants', 'NY Giants']),
+    ('New York Jets', ['NYJ'], ['Jets', 'NY Jets']),
+    ('Philadelphia Eagles', ['PHI'], ['Eagles', 'Philadelphia']),
+    ('Pittsburgh Steelers', ['PIT'], ['Steelers', 'Pittsburgh']),
+    ('San Francisco 49ers', ['SF', 'SFO'], ['49ers', 'Niners', 'San Francisco']),
+    ('Seattle Seahawks', ['SEA'], ['Seahawks', 'Seattle']),
+    ('Tampa Bay Buccaneers', ['TB', 'TAM'], ['Buccaneers', 'Bucs', 'Tampa Bay']),
+    ('Tennessee Titans', ['TEN'], ['Titans', 'Tennessee']),
+    ('Washington Commanders', ['WSH', 'WAS'], ['Commanders', 'Washington', 'Washington Football Team', 'Washington Redskins']),
+]
+
+
+def alias_key(name):
+    """Case, spacing and footnote-mark insensitive key for an alias."""
+    if name is None:
+        return ''
+    return re.sub(r'\s+', ' ', re.sub(r'[¹²³*]', '', str(name))).strip().lower()
+
+
+ALIASES = {}
+for _name, _abbrevs, _extra in TEAMS:
+    for _alias in [_name] + _abbrevs + _extra:
+        ALIASES[alias_key(_alias)] = _name
+
+
+def canonical_name(name):
+    """Canonical team name for any known spelling, else None."""
+    return ALIASES.get(alias_key(name))
@@ -0,0 +1,218 @@
+"""Columnar in-memory view of the picks table.
+
+Every analytics tab in app.py used to re-read ``SELECT * FROM picks`` and walk
+rows with ``iterrows()``. ``PickStore`` does that work once per database
+revision: team names are interned to integer ids and each player's picks and
+results are held as games x players NumPy matrices, so standings, weekly
+records, streaks and head-to-head numbers are plain array reductions.
+"""
+import threading
+
+import numpy as np
+import pandas as pd
+
+# Pick matrix codes
+NO_PICK = -1
+PICK_AWAY = 0
+PICK_HOME = 1
+PICK_OTHER = 2  # a team name that matches neither side of the game
+
+# Correctness matrix codes
+UNDECIDED = -1  # no pick, or the game has no result yet
+WRONG = 0
+CORRECT = 1
+
+# Tables whose writes bump the revision (the picks view writes through to these)
+VERSIONED_TABLES = ('games', 'player_picks', 'players')
+
+DATA_VERSION_DDL = [
+    """
+    CREATE TABLE IF NOT EXISTS data_version (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        revision INTEGER NOT NULL DEFAULT 0
+    )
+    """,
+    "INSERT OR IGNORE INTO data_version (id, revision) VALUES (1, 0)",
+] + [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {table}_revision_{event.lower()} AFTER {event} ON {table}
+    BEGIN
+        UPDATE data_version SET revision = revision + 1 WHERE id = 1;
+    END
+    """
+    for table in VERSIONED_TABLES
+    for event in ('INSERT', 'UPDATE', 'DELETE')
+]
+
+
+def ensure_data_version(conn):
+    """Create the revision counter and the triggers that bump it on any picks write.
+
+    Needs the normalized tables from league_schema.migrate to exist.
+    """
+    for stmt in DATA_VERSION_DDL:
+        conn.execute(stmt)
+
+
+def read_data_version(conn):
+    """Return the current picks revision, or None if the counter is missing."""
+    try:
+        row = conn.execute("SELECT revision FROM data_version WHERE id = 1").fetchone()
+        return row[0] if row else None
+    except Exception:
+        return None
+
+
+def _resolve_side(values, away, home):
+    """Map legacy 'away'/'home' markers to the team name for that row."""
+    return values.mask(values == 'away', away).mask(values == 'home', home)
+
+
+def run_lengths(values):
+    """Run-length encode a 1-D array. Returns (run values, run starts, run lengths)."""
+    values = np.asarray(values)
+    if values.size == 0:
+        empty = np.array([], dtype=np.int64)
+        return values[:0], empty, empty
+    starts = np.concatenate(([0], np.flatnonzero(values[1:] != values[:-1]) + 1))
+    lengths = np.diff(np.concatenate((starts, [values.size])))
+    return values[starts], starts, lengths
+
+
+class PickStore:
+    """Games x players matrices built from one read of the picks table.
+
+    Rows are ordered by (week, game_id). ``frame`` keeps the raw rows for the
+    few displays that still need the original strings.
+    """
+
+    def __init__(self, frame, players):
+        self.players = [p.strip().lower() for p in players]
+        frame = frame.sort_values(['week', 'game_id'], kind='stable').reset_index(drop=True)
+        self.frame = frame
+        n_games = len(frame)
+        n_players = len(self.players)
+
+        self.game_ids = frame['game_id'].to_numpy(dtype=np.int64)
+        self.weeks = frame['week'].to_numpy(dtype=np.int64)
+
+        away = frame['away_team']
+        home = frame['home_team']
+        winner = _resolve_side(frame['actual_winner'], away, home)
+        pick_cols = [_resolve_side(frame[f'{p}_pick'], away, home) for p in self.players]
+
+        # Intern every team string once; NaN becomes -1
+        codes, uniques = pd.factorize(pd.concat([away, home, winner] + pick_cols, ignore_index=True))
+        codes = codes.astype(np.int16)
+        self.teams = [str(t) for t in uniques]
+        self.away_ids = codes[:n_games]
+        self.home_ids = codes[n_games:2 * n_games]
+        self.winner_ids = codes[2 * n_games:3 * n_games]
+        pick_ids = codes[3 * n_games:].reshape(n_players, n_games).T if n_players else np.empty((n_games, 0), dtype=np.int16)
+        self.pick_team_ids = pick_ids
+
+        has_pick = frame[[f'{p}_pick' for p in self.players]].notna().to_numpy() if n_players else np.zeros((n_games, 0), dtype=bool)
+        self.final = frame['actual_winner'].notna().to_numpy()
+
+        picks = np.full((n_games, n_players), NO_PICK, dtype=np.int8)
+        picks[has_pick] = PICK_OTHER
+        picks[has_pick & (pick_ids == self.away_ids[:, None])] = PICK_AWAY
+        picks[has_pick & (pick_ids == self.home_ids[:, None])] = PICK_HOME
+        self.picks = picks
+
+        decided = has_pick & self.final[:, None]
+        correct = decided & (pick_ids >= 0) & (pick_ids == self.winner_ids[:, None])
+        correctness = np.full((n_games, n_players), UNDECIDED, dtype=np.int8)
+        correctness[decided] = WRONG
+        correctness[correct] = CORRECT
+        self.correctness = correctness
+
+        self.away_scores = pd.to_numeric(frame['away_score'], errors='coerce').to_numpy(dtype=float)
+        self.home_scores = pd.to_numeric(frame['home_score'], errors='coerce').to_numpy(dtype=float)
+        tb_flag = frame['is_tiebreaker_game'] if 'is_tiebreaker_game' in frame else pd.Series(0, index=frame.index)
+        self.is_tiebreaker = (pd.to_numeric(tb_flag, errors='coerce').fillna(0) == 1).to_numpy()
+        tb_cols = []
+        for p in self.players:
+            col = f'{p}_tiebreaker'
+            if col in frame:
+                tb_cols.append(pd.to_numeric(frame[col], errors='coerce').to_numpy(dtype=float))
+            else:
+                tb_cols.append(np.full(n_games, np.nan))
+        self.tiebreakers = np.column_stack(tb_cols) if tb_cols else np.empty((n_games, 0))
+
+        self.week_values = np.unique(self.weeks)
+
+    def __len__(self):
+        return len(self.game_ids)
+
+    def has_results(self):
+        return bool(self.final.any())
+
+    def team_name(self, team_id):
+        return self.teams[team_id] if team_id >= 0 else None
+
+    def latest_week(self):
+        return int(self.week_values[-1]) if self.week_values.size else None
+
+    def week_rows(self, week):
+        """Row slice for one week (rows are sorted by week)."""
+        lo, hi = np.searchsorted(self.weeks, [week, week + 1])
+        return slice(int(lo), int(hi))
+
+    def completed_frame(self):
+        return self.frame[self.final]
+
+    def weekly_tally(self):
+        """Per-week wins and decided picks for every player.
+
+        Returns (weeks, wins, totals) where wins/totals are weeks x players and
+        only weeks with at least one completed game are included.
+        """
+        n_players = len(self.players)
+        if not len(self):
+            empty = np.zeros((0, n_players), dtype=np.int64)
+            return self.week_values, empty, empty
+        week_idx = np.searchsorted(self.week_values, self.weeks)
+        n_weeks = self.week_values.size
+        wins = np.zeros((n_weeks, n_players), dtype=np.int64)
+        totals = np.zeros((n_weeks, n_players), dtype=np.int64)
+        np.add.at(wins, week_idx, (self.correctness == CORRECT).astype(np.int64))
+        np.add.at(totals, week_idx, (self.correctness != UNDECIDED).astype(np.int64))
+        completed_weeks = np.bincount(week_idx, weights=self.final, minlength=n_weeks) > 0
+        return self.week_values[completed_weeks], wins[completed_weeks], totals[completed_weeks]
+
+    def season_tally(self):
+        """Season wins and decided picks per player."""
+        wins = (self.correctness == CORRECT).sum(axis=0)
+        totals = (self.correctness != UNDECIDED).sum(axis=0)
+        return wins, totals
+
+    def tiebreaker_row(self, week, completed_only=False):
+        """Index of the last flagged tiebreaker game in ``week``, or None."""
+        rows = self.week_rows(week)
+        mask = self.is_tiebreaker[rows]
+        if completed_only:
+            mask = mask & self.final[rows]
+        hits = np.flatnonzero(mask)
+        return rows.start + int(hits[-1]) if hits.size else None
+
+
+_store_lock = threading.Lock()
+_store_cache = {'key': None, 'store': None}
+
+
+def load_pick_store(conn, players):
+    """Return the PickStore for the database's current revision, building it if needed."""
+    version = read_data_version(conn)
+    key = (version, tuple(players))
+    with _store_lock:
+        if version is not None and _store_cache['key'] == key:
+            return _store_cache['store']
+
+    frame = pd.read_sql_query("SELECT * FROM picks ORDER BY week, game_id", conn)
+    store = PickStore(frame, players)
+
+    with _store_lock:
+        _store_cache['key'] = key
+        _store_cache['store'] = store
+    return store
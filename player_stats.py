@@ -0,0 +1,232 @@
+"""Player season-stats warehouse for the playoff pools.
+
+``player_season_stats`` keeps one row of flattened season totals per
+(player_id, season) with the time it was fetched. ``prefetch`` fills missing
+or stale rows in bulk: athlete documents come through espn_rosters' cache,
+then every statistics document is fetched concurrently and upserted with one
+executemany. ``StatsRefresher`` does this in the background, so the Dash
+callback only ever runs ``read_stats``, a single query.
+"""
+import os
+import sqlite3
+import threading
+import time
+
+import espn_client
+import espn_rosters
+import live_scores
+
+STATS_TTL = float(os.getenv('PLAYER_STATS_TTL', str(12 * 3600)))
+ATHLETE_URL = "https://sports.core.api.espn.com/v2/sports/football/leagues/nfl/athletes/{player_id}"
+
+STAT_COLUMNS = ['GP', 'PassYds', 'PassTD', 'RushYds', 'RushTD', 'RecYds', 'RecTD']
+
+STATS_DDL = """
+    CREATE TABLE IF NOT EXISTS player_season_stats (
+        player_id TEXT NOT NULL,
+        season INTEGER NOT NULL,
+        gp INTEGER,
+        pass_yds INTEGER,
+        pass_td INTEGER,
+        rush_yds INTEGER,
+        rush_td INTEGER,
+        rec_yds INTEGER,
+        rec_td INTEGER,
+        fetched_at REAL NOT NULL,
+        PRIMARY KEY (player_id, season)
+    )
+"""
+
+
+def ensure_stats_table(conn):
+    conn.execute(STATS_DDL)
+
+
+def _try_get(stat_dict, *keys):
+    for k in keys:
+        if k in stat_dict and stat_dict[k] is not None:
+            return stat_dict[k]
+    return None
+
+
+def flatten_stats(doc):
+    """GP / passing / rushing / receiving season totals from an ESPN statistics document."""
+    items = doc.get('splits') or doc.get('items') or []
+    out = {k: None for k in STAT_COLUMNS}
+    for it in items:
+        cat = (it.get('name') or it.get('type') or '').lower()
+        stats = it.get('stats') or it.get('statistics') or {}
+        if 'passing' in cat:
+            out['PassYds'] = _try_get(stats, 'yards', 'passingYards', 'yds') or out['PassYds']
+            out['PassTD'] = _try_get(stats, 'touchdowns', 'passingTouchdowns', 'td') or out['PassTD']
+        elif 'rushing' in cat:
+            out['RushYds'] = _try_get(stats, 'yards', 'rushingYards', 'yds') or out['RushYds']
+            out['RushTD'] = _try_get(stats, 'touchdowns', 'rushingTouchdowns', 'td') or out['RushTD']
+        elif 'receiving' in cat:
+            out['RecYds'] = _try_get(stats, 'yards', 'receivingYards', 'yds') or out['RecYds']
+            out['RecTD'] = _try_get(stats, 'touchdowns', 'receivingTouchdowns', 'td') or out['RecTD']
+        elif 'games' in cat or 'participation' in cat or 'general' in cat:
+            out['GP'] = _try_get(stats, 'gamesPlayed', 'games', 'gp') or out['GP']
+    for k, v in list(out.items()):
+        if v is None:
+            continue
+        try:
+            out[k] = int(float(v))
+        except Exception:
+            pass
+    return out
+
+
+def stats_url(player_id, season, athlete_doc=None):
+    """The athlete's statistics document URL, with the season pinned."""
+    stats_ref = None
+    if isinstance(athlete_doc, dict):
+        stats = athlete_doc.get('statistics')
+        if isinstance(stats, dict) and '$ref' in stats:
+            stats_ref = stats['$ref']
+    if not stats_ref:
+        return ATHLETE_URL.format(player_id=player_id) + f"/statistics?season={season}"
+    if 'season=' not in stats_ref:
+        stats_ref = stats_ref + ("&" if "?" in stats_ref else "?") + f"season={season}"
+    return stats_ref
+
+
+def fetch_stats(player_ids, season=2025, timeout=10, deadline=espn_rosters.LOAD_DEADLINE):
+    """{player_id: flattened stats} for ``player_ids``, fetched concurrently in two flat phases.
+
+    ``deadline`` bounds both phases together, in seconds.
+    """
+    start = time.monotonic()
+    player_ids = [str(pid) for pid in dict.fromkeys(player_ids) if pid]
+    docs = espn_rosters.athlete_docs([ATHLETE_URL.format(player_id=pid) for pid in player_ids],
+                                     timeout=timeout, deadline=deadline)
+    urls = {pid: stats_url(pid, season, docs.get(pid)) for pid in player_ids if pid in docs}
+    remaining = max(0.0, deadline - (time.monotonic() - start))
+    fetched = espn_client.fetch_json_many(urls.values(), timeout=timeout, deadline=remaining)
+    return {pid: flatten_stats(fetched[url]) for pid, url in urls.items() if fetched.get(url) is not None}
+
+
+def stale_ids(conn, player_ids, season, ttl=STATS_TTL, now=None):
+    """The ids in ``player_ids`` with no row, or a row older than ``ttl``."""
+    now = now or time.time()
+    player_ids = [str(pid) for pid in dict.fromkeys(player_ids) if pid]
+    if not player_ids:
+        return []
+    fresh = set()
+    for start in range(0, len(player_ids), 500):
+        chunk = player_ids[start:start + 500]
+        fresh.update(r[0] for r in conn.execute(
+            f"SELECT player_id FROM player_season_stats WHERE season = ? AND fetched_at >= ? AND player_id IN ({','.join('?' * len(chunk))})",
+            [season, now - ttl] + chunk,
+        ))
+    return [pid for pid in player_ids if pid not in fresh]
+
+
+def prefetch(conn, player_ids, season=2025, ttl=STATS_TTL, timeout=10, deadline=espn_rosters.LOAD_DEADLINE):
+    """Fetch and store stats for the missing or stale ids; returns how many rows were written. Commits.
+
+    Ids whose fetch fails are stamped as attempted, keeping any earlier stats
+    (or an empty row), so they are retried on the TTL rather than every call.
+    """
+    ensure_stats_table(conn)
+    wanted = stale_ids(conn, player_ids, season, ttl)
+    if not wanted:
+        return 0
+    stats = fetch_stats(wanted, season, timeout=timeout, deadline=deadline)
+    now = time.time()
+    conn.executemany(
+        """
+        INSERT OR REPLACE INTO player_season_stats
+            (player_id, season, gp, pass_yds, pass_td, rush_yds, rush_td, rec_yds, rec_td, fetched_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        [(pid, season, *(s[k] for k in STAT_COLUMNS), now) for pid, s in stats.items()],
+    )
+    conn.executemany(
+        """
+        INSERT INTO player_season_stats (player_id, season, fetched_at) VALUES (?, ?, ?)
+        ON CONFLICT (player_id, season) DO UPDATE SET fetched_at = excluded.fetched_at
+        """,
+        [(pid, season, now) for pid in wanted if pid not in stats],
+    )
+    conn.commit()
+    return len(stats)
+
+
+def read_stats(conn, season, player_ids=None):
+    """{player_id: {GP, PassYds, ...}} from the warehouse in one query (all players when ids is None)."""
+    ensure_stats_table(conn)
+    rows = conn.execute(
+        "SELECT player_id, gp, pass_yds, pass_td, rush_yds, rush_td, rec_yds, rec_td FROM player_season_stats WHERE season = ?",
+        (season,),
+    ).fetchall()
+    wanted = None if player_ids is None else {str(pid) for pid in player_ids}
+    return {
+        r[0]: dict(zip(STAT_COLUMNS, r[1:]))
+        for r in rows
+        if wanted is None or r[0] in wanted
+    }
+
+
+class StatsRefresher:
+    """Background prefetcher: fills requested ids and re-fetches rows older than the TTL.
+
+    Workers share the job through a lease row, so only one process crawls ESPN.
+    """
+
+    def __init__(self, season, db_path='picks.db', interval=300, ttl=STATS_TTL):
+        self.season = season
+        self.db_path = db_path
+        self.interval = interval
+        self.ttl = ttl
+        self.owner = f"stats:{os.getpid()}:{id(self)}"
+        self.refreshed = 0
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def request(self, player_ids):
+        """Queue ids for the next cycle and wake the thread."""
+        with self._lock:
+            self._pending.update(str(pid) for pid in player_ids if pid)
+        self._wake.set()
+
+    def run_once(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            ensure_stats_table(conn)
+            with self._lock:
+                requested, self._pending = self._pending, set()
+            if not live_scores.acquire_lease(conn, 'player_stats', self.owner, ttl=self.interval * 2):
+                # Another worker owns the TTL sweep; still fill what this worker's viewers asked for
+                return prefetch(conn, requested, self.season, self.ttl) if requested else 0
+            known = [r[0] for r in conn.execute(
+                "SELECT player_id FROM player_season_stats WHERE season = ?", (self.season,)
+            )]
+            written = prefetch(conn, list(requested) + known, self.season, self.ttl)
+            self.refreshed += written
+            return written
+        finally:
+            conn.close()
+
+    def run_forever(self):
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception as e:
+                print(f"Player stats refresh error: {e}")
+            self._wake.wait(self.interval)
+            self._wake.clear()
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self.run_forever, name='player-stats', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
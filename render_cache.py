@@ -0,0 +1,58 @@
+"""Bounded LRU cache for rendered tab content and the data behind it.
+
+Keys include the picks data version (see picks_store.read_data_version), so
+entries for an old revision simply age out once results or picks change.
+"""
+import threading
+from collections import OrderedDict
+
+
+class RenderCache:
+    """Thread-safe LRU cache with hit/miss/eviction counters."""
+
+    def __init__(self, maxsize=64):
+        self.maxsize = max(1, int(maxsize))
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_or_build(self, key, builder):
+        """Return the cached value for ``key``, calling ``builder()`` on a miss.
+
+        The builder runs outside the lock so a slow render never blocks other
+        tabs; two concurrent misses for the same key may both build.
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+
+        value = builder()
+
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+            }
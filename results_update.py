@@ -0,0 +1,101 @@
+"""Fetch ESPN results and store what changed, without the web app.
+
+Importing this module starts nothing: no pollers, no Dash app, no startup
+import. app.py and the standalone results poller (``python
+season_schedule.py``) both call ``update_results`` against the same picks.db.
+"""
+import os
+import sqlite3
+
+import espn_client
+import game_results
+import league_schema
+import picks_store
+import season_schedule
+import standings
+
+DB_PATH = 'picks.db'
+CURRENT_SEASON = int(os.getenv('CURRENT_SEASON', '2025'))
+PLAYERS = league_schema.normalize_players(os.getenv('PLAYERS', 'bobby,chet,clyde,henry,nick,riley').split(','))
+ESPN_API_TIMEOUT = int(os.getenv('ESPN_API_TIMEOUT', '10'))
+ESPN_REFRESH_DEADLINE = float(os.getenv('ESPN_REFRESH_DEADLINE', '30'))
+
+
+def ensure_tables(conn, players=PLAYERS, season=CURRENT_SEASON):
+    """Schema the updater writes to, for a picks.db the web app has not initialized yet."""
+    league_schema.migrate(conn, players, season)
+    picks_store.ensure_data_version(conn)
+    standings.ensure_standings_tables(conn)
+    season_schedule.ensure_schedule_table(conn)
+
+
+def flag_tiebreaker_games(conn):
+    """Flag the last game of each week that has no tiebreaker yet; returns the weeks flagged."""
+    # The importer's choice is respected; only weeks with none fall back to their last game
+    unflagged = conn.execute("""
+        SELECT week, MAX(game_id) FROM games
+        GROUP BY season, week
+        HAVING SUM(is_tiebreaker_game) = 0
+    """).fetchall()
+    if unflagged:
+        conn.executemany("UPDATE games SET is_tiebreaker_game = 1 WHERE game_id = ?", [(gid,) for _, gid in unflagged])
+    return sorted({week for week, _ in unflagged})
+
+
+def apply_espn_results(weeks=None, progress=None, db_path=DB_PATH, season=CURRENT_SEASON, players=PLAYERS,
+                       timeout=ESPN_API_TIMEOUT, deadline=ESPN_REFRESH_DEADLINE):
+    """Fetch ESPN finals for ``weeks`` (all 18 by default) and store what changed.
+
+    Every result is diffed against the stored games and written in one short
+    transaction together with the schedule, tiebreaker flags and the
+    standings of exactly the weeks that changed. Returns the ChangeSet.
+    """
+    if progress:
+        progress(0.05, "Fetching ESPN scoreboards")
+
+    # Scoreboards concurrently over the shared pooled session, before touching the DB
+    scoreboards = espn_client.fetch_scoreboards(weeks or range(1, 19), season, timeout=timeout, deadline=deadline)
+
+    if progress:
+        progress(0.7, "Applying results")
+    conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+    try:
+        standings.ensure_current(conn, players)
+        team_ids = {}
+        results = []
+        for week, data in sorted(scoreboards.items()):
+            if data is not None:
+                results.extend(game_results.results_from_scoreboard(conn, week, data, team_ids))
+
+        touched_weeks = set()
+        for week, data in scoreboards.items():
+            # Kickoffs and game states feed the adaptive poller
+            if data is not None and season_schedule.ingest_scoreboard(conn, season, week, data, team_ids):
+                touched_weeks.add(week)
+        changes = game_results.apply_results(conn, season, results)
+        touched_weeks.update(changes.weeks)
+        touched_weeks.update(flag_tiebreaker_games(conn))
+        standings.refresh_weeks(conn, touched_weeks, players)
+        conn.commit()
+    finally:
+        conn.close()
+    return changes
+
+
+def describe(changes):
+    """User-facing summary of a ChangeSet."""
+    if changes.corrections and changes.newly_final:
+        return f"Successfully updated {len(changes.newly_final)} games and corrected {len(changes.corrections)}!"
+    if changes.corrections:
+        return f"Corrected scores for {len(changes.corrections)} games."
+    if changes.newly_final:
+        return f"Successfully updated {len(changes.newly_final)} games with scores and results!"
+    return "No new completed games found to update."
+
+
+def update_results(weeks=None, progress=None, **kwargs):
+    """Update game results from the ESPN API; returns (message, success)."""
+    try:
+        return describe(apply_espn_results(weeks, progress, **kwargs)), True
+    except Exception as e:
+        return f"Update failed: {str(e)}", False
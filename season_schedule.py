@@ -0,0 +1,259 @@
+"""Season schedule and the kickoff-aware results poller.
+
+The ``schedule`` table holds one row per ESPN event: season, week, teams,
+kickoff (UTC) and state ('pre', 'in', 'post'). It is filled from the same
+scoreboard payloads the results updater already fetches, and kickoff times
+are copied onto ``games.game_date``.
+
+``AdaptivePoller`` uses it to poll only weeks that have kicked-off games
+not yet final. It polls about every 30 seconds while a game is live, and
+otherwise sleeps until the next kickoff, waking at least hourly. Once every
+game of the season is final it makes no more requests.
+
+Run as a worker (render.yaml's update-results service does this):
+    python season_schedule.py [--once]
+
+The worker imports only results_update, not the web app, so it starts no
+other threads. It writes to picks.db in its working directory, which must
+be the database the web service reads. A process that runs app.py can
+instead set ENABLE_RESULTS_POLLER=true to run the same loop in-process.
+"""
+import argparse
+import os
+import sqlite3
+import threading
+from datetime import datetime, timezone
+
+import league_schema
+
+LIVE_INTERVAL = float(os.getenv('POLL_LIVE_SECONDS', '30'))
+IDLE_INTERVAL = float(os.getenv('POLL_IDLE_SECONDS', '3600'))
+
+SCHEDULE_DDL = [
+    """
+    CREATE TABLE IF NOT EXISTS schedule (
+        event_id TEXT PRIMARY KEY,
+        season INTEGER NOT NULL,
+        week INTEGER NOT NULL,
+        away_team_id INTEGER REFERENCES teams(team_id),
+        home_team_id INTEGER REFERENCES teams(team_id),
+        kickoff TEXT,
+        state TEXT NOT NULL DEFAULT 'pre',
+        updated_at TEXT
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_schedule_season_week ON schedule (season, week)",
+]
+
+KICKOFF_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
+
+
+def ensure_schedule_table(conn):
+    for stmt in SCHEDULE_DDL:
+        conn.execute(stmt)
+
+
+def _utc_text(moment):
+    return moment.astimezone(timezone.utc).strftime(KICKOFF_FORMAT)
+
+
+def _parse_kickoff(value):
+    """ESPN dates look like 2025-09-05T00:20Z; returns the stored UTC text or None."""
+    if not value:
+        return None
+    try:
+        return _utc_text(datetime.fromisoformat(value.replace('Z', '+00:00')))
+    except ValueError:
+        return None
+
+
+def _now(now=None):
+    return now or datetime.now(timezone.utc)
+
+
+def ingest_scoreboard(conn, season, week, data, team_ids=None):
+    """Upsert one week's events into ``schedule`` and copy kickoffs onto games.
+
+    Returns True when a game's date changed (so the caller can refresh that
+    week's derived tables). Does not commit.
+    """
+    ensure_schedule_table(conn)
+    team_ids = {} if team_ids is None else team_ids
+    stamp = _utc_text(_now())
+    rows, dates = [], []
+    for event in data.get('events', []):
+        try:
+            competition = event['competitions'][0]
+            sides = {}
+            for team in competition.get('competitors', []):
+                info = team.get('team', {})
+                name = info.get('abbreviation') or info.get('displayName')
+                sides[team.get('homeAway')] = league_schema.team_id(conn, name, team_ids)
+            kickoff = _parse_kickoff(competition.get('date') or event.get('date'))
+            state = competition.get('status', {}).get('type', {}).get('state') or 'pre'
+            rows.append((str(event['id']), season, week, sides.get('away'), sides.get('home'), kickoff, state, stamp))
+            if kickoff and sides.get('away') and sides.get('home'):
+                dates.append((kickoff, season, week, sides['away'], sides['home'], kickoff))
+                dates.append((kickoff, season, week, sides['home'], sides['away'], kickoff))
+        except (KeyError, IndexError, TypeError) as e:
+            print(f"Error reading schedule event: {e}")
+            continue
+
+    conn.executemany(
+        """
+        INSERT INTO schedule (event_id, season, week, away_team_id, home_team_id, kickoff, state, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT (event_id) DO UPDATE SET
+            week = excluded.week, away_team_id = excluded.away_team_id, home_team_id = excluded.home_team_id,
+            kickoff = excluded.kickoff, state = excluded.state, updated_at = excluded.updated_at
+        """,
+        rows,
+    )
+    # Only write dates that differ so unchanged weeks don't bump the picks revision
+    cursor = conn.executemany(
+        """
+        UPDATE games SET game_date = ?
+        WHERE season = ? AND week = ? AND away_team_id = ? AND home_team_id = ? AND game_date IS NOT ?
+        """,
+        dates,
+    )
+    return cursor.rowcount > 0
+
+
+def has_schedule(conn, season):
+    ensure_schedule_table(conn)
+    return conn.execute("SELECT 1 FROM schedule WHERE season = ? LIMIT 1", (season,)).fetchone() is not None
+
+
+def due_weeks(conn, season, now=None):
+    """Weeks with a game that has kicked off (or is marked live) but is not final yet."""
+    ensure_schedule_table(conn)
+    rows = conn.execute(
+        """
+        SELECT DISTINCT week FROM schedule
+        WHERE season = ? AND state != 'post' AND (state = 'in' OR kickoff <= ?)
+        ORDER BY week
+        """,
+        (season, _utc_text(_now(now))),
+    ).fetchall()
+    return [r[0] for r in rows]
+
+
+def next_poll_delay(conn, season, week=None, now=None):
+    """Seconds until the next poll is worth making, or None when every game is final.
+
+    Live games give LIVE_INTERVAL. Otherwise the delay runs until the next
+    kickoff, clamped between LIVE_INTERVAL and IDLE_INTERVAL. ``week``
+    limits the answer to one week.
+    """
+    ensure_schedule_table(conn)
+    now = _now(now)
+    week_filter, params = ("AND week = ?", [season, week]) if week is not None else ("", [season])
+    row = conn.execute(
+        f"""
+        SELECT COUNT(*), SUM(state = 'in' OR kickoff <= ?), MIN(kickoff)
+        FROM schedule WHERE season = ? {week_filter} AND state != 'post'
+        """,
+        [_utc_text(now)] + params,
+    ).fetchone()
+    unfinished, live, next_kickoff = row
+    if not unfinished:
+        return None
+    if live:
+        return LIVE_INTERVAL
+    if not next_kickoff:
+        return IDLE_INTERVAL
+    until = (datetime.strptime(next_kickoff, KICKOFF_FORMAT).replace(tzinfo=timezone.utc) - now).total_seconds()
+    return min(IDLE_INTERVAL, max(LIVE_INTERVAL, until))
+
+
+class AdaptivePoller:
+    """Calls ``poll(weeks)`` for due weeks on a kickoff-aware cadence in a background thread.
+
+    ``poll`` is expected to fetch those weeks and feed their scoreboards back
+    through ``ingest_scoreboard`` (results_update.update_results does both).
+    """
+
+    def __init__(self, poll, season, db_path='picks.db'):
+        self.poll = poll
+        self.season = season
+        self.db_path = db_path
+        self.polls = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def run_once(self):
+        """One cycle: poll the due weeks and return the delay before the next cycle (None when done)."""
+        conn = self._connect()
+        try:
+            # The first cycle polls the whole season, which also stores its schedule
+            weeks = due_weeks(conn, self.season) if has_schedule(conn, self.season) else list(range(1, 19))
+        finally:
+            conn.close()
+
+        if weeks:
+            self.poll(weeks)
+            self.polls += 1
+
+        conn = self._connect()
+        try:
+            return next_poll_delay(conn, self.season)
+        finally:
+            conn.close()
+
+    def run_forever(self):
+        finished = False
+        while not self._stop.is_set():
+            try:
+                delay = self.run_once()
+            except Exception as e:
+                print(f"Results poller error: {e}")
+                delay = LIVE_INTERVAL
+            if delay is None:
+                # Nothing left to poll; only the local schedule is checked from here on
+                if not finished:
+                    print(f"All {self.season} games are final; results poller idle")
+                finished = True
+                delay = IDLE_INTERVAL
+            self._stop.wait(delay)
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self.run_forever, name='results-poller', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Poll ESPN for results on a kickoff-aware schedule")
+    parser.add_argument('--once', action='store_true', help="run a single cycle and print the next delay")
+    args = parser.parse_args()
+
+    from dotenv import load_dotenv
+    load_dotenv()  # same .env settings as the app
+    import results_update  # the results updater, without app.py's startup
+
+    conn = sqlite3.connect(results_update.DB_PATH, timeout=30)
+    try:
+        results_update.ensure_tables(conn)
+        conn.commit()
+    finally:
+        conn.close()
+
+    poller = AdaptivePoller(lambda weeks: print(results_update.update_results(weeks)[0]), results_update.CURRENT_SEASON,
+                            db_path=results_update.DB_PATH)
+    if args.once:
+        print(f"Next poll in {poller.run_once()} seconds")
+    else:
+        poller.run_forever()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,257 @@
+"""Materialized standings, weekly records and weekly winners.
+
+The importers and the results updater call ``refresh_weeks`` with the weeks
+they touched, inside their own transaction, so the display helpers in app.py
+read small pre-aggregated tables instead of re-deriving everything from the
+picks table. ``standings_meta`` remembers the picks revision the tables were
+built from; if some other writer changed picks since, ``ensure_current``
+rebuilds everything.
+"""
+import numpy as np
+import pandas as pd
+
+import clinch_solver
+import picks_store
+
+STANDINGS_DDL = [
+    """
+    CREATE TABLE IF NOT EXISTS weekly_records (
+        week INTEGER NOT NULL,
+        player TEXT NOT NULL,
+        wins INTEGER NOT NULL DEFAULT 0,
+        losses INTEGER NOT NULL DEFAULT 0,
+        ties INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (week, player)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS weekly_winners (
+        week INTEGER PRIMARY KEY,
+        winners TEXT,
+        wins INTEGER,
+        losses INTEGER,
+        tiebreaker_detail TEXT,
+        clinched INTEGER NOT NULL DEFAULT 0
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS season_totals (
+        player TEXT PRIMARY KEY,
+        wins INTEGER NOT NULL DEFAULT 0,
+        losses INTEGER NOT NULL DEFAULT 0,
+        ties INTEGER NOT NULL DEFAULT 0
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS standings_meta (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        revision INTEGER
+    )
+    """,
+]
+
+
+def ensure_standings_tables(conn):
+    for stmt in STANDINGS_DDL:
+        conn.execute(stmt)
+
+
+def _resolve_winners(store, week, week_wins):
+    """Winners of one week (most wins, then closest tiebreaker guess) and the tiebreaker detail text."""
+    people = store.players
+    best_wins = week_wins.max()
+    contenders = [people[p] for p in np.flatnonzero(week_wins == best_wins)]
+    winners = contenders[:]
+    tiebreaker_detail = "Tiebreaker not needed"
+
+    if len(contenders) > 1:
+        tb_idx = store.tiebreaker_row(week, completed_only=True)
+
+        if tb_idx is not None:
+            game_matchup = f"{store.team_name(store.away_ids[tb_idx])} vs {store.team_name(store.home_ids[tb_idx])}"
+            away_score = store.away_scores[tb_idx]
+            home_score = store.home_scores[tb_idx]
+            guesses = {person: store.tiebreakers[tb_idx, people.index(person)] for person in contenders}
+
+        if tb_idx is not None and not np.isnan(away_score) and not np.isnan(home_score):
+            actual_total = int(away_score) + int(home_score)
+            final_score = f"{int(away_score)}-{int(home_score)}"
+
+            contender_errors = []
+            for person in contenders:
+                tb_val = None if np.isnan(guesses[person]) else int(guesses[person])
+                error = abs(tb_val - actual_total) if tb_val is not None else float('inf')
+                contender_errors.append({'name': person, 'error': error, 'prediction': tb_val})
+
+            best_error = min(c['error'] for c in contender_errors)
+            winners = [c['name'] for c in contender_errors if c['error'] == best_error]
+
+            detail_parts = []
+            for c in contender_errors:
+                pred_text = f"{int(c['prediction'])}" if c['prediction'] is not None else "N/A"
+                diff_text = "no pick" if c['error'] == float('inf') else f"off by {int(c['error'])}"
+                detail_parts.append(f"{c['name'].title()}: {pred_text} ({diff_text})")
+
+            tiebreaker_detail = f"🏈 {game_matchup} (Final: {final_score}, Total: {actual_total} pts) | " + "; ".join(detail_parts)
+        elif tb_idx is not None:
+            # If last-game score missing, still list contenders' guesses for transparency
+            detail_parts = []
+            for person in contenders:
+                pred_text = "N/A" if np.isnan(guesses[person]) else str(int(guesses[person]))
+                detail_parts.append(f"{person.title()}: {pred_text}")
+            tiebreaker_detail = f"🏈 {game_matchup} (Final: TBD) | Contenders' guesses: " + ", ".join(detail_parts)
+        else:
+            tiebreaker_detail = "Tiebreaker unavailable (missing last-game setup)."
+
+    return winners or contenders, tiebreaker_detail
+
+
+# Per-player, per-week records pushed down into SQLite. Picks and winners are
+# team ids (legacy 'away'/'home' markers are resolved on write), so a decided
+# pick is correct exactly when pick_team_id = winner_team_id.
+RECORDS_SQL = """
+    SELECT g.week, p.name,
+           SUM(pp.pick_team_id = g.winner_team_id),
+           SUM(g.is_tie = 0 AND pp.pick_team_id IS NOT g.winner_team_id),
+           SUM(g.is_tie)
+    FROM games g
+    JOIN player_picks pp ON pp.game_id = g.game_id
+    JOIN players p ON p.player_id = pp.player_id
+    WHERE (g.winner_team_id IS NOT NULL OR g.is_tie = 1)
+      AND pp.pick_team_id IS NOT NULL
+      {week_filter}
+    GROUP BY g.week, pp.player_id
+"""
+
+
+def _records_sql(weeks):
+    if weeks is None:
+        return RECORDS_SQL.format(week_filter=""), []
+    weeks = list(weeks)
+    return RECORDS_SQL.format(week_filter=f"AND g.week IN ({','.join('?' * len(weeks))})"), weeks
+
+
+def aggregate_records(conn, weeks=None):
+    """(week, player, wins, losses, ties) rows computed in SQLite for ``weeks`` (all when None)."""
+    sql, params = _records_sql(weeks)
+    return conn.execute(sql, params).fetchall()
+
+
+def _week_is_clinched(store, week):
+    try:
+        statuses = clinch_solver.solve_week(store, week)
+        return any(status == clinch_solver.CLINCHED for status in statuses.values())
+    except Exception:
+        return False
+
+
+def refresh_weeks(conn, weeks, players):
+    """Recompute the materialized rows for ``weeks`` and the season totals.
+
+    Reads only those weeks' games and does not commit; callers run this in
+    the same transaction as the picks writes that touched the weeks.
+    """
+    weeks = sorted({int(w) for w in weeks})
+    if not weeks:
+        return
+    ensure_standings_tables(conn)
+    marks = ",".join("?" * len(weeks))
+    frame = pd.read_sql_query(f"SELECT * FROM picks WHERE week IN ({marks}) ORDER BY week, game_id", conn, params=weeks)
+    store = picks_store.PickStore(frame, players)
+
+    conn.execute(f"DELETE FROM weekly_records WHERE week IN ({marks})", weeks)
+    conn.execute(f"DELETE FROM weekly_winners WHERE week IN ({marks})", weeks)
+
+    # One indexed GROUP BY over decided picks gives every player's record, however many players
+    sql, params = _records_sql(weeks)
+    conn.execute("INSERT INTO weekly_records (week, player, wins, losses, ties)" + sql, params)
+
+    # Winners need the tiebreaker guesses; only weeks with a completed game get a row
+    done_weeks, wins, totals = store.weekly_tally()
+    winner_rows = []
+    for w, week in enumerate(done_weeks):
+        winners, detail = _resolve_winners(store, week, wins[w])
+        primary = store.players.index(winners[0])
+        winner_rows.append((
+            int(week),
+            ", ".join(name.title() for name in winners),
+            int(wins[w, primary]),
+            int(totals[w, primary] - wins[w, primary]),
+            detail,
+            int(_week_is_clinched(store, week)),
+        ))
+
+    conn.executemany(
+        "INSERT INTO weekly_winners (week, winners, wins, losses, tiebreaker_detail, clinched) VALUES (?, ?, ?, ?, ?, ?)",
+        winner_rows,
+    )
+
+    conn.execute("DELETE FROM season_totals")
+    conn.execute("""
+        INSERT INTO season_totals (player, wins, losses, ties)
+        SELECT player, SUM(wins), SUM(losses), SUM(ties) FROM weekly_records GROUP BY player
+    """)
+    _stamp(conn)
+
+
+def rebuild_all(conn, players):
+    """Recompute every week from scratch (first run, or after an untracked picks write)."""
+    ensure_standings_tables(conn)
+    weeks = [row[0] for row in conn.execute("SELECT DISTINCT week FROM picks")]
+    conn.execute("DELETE FROM weekly_records")
+    conn.execute("DELETE FROM weekly_winners")
+    conn.execute("DELETE FROM season_totals")
+    if weeks:
+        refresh_weeks(conn, weeks, players)
+    else:
+        _stamp(conn)
+
+
+def _stamp(conn):
+    conn.execute(
+        "INSERT OR REPLACE INTO standings_meta (id, revision) VALUES (1, ?)",
+        (picks_store.read_data_version(conn),),
+    )
+
+
+def ensure_current(conn, players):
+    """Rebuild the tables if picks changed without a matching refresh_weeks call."""
+    try:
+        ensure_standings_tables(conn)
+        row = conn.execute("SELECT revision FROM standings_meta WHERE id = 1").fetchone()
+        version = picks_store.read_data_version(conn)
+        if row is None or version is None or row[0] != version:
+            rebuild_all(conn, players)
+            conn.commit()
+    except Exception as e:
+        print(f"Error refreshing standings tables: {e}")
+
+
+def read_weekly_records(conn, players):
+    """(weeks, wins, losses, ties) with weeks x players arrays in ``players`` order."""
+    players = [p.strip().lower() for p in players]
+    rows = conn.execute("SELECT week, player, wins, losses, ties FROM weekly_records ORDER BY week").fetchall()
+    weeks = sorted({r[0] for r in rows})
+    shape = (len(weeks), len(players))
+    wins, losses, ties = np.zeros(shape, dtype=np.int64), np.zeros(shape, dtype=np.int64), np.zeros(shape, dtype=np.int64)
+    week_pos = {w: i for i, w in enumerate(weeks)}
+    player_pos = {p: i for i, p in enumerate(players)}
+    for week, player, w, l, t in rows:
+        if player in player_pos:
+            i, j = week_pos[week], player_pos[player]
+            wins[i, j], losses[i, j], ties[i, j] = w, l, t
+    return np.array(weeks, dtype=np.int64), wins, losses, ties
+
+
+def read_weekly_winners(conn):
+    return conn.execute(
+        "SELECT week, winners, wins, losses, tiebreaker_detail, clinched FROM weekly_winners ORDER BY week"
+    ).fetchall()
+
+
+def read_season_totals(conn, players):
+    """(wins, losses, ties) arrays in ``players`` order."""
+    players = [p.strip().lower() for p in players]
+    found = {r[0]: r[1:] for r in conn.execute("SELECT player, wins, losses, ties FROM season_totals")}
+    rows = np.array([found.get(p, (0, 0, 0)) for p in players], dtype=np.int64).reshape(len(players), 3)
+    return rows[:, 0], rows[:, 1], rows[:, 2]
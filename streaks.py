@@ -0,0 +1,155 @@
+"""Run-length streak history for every player.
+
+A player's decided picks, ordered by (week, game_id), are run-length encoded
+into segments that break whenever the result or the week changes. Season
+streaks are adjacent segments with the same result merged together, so the
+same data answers both "longest streak" and "longest streak within a week".
+
+``StreakEngine`` keeps the segments between data revisions. When the new
+decided sequence starts with the one already encoded (the usual case: more
+results came in), only the new tail is encoded and the last run is extended;
+anything else (a corrected result, a re-import) rebuilds that player.
+"""
+import threading
+
+import numpy as np
+
+import picks_store
+
+
+def _segments(weeks, values):
+    """Run-length encode on (week, value): returns (values, weeks, starts, lengths)."""
+    if values.size == 0:
+        empty = np.array([], dtype=np.int64)
+        return values[:0], weeks[:0], empty, empty
+    breaks = (values[1:] != values[:-1]) | (weeks[1:] != weeks[:-1])
+    starts = np.concatenate(([0], np.flatnonzero(breaks) + 1))
+    lengths = np.diff(np.concatenate((starts, [values.size])))
+    return values[starts], weeks[starts], starts, lengths
+
+
+class PlayerStreaks:
+    """Streak segments over one player's decided picks."""
+
+    def __init__(self, game_ids, weeks, values):
+        self.game_ids = np.asarray(game_ids, dtype=np.int64)
+        self.weeks = np.asarray(weeks, dtype=np.int64)
+        self.values = np.asarray(values, dtype=np.int8)
+        self.seg_values, self.seg_weeks, self.seg_starts, self.seg_lengths = _segments(self.weeks, self.values)
+
+    def __len__(self):
+        return int(self.values.size)
+
+    def continues_with(self, game_ids, values):
+        """True when the new decided sequence begins with everything already encoded."""
+        n = len(self)
+        return (
+            len(game_ids) >= n
+            and np.array_equal(game_ids[:n], self.game_ids)
+            and np.array_equal(values[:n], self.values)
+        )
+
+    def extend(self, game_ids, weeks, values):
+        """Append newly decided picks, growing the last segment when the run continues."""
+        if len(values) == 0:
+            return
+        offset = len(self)
+        tail_values, tail_weeks, tail_starts, tail_lengths = _segments(np.asarray(weeks, dtype=np.int64), np.asarray(values, dtype=np.int8))
+        tail_starts = tail_starts + offset
+        if self.seg_values.size and self.seg_values[-1] == tail_values[0] and self.seg_weeks[-1] == tail_weeks[0]:
+            self.seg_lengths = self.seg_lengths.copy()
+            self.seg_lengths[-1] += tail_lengths[0]
+            tail_values, tail_weeks, tail_starts, tail_lengths = tail_values[1:], tail_weeks[1:], tail_starts[1:], tail_lengths[1:]
+        self.seg_values = np.concatenate((self.seg_values, tail_values))
+        self.seg_weeks = np.concatenate((self.seg_weeks, tail_weeks))
+        self.seg_starts = np.concatenate((self.seg_starts, tail_starts))
+        self.seg_lengths = np.concatenate((self.seg_lengths, tail_lengths))
+        self.game_ids = np.concatenate((self.game_ids, game_ids))
+        self.weeks = np.concatenate((self.weeks, weeks))
+        self.values = np.concatenate((self.values, values))
+
+    def runs(self):
+        """Season streaks as (values, starts, lengths); starts index the decided sequence."""
+        if not self.seg_values.size:
+            empty = np.array([], dtype=np.int64)
+            return self.seg_values, empty, empty
+        _, first, _ = picks_store.run_lengths(self.seg_values)
+        return self.seg_values[first], self.seg_starts[first], np.add.reduceat(self.seg_lengths, first)
+
+    def history(self):
+        """Every season streak with its first and last game."""
+        values, starts, lengths = self.runs()
+        ends = starts + lengths - 1
+        return [
+            {
+                'result': 'Win' if v == picks_store.CORRECT else 'Loss',
+                'length': int(n),
+                'start': int(s),
+                'start_game_id': int(self.game_ids[s]),
+                'start_week': int(self.weeks[s]),
+                'end_game_id': int(self.game_ids[e]),
+                'end_week': int(self.weeks[e]),
+            }
+            for v, s, e, n in zip(values, starts, ends, lengths)
+        ]
+
+    def current(self):
+        """(length, 'Win' | 'Loss') of the streak in progress, or (0, None)."""
+        values, _, lengths = self.runs()
+        if not values.size:
+            return 0, None
+        return int(lengths[-1]), 'Win' if values[-1] == picks_store.CORRECT else 'Loss'
+
+    def longest(self, value, within_week=False):
+        """Longest streak of ``value`` across the season, or inside a single week."""
+        if within_week:
+            lengths = self.seg_lengths[self.seg_values == value]
+        else:
+            values, _, run_lengths = self.runs()
+            lengths = run_lengths[values == value]
+        return int(lengths.max()) if lengths.size else 0
+
+
+class StreakEngine:
+    """Per-player streak histories carried across data revisions."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._store = None
+        self._players = {}
+        self.extended = 0
+        self.rebuilt = 0
+
+    def update(self, store):
+        """Bring every player's history in line with ``store`` and return {player: PlayerStreaks}."""
+        with self._lock:
+            if store is self._store:
+                return dict(self._players)
+            updated = {}
+            for p, person in enumerate(store.players):
+                column = store.correctness[:, p]
+                decided = column != picks_store.UNDECIDED
+                game_ids = store.game_ids[decided]
+                weeks = store.weeks[decided]
+                values = column[decided]
+
+                existing = self._players.get(person)
+                if existing is not None and existing.continues_with(game_ids, values):
+                    n = len(existing)
+                    existing.extend(game_ids[n:], weeks[n:], values[n:])
+                    self.extended += 1
+                    updated[person] = existing
+                else:
+                    updated[person] = PlayerStreaks(game_ids, weeks, values)
+                    self.rebuilt += 1
+            self._players = updated
+            self._store = store
+            return dict(updated)
+
+
+_engine = StreakEngine()
+
+
+def player_streaks(store):
+    """Shared engine entry point used by the dashboard."""
+    return _engine.update(store)
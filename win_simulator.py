@@ -0,0 +1,210 @@
+"""Monte Carlo win probabilities for the weekly and season race.
+
+Every unfinished game in the pick store is decided by one batched uniform
+draw per trial, so a trial settles the current week and the rest of the
+season together. Weekly winners follow get_weekly_winners (most correct
+picks, then closest tiebreaker guess); the season goes to the most correct
+picks overall. Shared wins are split evenly so probabilities sum to one.
+
+Per-game home-win probabilities come from a pluggable model: any callable
+``model(store, rows) -> array`` over row indices. coin_flip, EloModel and
+LineModel cover 50/50, ratings built from the season so far, and imported
+point spreads.
+"""
+import csv
+import math
+
+import numpy as np
+
+import picks_store
+
+DEFAULT_TRIALS = 50_000
+BATCH_SIZE = 10_000
+
+# Typical NFL scoring, used when the season has too few finals to estimate
+DEFAULT_TOTAL_MEAN = 44.0
+DEFAULT_TOTAL_SD = 13.5
+
+# Standard deviation of the final margin around the spread
+SPREAD_SD = 13.45
+
+
+def coin_flip(store, rows):
+    """Every game is 50/50."""
+    return np.full(len(rows), 0.5)
+
+
+class EloModel:
+    """Elo ratings replayed over the season's completed games."""
+
+    def __init__(self, k=20.0, home_advantage=48.0, initial=1500.0):
+        self.k = k
+        self.home_advantage = home_advantage
+        self.initial = initial
+
+    def ratings(self, store):
+        ratings = np.full(len(store.teams), self.initial)
+        for i in np.flatnonzero(store.final):
+            away, home = store.away_ids[i], store.home_ids[i]
+            if away < 0 or home < 0:
+                continue
+            expected = self._home_expectation(ratings[home] - ratings[away])
+            winner = store.winner_ids[i]
+            result = 1.0 if winner == home else 0.0 if winner == away else 0.5
+            shift = self.k * (result - expected)
+            ratings[home] += shift
+            ratings[away] -= shift
+        return ratings
+
+    def _home_expectation(self, diff):
+        return 1.0 / (1.0 + 10.0 ** (-(diff + self.home_advantage) / 400.0))
+
+    def __call__(self, store, rows):
+        ratings = self.ratings(store)
+        away, home = store.away_ids[rows], store.home_ids[rows]
+        known = (away >= 0) & (home >= 0)
+        diff = np.where(known, ratings[home] - ratings[away], 0.0)
+        return np.where(known, self._home_expectation(diff), 0.5)
+
+
+class LineModel:
+    """Home-win probabilities from imported lines; games without a line are 50/50.
+
+    ``lines`` maps (week, away_team, home_team) to the home spread (negative
+    when the home side is favoured).
+    """
+
+    def __init__(self, lines):
+        self.lines = lines
+
+    def __call__(self, store, rows):
+        probs = np.full(len(rows), 0.5)
+        for n, i in enumerate(rows):
+            key = (int(store.weeks[i]), store.team_name(store.away_ids[i]), store.team_name(store.home_ids[i]))
+            spread = self.lines.get(key)
+            if spread is not None:
+                probs[n] = spread_to_probability(spread)
+        return probs
+
+
+def spread_to_probability(home_spread):
+    """P(home wins) for a home spread, assuming a normal final margin."""
+    return 0.5 * (1.0 + math.erf(-home_spread / (SPREAD_SD * math.sqrt(2.0))))
+
+
+def load_lines_csv(path):
+    """Read lines from a CSV with week, away_team, home_team and home_spread columns."""
+    lines = {}
+    with open(path, newline='') as fh:
+        for row in csv.DictReader(fh):
+            try:
+                key = (int(row['week']), row['away_team'].strip(), row['home_team'].strip())
+                lines[key] = float(row['home_spread'])
+            except (KeyError, TypeError, ValueError):
+                continue
+    return lines
+
+
+def get_model(name, lines_path=None):
+    """Resolve a model name from config: 'coin', 'elo' or 'line'."""
+    name = (name or 'coin').strip().lower()
+    if name == 'elo':
+        return EloModel()
+    if name == 'line' and lines_path:
+        try:
+            return LineModel(load_lines_csv(lines_path))
+        except OSError as e:
+            print(f"Could not read lines file {lines_path}: {e}")
+    return coin_flip
+
+
+def _total_distribution(store):
+    """Mean and spread of completed game totals, for sampling an open tiebreaker."""
+    totals = (store.away_scores + store.home_scores)[store.final]
+    totals = totals[~np.isnan(totals)]
+    if totals.size < 8:
+        return DEFAULT_TOTAL_MEAN, DEFAULT_TOTAL_SD
+    return float(totals.mean()), max(float(totals.std()), 1.0)
+
+
+def _split_first(scores):
+    """Per-trial share of first place: 1/k for each of the k leaders."""
+    leaders = scores == scores.max(axis=1, keepdims=True)
+    return leaders / leaders.sum(axis=1, keepdims=True)
+
+
+def simulate_race(store, week, trials=DEFAULT_TRIALS, model=coin_flip, tiebreaker_total_floor=0, seed=None):
+    """Simulate the rest of the season and return per-player race odds.
+
+    Returns {player: {'week_win_prob', 'season_win_prob',
+    'expected_week_wins', 'expected_season_wins'}}.
+    """
+    players = store.players
+    n_players = len(players)
+    if not n_players:
+        return {}
+
+    rng = np.random.default_rng(seed)
+    open_rows = np.flatnonzero(~store.final)
+    home_prob = np.clip(np.asarray(model(store, open_rows), dtype=float), 0.0, 1.0)
+    open_picks = store.picks[open_rows]
+    picked_home = (open_picks == picks_store.PICK_HOME).astype(np.float32)
+    picked_away = (open_picks == picks_store.PICK_AWAY).astype(np.float32)
+    in_week = store.weeks[open_rows] == week
+
+    season_base = store.season_tally()[0].astype(np.float32)
+    week_rows = store.week_rows(week)
+    week_base = (store.correctness[week_rows] == picks_store.CORRECT).sum(axis=0).astype(np.float32)
+
+    # Tiebreaker: known total once final, otherwise sampled at or above the live floor
+    tb_idx = store.tiebreaker_row(week)
+    guesses = store.tiebreakers[tb_idx] if tb_idx is not None else None
+    fixed_total = None
+    if tb_idx is not None and store.final[tb_idx]:
+        fixed_total = store.away_scores[tb_idx] + store.home_scores[tb_idx]
+        if np.isnan(fixed_total):
+            guesses = None
+    total_mean, total_sd = _total_distribution(store)
+    floor = tiebreaker_total_floor or 0
+
+    week_share = np.zeros(n_players)
+    season_share = np.zeros(n_players)
+    week_wins_sum = np.zeros(n_players)
+    season_wins_sum = np.zeros(n_players)
+
+    done = 0
+    while done < trials:
+        batch = min(BATCH_SIZE, trials - done)
+        home_wins = (rng.random((batch, open_rows.size)) < home_prob).astype(np.float32)
+        gained = home_wins @ picked_home + (1.0 - home_wins) @ picked_away
+        week_gained = home_wins[:, in_week] @ picked_home[in_week] + (1.0 - home_wins[:, in_week]) @ picked_away[in_week]
+
+        season_wins = season_base + gained
+        week_wins = week_base + week_gained
+
+        week_score = week_wins.astype(np.float64)
+        if guesses is not None:
+            if fixed_total is not None:
+                totals = np.full((batch, 1), fixed_total)
+            else:
+                totals = np.maximum(floor, np.rint(rng.normal(total_mean, total_sd, (batch, 1))))
+            errors = np.abs(guesses[None, :] - totals)
+            errors = np.where(np.isnan(errors), np.inf, errors)
+            # Wins dominate; among equal wins the smaller error ranks higher
+            week_score = week_score - np.arctan(errors) / np.pi
+
+        week_share += _split_first(week_score).sum(axis=0)
+        season_share += _split_first(season_wins).sum(axis=0)
+        week_wins_sum += week_wins.sum(axis=0)
+        season_wins_sum += season_wins.sum(axis=0)
+        done += batch
+
+    return {
+        person: {
+            'week_win_prob': float(week_share[p] / trials),
+            'season_win_prob': float(season_share[p] / trials),
+            'expected_week_wins': float(week_wins_sum[p] / trials),
+            'expected_season_wins': float(season_wins_sum[p] / trials),
+        }
+        for p, person in enumerate(players)
+    }
@@ -0,0 +1,288 @@
+"""Polling watcher that imports the picks workbook when it changes.
+
+Candidate workbooks (``.xlsx``, not ``~$`` lock files or ``temp_*`` upload
+copies) are indexed with one ``os.scandir`` per directory, by (mtime, size).
+find_latest_excel_file alone scans with ``include_temp`` so it can still fall
+back to a temp copy when nothing else exists. A change is imported only once
+the file's signature has held for ``settle`` seconds across polls, so a
+workbook still being written or synced is never read half done. Polling works on any filesystem, including network mounts and
+containers where inotify does not.
+
+The app starts one only with ENABLE_WORKBOOK_WATCHER=true. Every worker then
+runs a watcher, but only the holder of the ``workbook_watcher``
+lease in picks.db polls. The signature of the last imported file is stored
+in ``watched_workbooks``, so a new leader does not import it again. Imports
+themselves, whether from the watcher, 'Reload Excel' or an upload, take the
+``workbook_import`` lease through ``import_lease``. At most one runs at a
+time across gunicorn workers.
+
+On the first run the current workbook is only recorded as the baseline.
+Importing a file nobody asked for could drop games that exist only in the
+database.
+"""
+import argparse
+import contextlib
+import os
+import socket
+import sqlite3
+import threading
+import time
+
+import excel_import
+import league_schema
+import live_scores
+import picks_store
+import standings
+
+WATCH_INTERVAL = float(os.getenv('WORKBOOK_WATCH_INTERVAL', '5'))
+SETTLE_SECONDS = float(os.getenv('WORKBOOK_SETTLE_SECONDS', '3'))
+EXTENSIONS = ('.xlsx',)
+WATCH_LEASE = 'workbook_watcher'
+IMPORT_LEASE = 'workbook_import'
+
+WATCH_DDL = """
+    CREATE TABLE IF NOT EXISTS watched_workbooks (
+        path TEXT PRIMARY KEY,
+        mtime_ns INTEGER NOT NULL,
+        size INTEGER NOT NULL,
+        imported_at REAL,
+        status TEXT
+    )
+"""
+
+
+def ensure_watch_table(conn):
+    conn.execute(WATCH_DDL)
+
+
+def is_candidate(name, include_temp=False):
+    lowered = name.lower()
+    if not include_temp and lowered.startswith('temp_'):
+        return False
+    return lowered.endswith(EXTENSIONS) and not name.startswith('~$')
+
+
+def scan(dirs, include_temp=False):
+    """{path: (mtime_ns, size)} of candidate workbooks directly inside ``dirs``."""
+    index = {}
+    for directory in dirs:
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if not is_candidate(entry.name, include_temp):
+                        continue
+                    try:
+                        if not entry.is_file():
+                            continue
+                        st = entry.stat()
+                    except OSError:
+                        continue  # removed between listing and stat
+                    index[entry.path] = (st.st_mtime_ns, st.st_size)
+        except OSError as e:
+            print(f"Could not scan {directory}: {e}")
+    return index
+
+
+def latest(index):
+    """Newest workbook in ``index``, preferring names that do not start with temp_."""
+    def newest(paths):
+        return max(paths, key=lambda p: index[p][0], default=None)
+
+    preferred = [p for p in index if not os.path.basename(p).lower().startswith('temp_')]
+    return newest(preferred) or newest(index)
+
+
+def default_dirs():
+    """The working directory and its parent, like find_latest_excel_file."""
+    cwd = os.getcwd()
+    parent = os.path.dirname(cwd)
+    return [cwd] + ([parent] if parent and parent != cwd and os.path.isdir(parent) else [])
+
+
+@contextlib.contextmanager
+def import_lease(db_path='picks.db', owner=None, ttl=600, wait=120):
+    """Hold the cross-worker import lease for the duration of the block (waits up to ``wait`` seconds)."""
+    owner = owner or f"import:{socket.gethostname()}:{os.getpid()}:{threading.get_ident()}"
+    conn = sqlite3.connect(db_path, timeout=30)
+    try:
+        live_scores.ensure_live_tables(conn)
+        deadline = time.monotonic() + wait
+        while not live_scores.acquire_lease(conn, IMPORT_LEASE, owner, ttl):
+            if time.monotonic() >= deadline:
+                raise TimeoutError("Another workbook import is still running")
+            time.sleep(0.5)
+        try:
+            yield
+        finally:
+            live_scores.release_lease(conn, IMPORT_LEASE, owner)
+    finally:
+        conn.close()
+
+
+class WorkbookWatcher:
+    """Per-process watcher; the lease holder calls ``import_file(path)`` for changed, settled workbooks.
+
+    ``import_file`` returns (message, success) like app.import_picks and the
+    module-level ``import_file``, which ``python workbook_watcher.py`` uses.
+    """
+
+    def __init__(self, import_file, dirs=None, db_path='picks.db', interval=WATCH_INTERVAL, settle=SETTLE_SECONDS):
+        self.import_file = import_file
+        self.dirs = dirs
+        self.db_path = db_path
+        self.interval = interval
+        self.settle = settle
+        self.owner = f"watch:{socket.gethostname()}:{os.getpid()}:{id(self)}"
+        self.index = {}
+        self.scanned_at = None
+        self.imports = 0
+        self._pending = {}
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def _recorded(self, conn, path):
+        row = conn.execute("SELECT mtime_ns, size FROM watched_workbooks WHERE path = ?", (path,)).fetchone()
+        return None if row is None else tuple(row)
+
+    def _record(self, conn, path, signature, status, imported=True):
+        conn.execute(
+            "INSERT OR REPLACE INTO watched_workbooks (path, mtime_ns, size, imported_at, status) VALUES (?, ?, ?, ?, ?)",
+            (path, signature[0], signature[1], time.time() if imported else None, status),
+        )
+        conn.commit()
+
+    def refresh_index(self):
+        self.index = scan(self.dirs or default_dirs())
+        self.scanned_at = time.time()
+        return self.index
+
+    def run_once(self, now=None):
+        """One poll: returns the path imported, or None."""
+        now = now or time.monotonic()
+        conn = self._connect()
+        try:
+            ensure_watch_table(conn)
+            live_scores.ensure_live_tables(conn)
+            if not live_scores.acquire_lease(conn, WATCH_LEASE, self.owner, ttl=max(30.0, self.interval * 6)):
+                self._pending.clear()
+                return None
+            index = self.refresh_index()
+            path = latest(index)
+            if path is None:
+                return None
+            signature = index[path]
+            recorded = self._recorded(conn, path)
+            if recorded is None and not conn.execute("SELECT 1 FROM watched_workbooks LIMIT 1").fetchone():
+                # First run anywhere: take what is on disk as already imported
+                self._record(conn, path, signature, 'baseline', imported=False)
+                return None
+            if recorded == signature:
+                self._pending.pop(path, None)
+                return None
+
+            # Debounce: the same signature must hold for `settle` seconds
+            pending = self._pending.get(path)
+            if pending is None or pending[0] != signature:
+                self._pending[path] = (signature, now)
+                return None
+            if now - pending[1] < self.settle:
+                return None
+            del self._pending[path]
+
+            message, success = self.import_file(path)
+            self.imports += 1
+            print(f"Workbook watcher imported {path}: {message}")
+            # A failed file is not retried until it changes again
+            self._record(conn, path, signature, 'imported' if success else f"failed: {message}")
+            return path
+        finally:
+            conn.close()
+
+    def run_forever(self):
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception as e:
+                print(f"Workbook watcher error: {e}")
+            self._stop.wait(self.interval)
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self.run_forever, name='workbook-watcher', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        try:
+            conn = self._connect()
+            live_scores.release_lease(conn, WATCH_LEASE, self.owner)
+            conn.close()
+        except Exception:
+            pass
+
+    def latest_workbook(self, max_age=None):
+        """Newest workbook from the last scan if it is recent enough, else None."""
+        max_age = self.interval * 2 if max_age is None else max_age
+        if self.scanned_at is None or time.time() - self.scanned_at > max_age:
+            return None
+        return latest(self.index)
+
+
+def import_file(path, db_path='picks.db', season=None, players=None):
+    """Import ``path`` under the import lease without the web app; returns (message, success)."""
+    season = season or int(os.getenv('CURRENT_SEASON', '2025'))
+    players = players or os.getenv('PLAYERS', 'bobby,chet,clyde,henry,nick,riley').split(',')
+    try:
+        with import_lease(db_path):
+            conn = sqlite3.connect(db_path, timeout=30)
+            try:
+                result = excel_import.import_workbook(conn, path, season, players)
+            finally:
+                conn.close()
+    except Exception as e:
+        return f"Error processing file: {str(e)}", False
+    return excel_import.describe_import(*result)
+
+
+def ensure_tables(db_path='picks.db', season=None, players=None):
+    """Schema the watcher and the importer need, as app.init_database creates it."""
+    season = season or int(os.getenv('CURRENT_SEASON', '2025'))
+    players = players or os.getenv('PLAYERS', 'bobby,chet,clyde,henry,nick,riley').split(',')
+    conn = sqlite3.connect(db_path, timeout=30)
+    try:
+        league_schema.migrate(conn, players, season)
+        picks_store.ensure_data_version(conn)
+        standings.ensure_standings_tables(conn)
+        excel_import.ensure_manifest_table(conn)
+        live_scores.ensure_live_tables(conn)
+        ensure_watch_table(conn)
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import the picks workbook whenever it changes on disk")
+    parser.add_argument('dirs', nargs='*', help="directories to watch (default: cwd and its parent)")
+    parser.add_argument('--once', action='store_true', help="run a single poll")
+    args = parser.parse_args()
+
+    from dotenv import load_dotenv
+    load_dotenv()  # same .env settings as the app
+    ensure_tables()
+
+    # Imports directly, without app.py's startup (auto-load, pollers, Dash build)
+    watcher = WorkbookWatcher(import_file, dirs=args.dirs or None)
+    if args.once:
+        print(f"Imported: {watcher.run_once()}")
+    else:
+        watcher.run_forever()
+
+
+if __name__ == '__main__':
+    main()